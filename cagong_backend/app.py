@@ -7,6 +7,8 @@ from swagger import init_swagger
 from flask_jwt_extended import JWTManager
 from config import config, FLASK_ENV
 from exceptions.handlers import register_handlers
+from commands import init_commands
+from common.compression import init_compression
 
 # Flask 앱 생성 및 환경별 설정 로드
 app = Flask(__name__)
@@ -34,6 +36,12 @@ register_blueprints(app)
 # db 초기화
 init_db(app)
 
+# 유지보수용 CLI 명령어 등록 (flask <명령어>)
+init_commands(app)
+
+# 응답 압축 (Accept-Encoding에 따라 gzip/Brotli)
+init_compression(app)
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,72 @@
+import click
+
+
+# Flask CLI 유지보수 명령어 (예: flask rebuild-slot-occupancy)
+def init_commands(app):
+    """Flask CLI 명령어 등록"""
+
+    @app.cli.command('rebuild-slot-occupancy')
+    @click.option('--cafe-id', type=int, default=None, help="특정 카페만 다시 계산")
+    def rebuild_slot_occupancy_command(cafe_id):
+        """예약 테이블로부터 슬롯별 좌석 장부(reservation_slot_occupancy)를 다시 계산
+
+        계산이 끝날 때까지 대상 카페의 예약/취소가 대기하므로 (전체 카페면 모든 예약)
+        트래픽이 적은 시간에 실행한다.
+        """
+        from services import reservation_service
+
+        count = reservation_service.rebuild_slot_occupancy(cafe_id=cafe_id)
+        target = f"카페 {cafe_id}" if cafe_id is not None else "전체 카페"
+        click.echo(f"[rebuild-slot-occupancy] {target}: 슬롯 {count}개 기록 완료")
+
+    @app.cli.command('rebuild-rating-stats')
+    @click.option('--cafe-id', type=int, default=None, help="특정 카페만 다시 계산")
+    def rebuild_rating_stats_command(cafe_id):
+        """평점 테이블로부터 카페별 평점 집계(cafe_rating_stats)를 다시 계산"""
+        from services.rating_service import RatingService
+
+        count = RatingService.rebuild_rating_stats(cafe_id=cafe_id)
+        target = f"카페 {cafe_id}" if cafe_id is not None else "전체 카페"
+        click.echo(f"[rebuild-rating-stats] {target}: 카페 {count}개 집계 완료")
+
+    @app.cli.command('reconcile-like-counts')
+    @click.option('--cafe-id', type=int, default=None, help="특정 카페만 보정")
+    def reconcile_like_counts_command(cafe_id):
+        """cafes.likes_count를 cafe_likes의 실제 개수로 보정 (cron 등으로 주기 실행)"""
+        from services import like_counter
+
+        changed = like_counter.reconcile_like_counts(cafe_id=cafe_id)
+        target = f"카페 {cafe_id}" if cafe_id is not None else "전체 카페"
+        click.echo(f"[reconcile-like-counts] {target}: 카페 {changed}개 보정")
+
+    @app.cli.command('reconcile-payments')
+    @click.option('--batch-size', type=int, default=None, help="한 번에 가져올 outbox 작업 수")
+    @click.option('--concurrency', type=int, default=None, help="동시에 실행할 Toss 호출 수")
+    @click.option('--stuck-seconds', type=int, default=None, help="이 시간(초)보다 오래 PROCESSING인 주문만 처리")
+    @click.option('--interval', type=float, default=0, help="0보다 크면 이 간격(초)으로 계속 반복 실행")
+    def reconcile_payments_command(batch_size, concurrency, stuck_seconds, interval):
+        """PROCESSING에 멈춘 결제와 남은 Toss 작업(payment_outbox)을 Toss 조회로 확정/환불
+
+        운영에서는 Procfile의 reconciler 프로세스로 --interval 60 상주 실행한다.
+        """
+        import time
+        from models import db
+        from services import payment_reconciler
+
+        while True:
+            try:
+                results = payment_reconciler.reconcile_payments(
+                    batch_size=batch_size, concurrency=concurrency, stuck_seconds=stuck_seconds
+                )
+            except Exception as e:
+                if interval <= 0:
+                    raise
+                # 상주 프로세스(Procfile reconciler)는 DB/Toss 일시 오류로 죽지 않고 다음 주기에 다시 시도
+                db.session.rollback()
+                app.logger.error(f"[reconcile-payments] 실행 실패, {interval}초 뒤 다시 시도: {e}", exc_info=True)
+            else:
+                summary = ", ".join(f"{name} {count}" for name, count in sorted(results.items())) or "처리할 작업 없음"
+                click.echo(f"[reconcile-payments] {summary}")
+            if interval <= 0:
+                break
+            time.sleep(interval)
@@ -21,11 +21,14 @@ class ErrorCode(Enum):
     DATABASE_ERROR = "DATABASE_ERROR"  # DB 저장 실패 시
 
 class ApiResponse:
-    def __init__(self, status: ApiStatus, message: str, data=None, error_code: ErrorCode = None):
+    def __init__(self, status: ApiStatus, message: str, data=None, error_code: ErrorCode = None,
+                 next_cursor: str = None, paginated: bool = False):
         self.status = status
         self.message = message
         self.data = data
         self.error_code = error_code
+        self.next_cursor = next_cursor
+        self.paginated = paginated
 
     def to_dict(self):
         response = {
@@ -33,6 +36,9 @@ class ApiResponse:
             "message": self.message,
             "data": self.data
         }
+        if self.paginated:
+            # 다음 페이지 커서 (마지막 페이지면 null)
+            response["next_cursor"] = self.next_cursor
         if self.error_code:
             response["errorCode"] = self.error_code.value
             response["data"] = None
@@ -43,6 +49,13 @@ class ApiResponse:
         response = ApiResponse(status=ApiStatus.SUCCESS, message=message, data=data)
         return jsonify(response.to_dict()), http_status
 
+    @staticmethod
+    def success_page(data, next_cursor: str = None, message: str = "요청이 성공적으로 처리되었습니다.", http_status: int = 200):
+        """커서 페이지네이션 응답 (envelope에 next_cursor 포함)"""
+        response = ApiResponse(status=ApiStatus.SUCCESS, message=message, data=data,
+                               next_cursor=next_cursor, paginated=True)
+        return jsonify(response.to_dict()), http_status
+
     @staticmethod
     def fail(error_code: ErrorCode, message: str, http_status: int):
         response = ApiResponse(status=ApiStatus.FAIL, message=message, error_code=error_code)
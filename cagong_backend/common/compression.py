@@ -0,0 +1,93 @@
+"""
+응답 압축 (gzip / Brotli)
+
+클라이언트의 Accept-Encoding에 맞춰 after_request에서 응답 본문을 압축한다.
+
+주요 기능:
+- COMPRESS_MIN_SIZE보다 작은 응답과 JSON/텍스트/MessagePack이 아닌 응답은 압축하지 않음
+- Brotli는 brotli 패키지가 설치되어 있을 때만 사용 (없으면 gzip)
+- ETag가 있는 응답(카페 목록 등)은 (ETag, 인코딩)별로 압축 결과를 보관해 같은 본문을 다시 압축하지 않음
+- 압축한 응답의 ETag는 약한 ETag(W/"...")로 바꿔, 같은 값으로 If-None-Match 304 판단이 그대로 동작
+"""
+
+import gzip
+
+from flask import request
+
+from common.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli가 없는 환경에서는 gzip만 사용
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'application/javascript',
+    'application/x-msgpack',
+}
+
+
+def _compress(data, encoding, app):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config.get('COMPRESS_BR_QUALITY', 5))
+    return gzip.compress(data, compresslevel=app.config.get('COMPRESS_GZIP_LEVEL', 6), mtime=0)
+
+
+def _choose_encoding():
+    """Accept-Encoding에서 사용할 인코딩 (br 우선, 둘 다 안 되면 None)"""
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def init_compression(app):
+    """응답 압축 after_request 훅 등록"""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    # (ETag, 인코딩) -> 압축된 본문
+    compressed_cache = LRUCache(maxsize=app.config.get('COMPRESS_CACHE_SIZE', 32))
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+
+        # 압축 여부가 Accept-Encoding에 따라 달라짐을 캐시/프록시에 알림
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            key = (etag, encoding)
+            compressed = compressed_cache.get(key)
+            if compressed is None:
+                compressed = _compress(data, encoding, app)
+                compressed_cache.set(key, compressed)
+            response.set_etag(etag, weak=True)
+        else:
+            compressed = _compress(data, encoding, app)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,36 @@
+import hashlib
+
+from flask import current_app, make_response, request
+
+
+def make_etag(*parts) -> str:
+    """row 버전 정보(updated_at, 개수 등)를 이어 붙여 강한 ETag 값을 만든다."""
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def is_not_modified(etag: str) -> bool:
+    """클라이언트가 보낸 If-None-Match에 현재 ETag가 포함되어 있는지 확인"""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag: str, vary: str = None):
+    """본문 없는 304 Not Modified 응답"""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    if vary:
+        response.vary.add(vary)
+    return response
+
+
+def with_etag(rv, etag: str, vary: str = None):
+    """
+    라우트 반환값(Response 또는 (Response, status) 튜플)에 ETag 헤더를 붙인다.
+    200 응답에만 붙이고, 실패 응답은 그대로 반환한다.
+    """
+    response = make_response(rv)
+    if response.status_code == 200:
+        response.set_etag(etag)
+        if vary:
+            response.vary.add(vary)
+    return response
@@ -0,0 +1,29 @@
+"""
+빠른 JSON 직렬화
+
+orjson이 설치되어 있으면 orjson으로, 없으면 Flask 기본 JSON 공급자로 직렬화한다.
+값 변환 규칙(Decimal -> 문자열, datetime -> HTTP 날짜 등)은 Flask 기본 공급자와 같다.
+(orjson은 키 정렬/ASCII 이스케이프를 하지 않아 jsonify와 바이트 단위로는 다를 수 있음)
+"""
+
+from flask import current_app
+
+try:
+    import orjson
+except ImportError:  # orjson이 없는 환경에서는 표준 직렬화 사용
+    orjson = None
+
+
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+
+def dumps(obj) -> bytes:
+    """obj를 JSON bytes로 직렬화 (앱 컨텍스트 안에서 호출)"""
+    if orjson is None:
+        return current_app.json.dumps(obj).encode('utf-8')
+    return orjson.dumps(obj, default=current_app.json.default, option=_ORJSON_OPTIONS)
+
+
+def json_response(obj, status=200):
+    """obj를 직렬화한 application/json 응답"""
+    return current_app.response_class(dumps(obj), status=status, mimetype='application/json')
@@ -0,0 +1,169 @@
+"""
+외부 HTTP 호출 공용 클라이언트 (Toss Payments, Google Places, Google 인증서)
+
+호출처마다 requests.post()로 새 연결(TCP/TLS 핸드셰이크)을 맺지 않도록
+대상별로 requests.Session 하나를 만들어 프로세스 안에서 재사용한다.
+
+주요 기능:
+- 호스트별 연결 풀 + keep-alive (HTTPAdapter)
+- 연결/읽기 타임아웃 분리 (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+- 백오프 재시도: 연결 실패는 항상, 응답 오류(429/5xx)와 읽기 실패는 멱등 메서드만
+- 클라이언트별 지표 (요청/오류/재시도 수, 평균 응답 시간, 새로 맺은 연결 수)
+"""
+
+import threading
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 클라이언트 이름 -> 재시도 허용 메서드 (응답 오류/읽기 실패 시)
+CLIENT_RETRY_METHODS = {
+    'toss': IDEMPOTENT_METHODS,                    # 결제 승인/취소(POST)는 연결 실패만 재시도
+    'google': IDEMPOTENT_METHODS,                  # 인증서 조회 (GET)
+    'places': IDEMPOTENT_METHODS | {'POST'},       # Text Search는 POST지만 조회라 재시도해도 안전
+}
+
+
+class _CountingRetry(Retry):
+    """재시도할 때마다 클라이언트 지표의 retries를 올리는 Retry"""
+
+    def __init__(self, *args, client=None, **kwargs):
+        self.client = client
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        kwargs.setdefault('client', self.client)
+        return super().new(**kwargs)
+
+    def increment(self, *args, **kwargs):
+        if self.client is not None:
+            self.client._add('retries')
+        return super().increment(*args, **kwargs)
+
+
+class HttpClient:
+    """
+    대상 하나에 대한 재사용 세션 (스레드 간 공유)
+
+    Args:
+        name (str): 지표에 표시할 이름
+        connect_timeout (float): 연결 타임아웃 (초)
+        read_timeout (float): 읽기 타임아웃 (초)
+        pool_maxsize (int): 호스트별 최대 유지 연결 수
+        retries (int): 최대 재시도 횟수
+        backoff_factor (float): 재시도 간격 (backoff_factor * 2^(n-1)초)
+        retry_methods (frozenset): 응답 오류/읽기 실패 시 재시도할 메서드
+    """
+
+    def __init__(self, name, connect_timeout=3.05, read_timeout=10, pool_maxsize=10,
+                 retries=2, backoff_factor=0.3, retry_methods=IDEMPOTENT_METHODS):
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        self._lock = threading.Lock()
+        self._metrics = {'requests': 0, 'errors': 0, 'retries': 0, 'elapsed_ms': 0.0}
+
+        retry = _CountingRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=retry_methods,
+            raise_on_status=False,   # 재시도가 끝나면 마지막 응답을 그대로 반환 (raise_for_status로 처리)
+            client=self,
+        )
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        # session을 직접 넘겨 쓰는 라이브러리(google-auth) 호출도 지표에 잡히도록 응답 훅 사용
+        self.session.hooks['response'].append(self._on_response)
+
+    def _add(self, key, value=1):
+        with self._lock:
+            self._metrics[key] += value
+
+    def _on_response(self, response, *args, **kwargs):
+        with self._lock:
+            self._metrics['requests'] += 1
+            self._metrics['elapsed_ms'] += response.elapsed.total_seconds() * 1000
+            if response.status_code >= 500:
+                self._metrics['errors'] += 1
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """session.request와 같음 (timeout 기본값 = (연결, 읽기) 타임아웃)"""
+        try:
+            return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            self._add('errors')
+            raise
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def metrics(self):
+        """지표 (연결 수는 호스트별 풀에서 지금까지 새로 맺은 연결 수 합계)"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        pools = self._adapter.poolmanager.pools
+        connections = sum(pools[key].num_connections for key in pools.keys())
+        # 풀 큐는 빈 자리를 None으로 채워 두므로 실제 연결만 센다
+        idle = sum(
+            sum(1 for conn in list(pools[key].pool.queue) if conn is not None)
+            for key in pools.keys() if pools[key].pool is not None
+        )
+
+        requests_count = metrics['requests']
+        return {
+            'requests': requests_count,
+            'errors': metrics['errors'],
+            'retries': metrics['retries'],
+            'avg_ms': round(metrics['elapsed_ms'] / requests_count, 1) if requests_count else 0.0,
+            'connections_opened': connections,
+            'idle_connections': idle,
+            'hosts': len(pools.keys()),
+        }
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name):
+    """
+    이름별 공용 HttpClient (처음 호출할 때 앱 설정으로 생성)
+
+    Args:
+        name (str): 'toss', 'google', 'places'
+    """
+    client = _clients.get(name)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            config = current_app.config
+            client = _clients[name] = HttpClient(
+                name,
+                connect_timeout=config.get('HTTP_CONNECT_TIMEOUT', 3.05),
+                read_timeout=config.get('HTTP_READ_TIMEOUT', 10),
+                pool_maxsize=config.get('HTTP_POOL_MAXSIZE', 10),
+                retries=config.get('HTTP_RETRIES', 2),
+                backoff_factor=config.get('HTTP_RETRY_BACKOFF', 0.3),
+                retry_methods=CLIENT_RETRY_METHODS.get(name, IDEMPOTENT_METHODS),
+            )
+    return client
+
+
+def get_all_metrics():
+    """생성된 모든 클라이언트의 지표 {이름: 지표}"""
+    return {name: client.metrics() for name, client in list(_clients.items())}
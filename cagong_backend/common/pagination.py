@@ -0,0 +1,101 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+
+
+# limit 기본값/최대값
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+# limit: 페이지 크기, after: 커서를 디코딩한 정렬 키 값 튜플 (첫 페이지면 None)
+PageRequest = namedtuple('PageRequest', ['limit', 'after'])
+
+
+def encode_cursor(*values) -> str:
+    """정렬 키 값들(예: created_at, id)을 불투명한 커서 문자열로 인코딩"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, types: tuple) -> tuple:
+    """
+    커서 문자열을 정렬 키 값 튜플로 디코딩
+
+    Args:
+        cursor: encode_cursor()로 만든 문자열
+        types: 키별 타입 (예: (datetime, int))
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("cursor 형식이 잘못되었습니다.")
+
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError("cursor 형식이 잘못되었습니다.")
+
+    values = []
+    for value, value_type in zip(payload, types):
+        try:
+            if value_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif value_type is int and isinstance(value, int) and not isinstance(value, bool):
+                values.append(value)
+            else:
+                raise TypeError
+        except (ValueError, TypeError):
+            raise ValueError("cursor 형식이 잘못되었습니다.")
+    return tuple(values)
+
+
+def parse_page_args(args, cursor_types: tuple):
+    """
+    쿼리 파라미터의 limit/cursor 해석 (페이지네이션은 둘 중 하나라도 있을 때만 적용)
+
+    Args:
+        args: request.args
+        cursor_types: 커서 정렬 키별 타입 (예: (datetime, int))
+
+    Returns:
+        PageRequest: 페이지 요청 (limit, cursor 둘 다 없으면 None)
+
+    Raises:
+        ValueError: limit 또는 cursor가 잘못된 경우
+    """
+    raw_limit = args.get('limit')
+    cursor = args.get('cursor')
+    if raw_limit is None and cursor is None:
+        return None
+
+    try:
+        limit = int(raw_limit) if raw_limit is not None else DEFAULT_PAGE_LIMIT
+    except ValueError:
+        raise ValueError("limit는 숫자여야 합니다.")
+    if not (1 <= limit <= MAX_PAGE_LIMIT):
+        raise ValueError(f"limit는 1~{MAX_PAGE_LIMIT} 사이여야 합니다.")
+
+    after = decode_cursor(cursor, cursor_types) if cursor else None
+    return PageRequest(limit=limit, after=after)
+
+
+def split_page(rows, limit: int, key):
+    """
+    limit + 1개 조회한 결과를 현재 페이지와 다음 커서로 나눈다.
+
+    Args:
+        rows: limit + 1개까지 조회한 결과 목록
+        limit: 페이지 크기
+        key: row에서 정렬 키 값 튜플을 꺼내는 함수
+
+    Returns:
+        tuple: (현재 페이지 row 목록, 다음 커서 또는 None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
@@ -58,15 +58,70 @@ class Config:
     # Google ID 토큰 audience 검증용
     GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
 
+    # Google 공개 인증서 URL (로컬 스텁 서버로 바꿀 때 사용), 검증된 토큰 캐시 최대 개수(0이면 끔)
+    GOOGLE_CERTS_URL = os.getenv('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+    GOOGLE_TOKEN_CACHE_SIZE = int(os.getenv('GOOGLE_TOKEN_CACHE_SIZE', '1024'))
+
+    # 모르는 kid로 Google 인증서를 다시 받을 때 최소 간격 (초, 마지막으로 받은 시각 기준)
+    GOOGLE_CERTS_MIN_REFRESH_SECONDS = int(os.getenv('GOOGLE_CERTS_MIN_REFRESH_SECONDS', '60'))
+
     # Google Maps/Places API 키
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
+    # Places Text Search URL (로컬 스텁 서버로 바꿀 때 사용), 검색 결과 캐시: 최대 개수(0이면 끔), 유효 시간(초)
+    GOOGLE_PLACES_URL = os.getenv('GOOGLE_PLACES_URL', 'https://places.googleapis.com/v1/places:searchText')
+    PLACES_CACHE_SIZE = int(os.getenv('PLACES_CACHE_SIZE', '512'))
+    PLACES_CACHE_TTL = int(os.getenv('PLACES_CACHE_TTL', '600'))
+
     # 프론트엔드 URL (추가)
     FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:8080')
 
     # TOSS 결제 비밀키 (추가)
     TOSS_SECRET_KEY = os.getenv('TOSS_SECRET_KEY')
 
+    # Toss API 주소 (로컬 Mock 서버로 바꿀 때 사용, 예: http://127.0.0.1:5001)
+    TOSS_API_URL = os.getenv('TOSS_API_URL', 'https://api.tosspayments.com')
+
+    # 결제 승인 백그라운드 스레드 수: /success는 주문 선점만 하고 바로 리다이렉트, Toss 승인은 백그라운드에서
+    # (기본 0 = 기존처럼 요청 안에서 Toss 응답까지 기다림. 프론트엔드 /payment/pending 화면 배포 후 켬,
+    #  켤 때는 reconcile-payments 프로세스도 함께 실행, HTTP_POOL_MAXSIZE 이하 권장)
+    PAYMENT_CONFIRM_WORKERS = int(os.getenv('PAYMENT_CONFIRM_WORKERS', '0'))
+
+    # 결제 보정 작업(flask reconcile-payments): 배치 크기, 동시 Toss 호출 수, PROCESSING으로 간주할 멈춤 시간(초),
+    # 작업별 최대 시도 횟수, 재시도 간격 기준(초, 시도마다 2배)
+    PAYMENT_RECONCILE_BATCH_SIZE = int(os.getenv('PAYMENT_RECONCILE_BATCH_SIZE', '50'))
+    PAYMENT_RECONCILE_CONCURRENCY = int(os.getenv('PAYMENT_RECONCILE_CONCURRENCY', '4'))
+    PAYMENT_RECONCILE_STUCK_SECONDS = int(os.getenv('PAYMENT_RECONCILE_STUCK_SECONDS', '300'))
+    PAYMENT_RECONCILE_MAX_ATTEMPTS = int(os.getenv('PAYMENT_RECONCILE_MAX_ATTEMPTS', '8'))
+    PAYMENT_RECONCILE_RETRY_SECONDS = int(os.getenv('PAYMENT_RECONCILE_RETRY_SECONDS', '30'))
+
+    # 외부 HTTP 호출 공용 클라이언트 (Toss, Google): 연결/읽기 타임아웃(초), 호스트별 연결 풀 크기, 재시도
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '10'))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', '0.3'))
+
+    # 카페 목록 스냅샷 캐시: 다른 워커/마이그레이션에서 바뀐 카페를 감지하는 주기 (초)
+    CAFE_SNAPSHOT_REVALIDATE_SECONDS = int(os.getenv('CAFE_SNAPSHOT_REVALIDATE_SECONDS', '30'))
+
+    # 좋아요 수 지연 반영(write-behind): 켜면 좋아요가 커밋된 카페를 모아 두었다가 백그라운드 스레드가 주기적으로 다시 세어 반영
+    LIKE_COUNTER_WRITE_BEHIND = os.getenv('LIKE_COUNTER_WRITE_BEHIND', 'False').lower() == 'true'
+    LIKE_COUNTER_FLUSH_SECONDS = float(os.getenv('LIKE_COUNTER_FLUSH_SECONDS', '5'))
+    LIKE_COUNTER_FLUSH_SIZE = int(os.getenv('LIKE_COUNTER_FLUSH_SIZE', '100'))
+
+    # 사용자별 좋아요 한 카페 id 비트맵 캐시 (include=liked_by_me): 최대 사용자 수(0이면 끔, 기본 끔), 유효 시간(초)
+    # 요청마다 사용자 좋아요 버전(개수, 최대 id)을 조회해 검증하므로 여러 워커에서도 오래된 값을 주지 않음
+    LIKED_CAFES_CACHE_SIZE = int(os.getenv('LIKED_CAFES_CACHE_SIZE', '0'))
+    LIKED_CAFES_CACHE_TTL = int(os.getenv('LIKED_CAFES_CACHE_TTL', '300'))
+
+    # 응답 압축 (gzip, brotli 패키지가 있으면 Brotli): 최소 크기(바이트), 압축 수준, ETag별 압축 결과 보관 개수
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+    COMPRESS_BR_QUALITY = int(os.getenv('COMPRESS_BR_QUALITY', '5'))
+    COMPRESS_CACHE_SIZE = int(os.getenv('COMPRESS_CACHE_SIZE', '32'))
+
     # CORS Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
     
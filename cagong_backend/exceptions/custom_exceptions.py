@@ -69,8 +69,13 @@ class DuplicatePaymentException(BaseAppException):
         )
 
 class PaymentApiCallException(BaseAppException):
-    """외부 결제 API(토스) 호출에 실패했을 때"""
-    def __init__(self, message="결제 서비스(API) 호출에 실패했습니다."):
+    """
+    외부 결제 API(토스) 호출에 실패했을 때
+    status_code/toss_code는 토스가 응답한 경우의 HTTP 상태와 에러 코드 (타임아웃 등 통신 실패면 None)
+    """
+    def __init__(self, message="결제 서비스(API) 호출에 실패했습니다.", status_code=None, toss_code=None):
+        self.status_code = status_code
+        self.toss_code = toss_code
         super().__init__(
             http_status=503,  # 503 Service Unavailable (외부 서비스 문제)
             error_code=ErrorCode.PAYMENT_API_ERROR,
@@ -0,0 +1,56 @@
+"""Add reservation_slot_occupancy table
+
+Revision ID: a3f1c2d4e5b6
+Revises: 57a9516dc762
+Create Date: 2026-10-18 10:12:41.204117
+
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c2d4e5b6'
+down_revision = '57a9516dc762'
+branch_labels = None
+depends_on = None
+
+
+SLOT_DELTA = timedelta(minutes=30)
+
+
+def upgrade():
+    slot_table = op.create_table('reservation_slot_occupancy',
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('slot_start', sa.DateTime(), nullable=False),
+    sa.Column('reserved_seats', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cafe_id'], ['cafes.id'], ),
+    sa.PrimaryKeyConstraint('cafe_id', 'slot_start')
+    )
+
+    # 기존 예약(취소 제외)으로 슬롯별 좌석 수 채우기
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT cafe_id, start_datetime, end_datetime, seat_count "
+        "FROM reservations WHERE status IS NULL OR status != 'cancelled'"
+    )).fetchall()
+
+    occupancy = defaultdict(int)
+    for cafe_id, start, end, seat_count in rows:
+        slot = start.replace(minute=start.minute - start.minute % 30, second=0, microsecond=0)
+        while slot < end:
+            occupancy[(cafe_id, slot)] += seat_count
+            slot += SLOT_DELTA
+
+    if occupancy:
+        op.bulk_insert(slot_table, [
+            {'cafe_id': cafe_id, 'slot_start': slot_start, 'reserved_seats': seats}
+            for (cafe_id, slot_start), seats in occupancy.items()
+        ])
+
+
+def downgrade():
+    op.drop_table('reservation_slot_occupancy')
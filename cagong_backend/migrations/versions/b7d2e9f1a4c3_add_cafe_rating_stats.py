@@ -0,0 +1,69 @@
+"""Add cafe_rating_stats table
+
+Revision ID: b7d2e9f1a4c3
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-18 13:40:05.771902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e9f1a4c3'
+down_revision = 'a3f1c2d4e5b6'
+branch_labels = None
+depends_on = None
+
+
+COUNT_COLUMNS = (
+    [('rate', value) for value in range(1, 6)]
+    + [('consent_rate', value) for value in range(1, 4)]
+    + [('seat_rate', value) for value in range(1, 4)]
+)
+
+
+def _stats_column_name(source, value):
+    return f"{source.replace('_rate', '')}_{value}"
+
+
+def upgrade():
+    op.create_table('cafe_rating_stats',
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('rate_1', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rate_2', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rate_3', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rate_4', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rate_5', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('consent_1', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('consent_2', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('consent_3', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('seat_1', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('seat_2', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('seat_3', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('rate_sum', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('consent_sum', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('seat_sum', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['cafe_id'], ['cafes.id'], ),
+    sa.PrimaryKeyConstraint('cafe_id')
+    )
+
+    # 기존 평점으로 카페별 집계 채우기 (GROUP BY 한 번)
+    count_columns = [_stats_column_name(source, value) for source, value in COUNT_COLUMNS]
+    count_exprs = [
+        f"SUM(CASE WHEN {source} = {value} THEN 1 ELSE 0 END)"
+        for source, value in COUNT_COLUMNS
+    ]
+    op.execute(
+        "INSERT INTO cafe_rating_stats "
+        f"(cafe_id, {', '.join(count_columns)}, rate_sum, consent_sum, seat_sum, updated_at) "
+        f"SELECT cafe_id, {', '.join(count_exprs)}, "
+        "COALESCE(SUM(rate), 0), COALESCE(SUM(consent_rate), 0), COALESCE(SUM(seat_rate), 0), "
+        "MAX(updated_at) "
+        "FROM cafe_ratings GROUP BY cafe_id"
+    )
+
+
+def downgrade():
+    op.drop_table('cafe_rating_stats')
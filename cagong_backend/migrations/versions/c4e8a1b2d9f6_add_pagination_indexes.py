@@ -0,0 +1,38 @@
+"""Add composite indexes for cursor pagination
+
+Revision ID: c4e8a1b2d9f6
+Revises: b7d2e9f1a4c3
+Create Date: 2026-10-18 15:02:37.418265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1b2d9f6'
+down_revision = 'b7d2e9f1a4c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_cafe_created_id', ['cafe_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('cafe_likes', schema=None) as batch_op:
+        batch_op.create_index('ix_cafe_likes_user_created_id', ['user_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('cafe_ratings', schema=None) as batch_op:
+        batch_op.create_index('ix_cafe_ratings_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cafe_ratings', schema=None) as batch_op:
+        batch_op.drop_index('ix_cafe_ratings_user_id_id')
+
+    with op.batch_alter_table('cafe_likes', schema=None) as batch_op:
+        batch_op.drop_index('ix_cafe_likes_user_created_id')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_cafe_created_id')
@@ -0,0 +1,26 @@
+"""Add index on cafes.updated_at for catalog deltas
+
+Revision ID: d5f3b8c1a7e2
+Revises: c4e8a1b2d9f6
+Create Date: 2026-10-18 17:41:09.532871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f3b8c1a7e2'
+down_revision = 'c4e8a1b2d9f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cafes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cafes_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cafes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cafes_updated_at'))
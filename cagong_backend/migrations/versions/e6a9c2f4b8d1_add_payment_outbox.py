@@ -0,0 +1,45 @@
+"""Add payment_outbox table
+
+Revision ID: e6a9c2f4b8d1
+Revises: d5f3b8c1a7e2
+Create Date: 2026-10-18 21:26:53.170384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a9c2f4b8d1'
+down_revision = 'd5f3b8c1a7e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payment_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('payment_key', sa.String(length=200), nullable=True),
+    sa.Column('amount', sa.Integer(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(length=500), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('payment_outbox', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_outbox_order_id'), ['order_id'], unique=False)
+        batch_op.create_index('ix_payment_outbox_status_next_attempt', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('payment_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_payment_outbox_status_next_attempt')
+        batch_op.drop_index(batch_op.f('ix_payment_outbox_order_id'))
+
+    op.drop_table('payment_outbox')
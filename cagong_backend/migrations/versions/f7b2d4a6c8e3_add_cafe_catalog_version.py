@@ -0,0 +1,52 @@
+"""Add cafe catalog version counter and tombstones
+
+Revision ID: f7b2d4a6c8e3
+Revises: e6a9c2f4b8d1
+Create Date: 2026-10-18 23:12:40.418227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b2d4a6c8e3'
+down_revision = 'e6a9c2f4b8d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cafe_catalog_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('cafe_tombstones',
+    sa.Column('cafe_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('catalog_version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('cafe_id')
+    )
+    with op.batch_alter_table('cafe_tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cafe_tombstones_catalog_version'), ['catalog_version'], unique=False)
+
+    with op.batch_alter_table('cafes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('catalog_version', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_cafes_catalog_version'), ['catalog_version'], unique=False)
+
+    # 기존 카페는 모두 버전 1로 시작 (이전 epoch 초 버전을 가진 앱은 현재 버전보다 커서 전체를 다시 받음)
+    op.execute("INSERT INTO cafe_catalog_state (id, version) VALUES (1, 1)")
+    op.execute("UPDATE cafes SET catalog_version = 1")
+
+
+def downgrade():
+    with op.batch_alter_table('cafes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cafes_catalog_version'))
+        batch_op.drop_column('catalog_version')
+
+    with op.batch_alter_table('cafe_tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cafe_tombstones_catalog_version'))
+
+    op.drop_table('cafe_tombstones')
+    op.drop_table('cafe_catalog_state')
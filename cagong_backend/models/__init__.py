@@ -18,6 +18,10 @@ def init_db(app):
     from .cafe_likes import CafeLike
     from .cafe_rating import CafeRating
     from .comment import Comment
+    from .reservation_slot_occupancy import ReservationSlotOccupancy
+    from .cafe_rating_stats import CafeRatingStats
+    from .payment_outbox import PaymentOutbox
+    from .cafe_catalog import CafeCatalogState, CafeTombstone
 
     return db
 
@@ -29,5 +33,7 @@ from .order import Order
 from .cafe_likes import CafeLike
 from .cafe_rating import CafeRating
 from .comment import Comment
-
-
+from .reservation_slot_occupancy import ReservationSlotOccupancy
+from .cafe_rating_stats import CafeRatingStats
+from .payment_outbox import PaymentOutbox
+from .cafe_catalog import CafeCatalogState, CafeTombstone
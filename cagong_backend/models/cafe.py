@@ -67,7 +67,10 @@ class Cafe(db.Model):
 
     # 타임스탬프
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # 스냅샷 지문(MAX) 조회용 인덱스
+
+    # 마지막으로 바뀐 카탈로그 버전 (카탈로그 변경분 조회용, models/cafe_catalog.py에서 flush 때 기록)
+    catalog_version = db.Column(db.BigInteger, nullable=False, default=0, server_default='0', index=True)
 
 
 
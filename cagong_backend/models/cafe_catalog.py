@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from sqlalchemy import event, select, update
+
+from . import db
+from .cafe import Cafe
+
+
+# 카페 카탈로그 버전 (앱 오프라인 캐시의 변경분 기준)
+# 카페를 추가/수정/삭제하는 ORM flush마다 같은 트랜잭션 안에서 카운터 row를 +1 하고,
+# 바뀐 카페에는 cafes.catalog_version, 삭제된 카페에는 cafe_tombstones.catalog_version으로 그 값을 남긴다.
+# 카운터 row는 커밋까지 잠겨 있으므로 여러 워커에서도 버전이 커밋 순서대로 증가한다.
+# (ORM을 거치지 않은 SQL 변경은 반영되지 않음 - 앱은 total이 다르면 전체를 다시 받는다)
+
+CATALOG_STATE_ID = 1
+
+
+class CafeCatalogState(db.Model):
+    __tablename__ = 'cafe_catalog_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class CafeTombstone(db.Model):
+    __tablename__ = 'cafe_tombstones'
+
+    cafe_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 삭제된 카페 id (FK 없음)
+    catalog_version = db.Column(db.BigInteger, nullable=False, index=True)  # 삭제된 카탈로그 버전
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CafeTombstone cafe_id={self.cafe_id} version={self.catalog_version}>'
+
+
+def current_catalog_version(session=None):
+    """커밋된 최신 카탈로그 버전 (카운터 row가 없으면 0)"""
+    session = session or db.session
+    return session.execute(
+        select(CafeCatalogState.version).where(CafeCatalogState.id == CATALOG_STATE_ID)
+    ).scalar() or 0
+
+
+def next_catalog_version(session):
+    """카운터 row를 +1 하고 새 버전 반환 (현재 트랜잭션이 커밋/롤백할 때까지 row 잠금)"""
+    bumped = session.execute(
+        update(CafeCatalogState)
+        .where(CafeCatalogState.id == CATALOG_STATE_ID)
+        .values(version=CafeCatalogState.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not bumped:
+        # 마이그레이션 없이 create_all()로 만든 DB 등 카운터 row가 없는 경우
+        session.execute(CafeCatalogState.__table__.insert().values(id=CATALOG_STATE_ID, version=1))
+        return 1
+    return current_catalog_version(session)
+
+
+@event.listens_for(db.session, 'before_flush')
+def _stamp_catalog_version(session, flush_context, instances):
+    """flush할 카페 변경이 있으면 카탈로그 버전을 올리고 카페/삭제 기록에 남김"""
+    changed = [obj for obj in session.new if isinstance(obj, Cafe)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, Cafe) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Cafe)]
+    if not changed and not deleted:
+        return
+
+    version = next_catalog_version(session)
+    for cafe in changed:
+        cafe.catalog_version = version
+    for cafe in deleted:
+        tombstone = session.get(CafeTombstone, cafe.id)
+        if tombstone is None:
+            session.add(CafeTombstone(cafe_id=cafe.id, catalog_version=version))
+        else:
+            tombstone.catalog_version = version
+            tombstone.deleted_at = datetime.utcnow()
@@ -15,4 +15,5 @@ class CafeLike(db.Model):
     # 중복 방지 (유저-카페 한 쌍은 1개만)
     __table_args__ = (
         db.UniqueConstraint('user_id', 'cafe_id', name='unique_user_cafe_like'),
+        db.Index('ix_cafe_likes_user_created_id', 'user_id', 'created_at', 'id'),  # 내 좋아요 목록 커서 페이지네이션
     )
@@ -20,6 +20,7 @@ class CafeRating(db.Model):
     # 중복 방지 (유저-카페 한 쌍은 1개만)
     __table_args__ = (
         db.UniqueConstraint('user_id', 'cafe_id', name='unique_user_cafe_rating'),
+        db.Index('ix_cafe_ratings_user_id_id', 'user_id', 'id'),  # 내 평점 목록 커서 페이지네이션
     )
 
     def __repr__(self):
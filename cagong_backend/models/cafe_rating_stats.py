@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from . import db
+
+
+# 카페별 평점 집계 (cafe_ratings의 누적 카운트/합계)
+# 평점 등록/수정/삭제 시 같은 트랜잭션 안에서 증감 UPDATE로 갱신하고,
+# 평점 통계 조회는 이 테이블의 PK 조회 1번으로 처리한다.
+
+RATE_VALUES = range(1, 6)     # 카공지수 1~5
+LEVEL_VALUES = range(1, 4)    # 콘센트/좌석 1~3
+
+
+class CafeRatingStats(db.Model):
+    __tablename__ = 'cafe_rating_stats'
+
+    cafe_id = db.Column(db.Integer, db.ForeignKey('cafes.id'), primary_key=True)
+
+    # 카공지수 값별 인원 수
+    rate_1 = db.Column(db.Integer, nullable=False, default=0)
+    rate_2 = db.Column(db.Integer, nullable=False, default=0)
+    rate_3 = db.Column(db.Integer, nullable=False, default=0)
+    rate_4 = db.Column(db.Integer, nullable=False, default=0)
+    rate_5 = db.Column(db.Integer, nullable=False, default=0)
+
+    # 콘센트 값별 인원 수 (1=적음, 2=보통, 3=많음)
+    consent_1 = db.Column(db.Integer, nullable=False, default=0)
+    consent_2 = db.Column(db.Integer, nullable=False, default=0)
+    consent_3 = db.Column(db.Integer, nullable=False, default=0)
+
+    # 좌석 값별 인원 수 (1=적음, 2=보통, 3=많음)
+    seat_1 = db.Column(db.Integer, nullable=False, default=0)
+    seat_2 = db.Column(db.Integer, nullable=False, default=0)
+    seat_3 = db.Column(db.Integer, nullable=False, default=0)
+
+    # 항목별 합계
+    rate_sum = db.Column(db.Integer, nullable=False, default=0)
+    consent_sum = db.Column(db.Integer, nullable=False, default=0)
+    seat_sum = db.Column(db.Integer, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CafeRatingStats cafe_id={self.cafe_id} rate_count={self.rate_count}>'
+
+    @property
+    def rate_count(self):
+        """카공지수를 남긴 인원 수"""
+        return sum(getattr(self, f"rate_{value}") or 0 for value in RATE_VALUES)
+
+    def distribution(self, prefix, values):
+        """값별 인원 수 dict (예: {"1": 0, "2": 3, ...})"""
+        return {str(value): getattr(self, f"{prefix}_{value}") or 0 for value in values}
@@ -23,6 +23,11 @@ class Comment(db.Model):
     user = db.relationship('User', backref=db.backref('comments', lazy=True))
     cafe = db.relationship('Cafe', backref=db.backref('comments', lazy=True))
 
+    # 카페별 최신순 커서 페이지네이션용 인덱스
+    __table_args__ = (
+        db.Index('ix_comments_cafe_created_id', 'cafe_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f'<Comment {self.id} by User {self.user_id} on Cafe {self.cafe_id}>'
 
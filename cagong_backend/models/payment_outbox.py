@@ -0,0 +1,43 @@
+from . import db
+from datetime import datetime
+
+
+# 처리해야 할 Toss 작업 장부 (outbox)
+# 결제 승인 트랜잭션 A에서 주문을 PROCESSING으로 바꿀 때 같은 커밋으로 CONFIRM 작업을 남기고,
+# 트랜잭션 B/C에서 주문 상태를 확정할 때 같은 커밋으로 DONE 처리한다.
+# 그 사이에 프로세스가 죽거나 DB 저장이 실패하면 PENDING으로 남은 작업을
+# 결제 보정 작업(flask reconcile-payments)이 Toss에 조회해 마무리한다. (필요하면 CANCEL로 환불)
+
+class PaymentOutbox(db.Model):
+    __tablename__ = 'payment_outbox'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
+
+    # CONFIRM(승인 결과 확인), CANCEL(결제 취소/환불)
+    operation = db.Column(db.String(20), nullable=False)
+
+    # PENDING(처리 대기), DONE(완료), FAILED(재시도 한도 초과 - 수동 확인 필요)
+    status = db.Column(db.String(20), nullable=False, default='PENDING')
+
+    payment_key = db.Column(db.String(200), nullable=True)  # CANCEL은 필수, CONFIRM은 주문 ID로 조회
+    amount = db.Column(db.Integer, nullable=True)
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # 보정 작업 시도 횟수
+    last_error = db.Column(db.String(500), nullable=True)
+
+    # 이 시각 이후에 보정 작업이 처리 (재시도 간격, 처리 중인 작업 선점에도 사용)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    order = db.relationship('Order', backref=db.backref('outbox_entries', lazy='dynamic'))
+
+    __table_args__ = (
+        db.Index('ix_payment_outbox_status_next_attempt', 'status', 'next_attempt_at'),  # 처리 대상 배치 조회
+    )
+
+    def __repr__(self):
+        return f'<PaymentOutbox {self.operation} order_id={self.order_id} status={self.status}>'
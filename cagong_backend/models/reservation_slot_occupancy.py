@@ -0,0 +1,16 @@
+from . import db
+
+
+# 30분 슬롯별 예약 좌석 장부 (seat ledger)
+# 예약 생성 시 이 테이블의 좌석 수를 조건부로 증가시켜 동시 예약으로 인한 초과 예약을 막는다.
+
+class ReservationSlotOccupancy(db.Model):
+    __tablename__ = 'reservation_slot_occupancy'
+
+    cafe_id = db.Column(db.Integer, db.ForeignKey('cafes.id'), primary_key=True)
+    slot_start = db.Column(db.DateTime, primary_key=True)  # 30분 단위로 정렬된 슬롯 시작 시각
+
+    reserved_seats = db.Column(db.Integer, nullable=False, default=0)  # 해당 슬롯에 예약된 좌석 수
+
+    def __repr__(self):
+        return f'<ReservationSlotOccupancy cafe_id={self.cafe_id} slot_start={self.slot_start} reserved={self.reserved_seats}>'
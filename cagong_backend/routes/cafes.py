@@ -1,15 +1,70 @@
 # routes/cafes.py
 
-from flask import Blueprint, jsonify, request
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request, current_app
 from services import cafe_service
 from services import places_service
-from flask_jwt_extended import jwt_required
+from services import cafe_catalog
+from services.cafe_serializer import parse_fields, project_cafe_dicts
+from common.etag import make_etag, is_not_modified, not_modified
+from common.fast_json import json_response
+from common.pagination import parse_page_args
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 
 
 
 cafe_bp = Blueprint('cafes', __name__)
 
 
+def _parse_open_at():
+    """
+    open_now / open_at 쿼리 파라미터 해석
+
+    Returns:
+        tuple: (datetime 또는 None, 에러 메시지 또는 None)
+    """
+    open_at = request.args.get('open_at')
+    if open_at:
+        try:
+            return datetime.fromisoformat(open_at), None
+        except ValueError:
+            return None, "open_at 형식이 잘못되었습니다. (형식: YYYY-MM-DDTHH:MM)"
+
+    if request.args.get('open_now', '').lower() == 'true':
+        return datetime.now(), None
+
+    return None, None
+
+
+def _parse_fields():
+    """
+    fields 쿼리 파라미터 해석
+
+    Returns:
+        tuple: (필드 이름 tuple 또는 None, 에러 메시지 또는 None)
+    """
+    try:
+        return parse_fields(request.args.get('fields')), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def _parse_include():
+    """include 쿼리 파라미터 (쉼표 구분) 집합"""
+    return {item.strip() for item in request.args.get('include', '').split(',')}
+
+
+def _optional_user_id():
+    """로그인 사용자 ID (토큰이 없거나 잘못되면 None)"""
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except Exception:
+        return None
+    return int(user_id) if user_id is not None else None
+
+
 
 
 
@@ -20,23 +75,116 @@ def get_cafe_list():
     ---
     tags:
       - Cafes
+    parameters:
+      - name: open_now
+        in: query
+        type: boolean
+        required: false
+        description: "true이면 현재 영업 중인 카페만 반환"
+      - name: open_at
+        in: query
+        type: string
+        required: false
+        description: "지정 시각에 영업 중인 카페만 반환 (예: 2025-10-19T14:00, open_now보다 우선)"
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: "쉼표로 구분한 필드만 반환 (예: id,name,latitude,longitude). operating_hours, reservation은 묶음 단위"
+      - name: include
+        in: query
+        type: string
+        required: false
+        description: "쉼표로 구분. rating이면 카페마다 평점 요약(average_rating, total_count, consent_keyword, seat_keyword)을 rating 필드로, liked_by_me면 로그인 사용자의 좋아요 여부(비로그인은 false)를 포함"
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: "페이지 크기 (1~100). limit 또는 cursor가 있으면 id 순으로 한 페이지만 반환하고 next_cursor를 함께 반환"
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: "이전 응답의 next_cursor"
     responses:
       200:
         description: 카페 목록 조회 성공
+      304:
+        description: 변경 없음 (If-None-Match가 현재 ETag와 일치)
+      400:
+        description: 잘못된 요청
       500:
         description: 서버 오류
     """
     try:
-        cafes = cafe_service.get_all_cafes()
+        open_at, error = _parse_open_at()
+        if error:
+            return jsonify({
+                "success": False,
+                "error": error
+            }), 400
+
+        fields, error = _parse_fields()
+        if error:
+            return jsonify({
+                "success": False,
+                "error": error
+            }), 400
 
-        # DB에서 받은 Cafe 객체 리스트를 JSON으로 변환
-        cafe_list_dict = [cafe.to_dict() for cafe in cafes]
+        include = _parse_include()
+        user_id = _optional_user_id() if 'liked_by_me' in include else None
 
-        return jsonify({
-            "success": True,
-            "count": len(cafe_list_dict),
-            "data": cafe_list_dict
-        })
+        try:
+            page = parse_page_args(request.args, (int,))
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
+
+        if page is not None:
+            # 커서 페이지네이션 (스냅샷에서 한 페이지만 꺼냄)
+            cafes, next_cursor = cafe_service.get_cafe_page(
+                page.limit,
+                after_id=page.after[0] if page.after else None,
+                open_at=open_at,
+                include_rating='rating' in include
+            )
+            if 'liked_by_me' in include:
+                cafes = cafe_service.with_liked_by_me(cafes, user_id)
+            cafes = project_cafe_dicts(cafes, fields)
+            return jsonify({
+                "success": True,
+                "count": len(cafes),
+                "data": cafes,
+                "next_cursor": next_cursor
+            })
+
+        vary = None
+        if 'liked_by_me' in include:
+            # 사용자별 좋아요 여부는 요청마다 cafe_likes 1번 조회로 붙임 (본문이 사용자마다 다름)
+            body, etag = cafe_service.get_cafes_with_liked_json(
+                user_id, open_at=open_at, include_rating='rating' in include, fields=fields
+            )
+            vary = 'Authorization'
+        elif 'rating' in include:
+            # 평점 요약은 평점 집계 테이블에서 한 번에 붙임 (카페별 평점 API 호출 불필요)
+            body, etag = cafe_service.get_cafes_with_rating_json(open_at, fields=fields)
+        elif open_at:
+            # 영업 인덱스로 해당 시각에 영업 중인 카페만 골라냄
+            body, etag = cafe_service.get_open_cafes_json(open_at, fields=fields)
+        else:
+            # 직렬화된 응답 본문을 스냅샷에서 바로 가져옴 (카페가 바뀔 때만 다시 만듦)
+            # fields가 있으면 해당 컬럼만 SELECT해 만든 본문 사용
+            body, etag = cafe_service.get_all_cafes_json(fields)
+        if is_not_modified(etag):
+            return not_modified(etag, vary=vary)
+
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        if vary:
+            response.vary.add(vary)
+        return response
 
     except Exception as e:
         return jsonify({
@@ -55,20 +203,351 @@ def get_all_reservable_cafe_list():
     ---
     tags:
       - Cafes
+    parameters:
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: "쉼표로 구분한 필드만 반환 (예: id,name,latitude,longitude). operating_hours, reservation은 묶음 단위"
     responses:
       200:
         description: 카페 목록 조회 성공
+      304:
+        description: 변경 없음 (If-None-Match가 현재 ETag와 일치)
+      400:
+        description: 잘못된 요청
       500:
         description: 서버 오류
     """
     try:
-        cafes = cafe_service.get_all_reservable_cafes()
-        cafe_list_dict = [cafe.to_dict() for cafe in cafes]
+        fields, error = _parse_fields()
+        if error:
+            return jsonify({
+                "success": False,
+                "error": error
+            }), 400
+
+        # fields가 있으면 해당 컬럼만 SELECT해 만든 본문 사용
+        body, etag = cafe_service.get_all_reservable_cafes_json(fields)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"서버 오류 발생: {str(e)}"
+        }), 500
+
+
+
+
+
+
+
+@cafe_bp.route('/catalog')
+def get_cafe_catalog():
+    """앱 오프라인 캐시용 카페 카탈로그 (컬럼 배열, 버전별 변경분)
+    ---
+    tags:
+      - Cafes
+    parameters:
+      - name: since_version
+        in: query
+        type: integer
+        required: false
+        description: "앱이 가진 카탈로그 버전 (이전 응답의 version). 지정하면 그 이후 바뀐 카페와 삭제된 카페 id(data.deleted)만 반환, 현재 버전보다 크면 전체 반환"
+      - name: format
+        in: query
+        type: string
+        required: false
+        enum: [json, msgpack]
+        default: json
+        description: "msgpack이면 MessagePack 본문(application/x-msgpack, success/data 감싸기 없이 카탈로그만) 반환. 서버에 msgpack이 없으면 JSON"
+    responses:
+      200:
+        description: "카탈로그 조회 성공 (data.columns에 id, name, address, lat, lng, hours, closed_days, hours_description, reservable 배열)"
+      304:
+        description: "변경 없음 (If-None-Match가 현재 ETag와 일치)"
+      400:
+        description: "잘못된 요청"
+      500:
+        description: "서버 오류"
+    """
+    try:
+        since_version = request.args.get('since_version', type=int)
+        if since_version is None and request.args.get('since_version'):
+            return jsonify({
+                "success": False,
+                "error": "since_version은 정수여야 합니다."
+            }), 400
+        if since_version is not None and since_version < 0:
+            return jsonify({
+                "success": False,
+                "error": "since_version은 0 이상이어야 합니다."
+            }), 400
+
+        fmt = request.args.get('format', 'json')
+        if fmt not in ('json', 'msgpack'):
+            return jsonify({
+                "success": False,
+                "error": "format은 json 또는 msgpack이어야 합니다."
+            }), 400
+
+        body, mimetype, etag = cafe_catalog.get_catalog_body(since_version, fmt)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        response = current_app.response_class(body, mimetype=mimetype)
+        response.set_etag(etag)
+        return response
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"서버 오류 발생: {str(e)}"
+        }), 500
+
+
+
+
+
+
+
+# 주변 카페 검색 제한값
+NEARBY_DEFAULT_LIMIT = 20
+NEARBY_MAX_LIMIT = 100
+NEARBY_MAX_RADIUS = 50000  # 50km
+
+
+@cafe_bp.route('/nearby')
+def get_nearby_cafe_list():
+    """주변 카페 검색 (가까운 순)
+    ---
+    tags:
+      - Cafes
+    parameters:
+      - name: lat
+        in: query
+        type: number
+        required: true
+        description: "검색 중심 위도"
+      - name: lng
+        in: query
+        type: number
+        required: true
+        description: "검색 중심 경도"
+      - name: radius
+        in: query
+        type: number
+        required: false
+        description: "검색 반경 (미터, 최대 50000). 없으면 가장 가까운 limit개 반환"
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 20
+        description: "최대 결과 수 (최대 100)"
+      - name: open_now
+        in: query
+        type: boolean
+        required: false
+        description: "true이면 현재 영업 중인 카페만 반환"
+      - name: open_at
+        in: query
+        type: string
+        required: false
+        description: "지정 시각에 영업 중인 카페만 반환 (예: 2025-10-19T14:00, open_now보다 우선)"
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: "쉼표로 구분한 필드만 반환 (예: id,name,latitude,longitude). distance는 항상 포함"
+      - name: include
+        in: query
+        type: string
+        required: false
+        description: "liked_by_me면 카페마다 로그인 사용자의 좋아요 여부(liked_by_me, 비로그인은 false)를 포함"
+    responses:
+      200:
+        description: "주변 카페 조회 성공 (data의 각 카페에 distance(미터) 포함)"
+      400:
+        description: "잘못된 요청"
+      500:
+        description: "서버 오류"
+    """
+    try:
+        latitude = request.args.get('lat', type=float)
+        longitude = request.args.get('lng', type=float)
+        radius = request.args.get('radius', type=float)
+        limit = request.args.get('limit', default=NEARBY_DEFAULT_LIMIT, type=int)
+        open_at, error = _parse_open_at()
+        fields, fields_error = _parse_fields()
+        error = error or fields_error
+
+        if latitude is None or longitude is None:
+            return jsonify({
+                "success": False,
+                "error": "lat, lng는 필수 파라미터입니다."
+            }), 400
+
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+            return jsonify({
+                "success": False,
+                "error": "위도/경도 범위가 올바르지 않습니다."
+            }), 400
+
+        if radius is not None and not (0 < radius <= NEARBY_MAX_RADIUS):
+            return jsonify({
+                "success": False,
+                "error": f"radius는 0보다 크고 {NEARBY_MAX_RADIUS} 이하여야 합니다."
+            }), 400
+
+        if not (1 <= limit <= NEARBY_MAX_LIMIT):
+            return jsonify({
+                "success": False,
+                "error": f"limit는 1~{NEARBY_MAX_LIMIT} 사이여야 합니다."
+            }), 400
+
+        if error:
+            return jsonify({
+                "success": False,
+                "error": error
+            }), 400
+
+        cafes = cafe_service.get_nearby_cafes(latitude, longitude, radius=radius, limit=limit, open_at=open_at)
+        if 'liked_by_me' in _parse_include():
+            cafes = cafe_service.with_liked_by_me(cafes, _optional_user_id())
+        cafes = project_cafe_dicts(cafes, fields)
 
         return jsonify({
             "success": True,
-            "count": len(cafe_list_dict),
-            "data": cafe_list_dict
+            "count": len(cafes),
+            "data": cafes
+        })
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"서버 오류 발생: {str(e)}"
+        }), 500
+
+
+
+
+
+
+
+@cafe_bp.route('/in-bounds')
+def get_cafe_list_in_bounds():
+    """지도 화면 범위 안의 카페 조회 (낮은 줌에서는 클러스터)
+    ---
+    tags:
+      - Cafes
+    parameters:
+      - name: sw_lat
+        in: query
+        type: number
+        required: true
+        description: "남서쪽 모서리 위도"
+      - name: sw_lng
+        in: query
+        type: number
+        required: true
+        description: "남서쪽 모서리 경도"
+      - name: ne_lat
+        in: query
+        type: number
+        required: true
+        description: "북동쪽 모서리 위도"
+      - name: ne_lng
+        in: query
+        type: number
+        required: true
+        description: "북동쪽 모서리 경도"
+      - name: zoom
+        in: query
+        type: integer
+        required: true
+        description: "지도 줌 레벨 (0~22). 15 미만이면 클러스터(count, latitude, longitude)를 반환"
+      - name: open_now
+        in: query
+        type: boolean
+        required: false
+        description: "true이면 현재 영업 중인 카페만 반환"
+      - name: open_at
+        in: query
+        type: string
+        required: false
+        description: "지정 시각에 영업 중인 카페만 반환 (예: 2025-10-19T14:00, open_now보다 우선)"
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: "카페 목록(type이 cafes)일 때 쉼표로 구분한 필드만 반환 (예: id,name,latitude,longitude)"
+      - name: include
+        in: query
+        type: string
+        required: false
+        description: "liked_by_me면 카페 목록(type이 cafes)의 카페마다 로그인 사용자의 좋아요 여부(liked_by_me, 비로그인은 false)를 포함"
+    responses:
+      200:
+        description: "조회 성공. type이 clusters면 data는 클러스터 목록, cafes면 카페 목록"
+      400:
+        description: "잘못된 요청"
+      500:
+        description: "서버 오류"
+    """
+    try:
+        sw_lat = request.args.get('sw_lat', type=float)
+        sw_lng = request.args.get('sw_lng', type=float)
+        ne_lat = request.args.get('ne_lat', type=float)
+        ne_lng = request.args.get('ne_lng', type=float)
+        zoom = request.args.get('zoom', type=int)
+        open_at, error = _parse_open_at()
+        fields, fields_error = _parse_fields()
+        error = error or fields_error
+
+        if None in (sw_lat, sw_lng, ne_lat, ne_lng, zoom):
+            return jsonify({
+                "success": False,
+                "error": "sw_lat, sw_lng, ne_lat, ne_lng, zoom은 필수 파라미터입니다."
+            }), 400
+
+        if sw_lat > ne_lat or sw_lng > ne_lng:
+            return jsonify({
+                "success": False,
+                "error": "남서쪽(sw) 좌표는 북동쪽(ne) 좌표보다 작아야 합니다."
+            }), 400
+
+        if not (0 <= zoom <= 22):
+            return jsonify({
+                "success": False,
+                "error": "zoom은 0~22 사이여야 합니다."
+            }), 400
+
+        if error:
+            return jsonify({
+                "success": False,
+                "error": error
+            }), 400
+
+        result_type, items = cafe_service.get_cafes_in_bounds(
+            sw_lat, sw_lng, ne_lat, ne_lng, zoom, open_at=open_at
+        )
+        if result_type == "cafes":
+            if 'liked_by_me' in _parse_include():
+                items = cafe_service.with_liked_by_me(items, _optional_user_id())
+            items = project_cafe_dicts(items, fields)
+
+        return jsonify({
+            "success": True,
+            "type": result_type,
+            "count": len(items),
+            "data": items
         })
 
     except Exception as e:
@@ -99,31 +578,42 @@ def get_cafe_by_id(cafe_id):
         in: query
         type: string
         required: false
-        description: "특정 필드만 반환 (예: id,name)"
+        description: "쉼표로 구분한 필드만 조회해 반환 (예: id,name). operating_hours, reservation은 묶음 단위"
     responses:
       200:
         description: "카페 조회 성공"
+      304:
+        description: "변경 없음 (If-None-Match가 현재 ETag와 일치)"
+      400:
+        description: "잘못된 fields 값"
       404:
         description: "카페를 찾을 수 없음"
       500:
         description: "서버 오류"
     """
     try:
-        cafe = cafe_service.get_cafe_by_id(cafe_id)
+        fields, error = _parse_fields()
+        if error:
+            return jsonify({
+                "success": False,
+                "error": error
+            }), 400
 
-        if cafe:
-            cafe_data = cafe.to_dict()
+        # fields에 필요한 컬럼(+ ETag용 updated_at, likes_count)만 조회
+        cafe_data, version = cafe_service.get_cafe_dict(cafe_id, fields)
 
-            # fields 쿼리 파라미터가 있으면 해당 필드만 반환
-            fields = request.args.get('fields')
-            if fields:
-                requested_fields = [f.strip() for f in fields.split(',')]
-                cafe_data = {k: v for k, v in cafe_data.items() if k in requested_fields}
+        if cafe_data is not None:
+            # updated_at이 그대로면 직렬화 없이 304 반환
+            etag = make_etag('cafe', cafe_id, *version, fields)
+            if is_not_modified(etag):
+                return not_modified(etag)
 
-            return jsonify({
+            response = json_response({
                 "success": True,
                 "data": cafe_data
             })
+            response.set_etag(etag)
+            return response
         else:
             return jsonify({
                 "success": False,
@@ -1,6 +1,10 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.comment_service import CommentService
+from common.etag import make_etag, is_not_modified, not_modified, with_etag
+from common.api_response import ApiResponse, ErrorCode
+from common.pagination import parse_page_args
+from datetime import datetime
 
 comment_bp = Blueprint('comments', __name__)
 
@@ -20,6 +24,18 @@ def get_comments(cafe_id):
         description: 댓글을 조회할 카페 ID
         schema:
           type: integer
+      - in: query
+        name: limit
+        required: false
+        description: 페이지 크기 (1~100, limit 또는 cursor가 있으면 페이지 단위로 조회하고 next_cursor를 함께 반환)
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        required: false
+        description: 이전 응답의 next_cursor
+        schema:
+          type: string
     responses:
       200:
         description: 댓글 목록 조회 성공
@@ -39,8 +55,23 @@ def get_comments(cafe_id):
                   user_nickname: "커피매니아"
                   user_photo: null
                   created_at: "2023-10-24T10:30:00"
+      304:
+        description: 변경 없음 (If-None-Match가 현재 ETag와 일치)
     """
-    return CommentService.get_comments(cafe_id)
+    try:
+        page = parse_page_args(request.args, (datetime, int))
+    except ValueError as e:
+        return ApiResponse.fail(
+            error_code=ErrorCode.INVALID_INPUT,
+            message=str(e),
+            http_status=400
+        )
+
+    etag = make_etag('comments', cafe_id, page, *CommentService.get_comments_version(cafe_id))
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    return with_etag(CommentService.get_comments(cafe_id, page), etag)
 
 
 @comment_bp.route('/<int:cafe_id>', methods=['POST'])
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify
 
+from common.http_client import get_all_metrics
+
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health')
@@ -8,4 +10,13 @@ def health_check():
     return jsonify({
         "status": "OK", 
         "message": "서버가 잘 돌아가고 있어요!"
-    })
\ No newline at end of file
+    })
+
+
+@health_bp.route('/health/http-clients')
+def http_client_metrics():
+    """외부 HTTP 클라이언트(Toss, Google) 연결 풀/요청 지표"""
+    return jsonify({
+        "status": "OK",
+        "clients": get_all_metrics()
+    })
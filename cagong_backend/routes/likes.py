@@ -1,6 +1,10 @@
-from flask import Blueprint
+from datetime import datetime
+
+from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.like_service import LikeService
+from common.api_response import ApiResponse, ErrorCode
+from common.pagination import parse_page_args
 
 likes_bp = Blueprint('likes', __name__)
 
@@ -61,6 +65,17 @@ def my_liked_cafes():
     summary: 내가 좋아요한 카페 목록을 조회합니다.
     security:
       - BearerAuth: []
+    parameters:
+      - in: query
+        name: limit
+        required: false
+        type: integer
+        description: 페이지 크기 (1~100, limit 또는 cursor가 있으면 페이지 단위로 조회하고 next_cursor를 함께 반환)
+      - in: query
+        name: cursor
+        required: false
+        type: string
+        description: 이전 응답의 next_cursor
     responses:
       200:
         description: 성공
@@ -95,4 +110,12 @@ def my_liked_cafes():
                 address: "서초대로 ..."
     """
     user_id = get_jwt_identity()
-    return LikeService.get_liked_cafes(user_id)
+    try:
+        page = parse_page_args(request.args, (datetime, int))
+    except ValueError as e:
+        return ApiResponse.fail(
+            error_code=ErrorCode.INVALID_INPUT,
+            message=str(e),
+            http_status=400
+        )
+    return LikeService.get_liked_cafes(user_id, page)
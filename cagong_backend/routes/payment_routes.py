@@ -175,7 +175,9 @@ def payment_success_route():
     responses:
       302:
         description: "결제 처리 결과에 따라 프론트엔드 페이지로 리디렉션
-        (예: /payment/success?orderId=... 또는 /payment/fail?message=...)"
+        (예: /payment/success?orderId=... 또는 /payment/fail?message=...)
+        Toss 승인을 백그라운드에서 처리하는 경우(PAYMENT_CONFIRM_WORKERS > 0) 주문 선점 직후
+        /payment/pending?orderId=...로 리디렉션하고, 프론트엔드는 /api/payments/status/{orderId}로 결과를 확인"
     """
     order_id = request.args.get('orderId')  # orderId는 성공/실패 시 모두 필요하므로 미리 가져옴
 
@@ -188,7 +190,14 @@ def payment_success_route():
             raise InvalidInputException("필수 결제 정보가 누락되었습니다.")
 
         # 서비스 레이어 호출 (여기서 여러 예외가 발생할 수 있음)
-        payment_service.confirm_payment(payment_key, order_id, amount)
+        # 주문 선점(트랜잭션 A)까지만 기다리고 Toss 승인은 백그라운드에서 처리
+        status = payment_service.enqueue_confirm_payment(payment_key, order_id, amount)
+
+        # --- 0. 승인 진행 중 (프론트엔드가 상태 API로 결과 확인) ---
+        if status == 'PROCESSING':
+            current_app.logger.info(f"결제 승인 접수 (Order ID: {order_id})")
+            pending_page_url = f"{current_app.config['FRONTEND_URL']}/payment/pending?orderId={order_id}"
+            return redirect(pending_page_url)
 
         # --- 1. 최종 성공 ---
         current_app.logger.info(f"결제 승인 성공 (Order ID: {order_id})")
@@ -198,6 +207,10 @@ def payment_success_route():
     # --- 2. 성공으로 간주 (멱등성) ---
     except DuplicatePaymentException as e:
         current_app.logger.info(f"중복 결제 요청 처리 (멱등성/성공 간주): {e}")
+        if current_app.config.get('PAYMENT_CONFIRM_WORKERS', 0) > 0:
+            # 백그라운드 승인이 아직 진행 중일 수 있으므로 대기 페이지에서 실제 결과 확인
+            pending_page_url = f"{current_app.config['FRONTEND_URL']}/payment/pending?orderId={order_id}"
+            return redirect(pending_page_url)
         success_page_url = f"{current_app.config['FRONTEND_URL']}/payment/success?orderId={order_id}"
         return redirect(success_page_url)
 
@@ -275,4 +288,85 @@ def payment_fail_route():
 
     # [중요] 어떠한 경우에도 사용자를 프론트엔드 실패 페이지로 리디렉션합니다.
     fail_page_url = f"{current_app.config['FRONTEND_URL']}/payment/fail?message={error_message}&orderId={order_id}"
-    return redirect(fail_page_url)
\ No newline at end of file
+    return redirect(fail_page_url)
+
+
+# -----------------------------------------------------
+# 4. 결제 상태 조회 API (결제 대기 페이지 -> 백엔드)
+# -----------------------------------------------------
+@payments_bp.route('/status/<string:order_id>', methods=['GET'])
+@jwt_required()
+def payment_status_route(order_id):
+    """결제 상태 조회
+
+    /success가 백그라운드 승인으로 결제 대기 페이지(/payment/pending)로 보낸 뒤,
+    프론트엔드가 이 API를 주기적으로 호출해 PROCESSING -> PAID/FAILED 전환을 확인
+    ---
+    tags:
+      - Payments
+    security:
+      - bearerAuth: []  # JWT 토큰 인증 필요
+    parameters:
+      - name: order_id
+        in: path
+        type: string
+        required: true
+        description: "주문 ID"
+    responses:
+      200:
+        description: "조회 성공"
+        schema:
+          type: object
+          properties:
+            status:
+              type: string
+              example: "SUCCESS"
+            message:
+              type: string
+              example: "결제 상태를 조회했습니다."
+            data:
+              type: object
+              properties:
+                orderId:
+                  type: string
+                  example: "a1b2c3d4-e5f6-7890-g1h2-i3j4k5l6m7n8"
+                status:
+                  type: string
+                  description: "PENDING, PROCESSING(승인 진행 중), PAID, FAILED, CANCELED"
+                  example: "PROCESSING"
+                amount:
+                  type: integer
+                  example: 10000
+                orderName:
+                  type: string
+                  example: "A카페 15:00 - 17:00"
+                paymentType:
+                  type: string
+                  example: "카드"
+      401:
+        description: "인증되지 않은 사용자"
+      404:
+        description: "주문이 없거나 본인 주문이 아님"
+        schema:
+          type: object
+          properties:
+            status:
+              type: string
+              example: "FAIL"
+            message:
+              type: string
+              example: "주문 ID ...를 찾을 수 없습니다."
+            data:
+              type: 'null'
+              example: null
+            errorCode:
+              type: string
+              example: "ORDER_NOT_FOUND"
+    """
+    user_id = get_jwt_identity()
+    order_status = payment_service.get_order_status(order_id, user_id)
+
+    return ApiResponse.success(
+        data=order_status,
+        message="결제 상태를 조회했습니다."
+    )
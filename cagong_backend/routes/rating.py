@@ -1,6 +1,9 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from services.rating_service import RatingService
+from common.etag import make_etag, is_not_modified, not_modified, with_etag
+from common.api_response import ApiResponse, ErrorCode
+from common.pagination import parse_page_args
 
 rating_bp = Blueprint('ratings', __name__)
 
@@ -41,6 +44,8 @@ def get_rating_stats(cafe_id):
                   "3": 2
                   "4": 5
                   "5": 7
+      304:
+        description: 변경 없음 (If-None-Match가 현재 ETag와 일치)
     """
     user_id = None
     try:
@@ -49,7 +54,12 @@ def get_rating_stats(cafe_id):
     except:
         pass
 
-    return RatingService.get_rating_stats(cafe_id, user_id)
+    # 내 평점이 응답에 포함되므로 사용자별로 ETag가 달라야 함
+    etag = make_etag('ratings', cafe_id, user_id, *RatingService.get_rating_version(cafe_id))
+    if is_not_modified(etag):
+        return not_modified(etag, vary='Authorization')
+
+    return with_etag(RatingService.get_rating_stats(cafe_id, user_id), etag, vary='Authorization')
 
 
 @rating_bp.route('/<int:cafe_id>', methods=['POST'])
@@ -185,6 +195,19 @@ def get_all_my_ratings():
     summary: 내가 평점을 매긴 모든 카페 목록을 조회합니다.
     security:
       - BearerAuth: []
+    parameters:
+      - in: query
+        name: limit
+        required: false
+        description: 페이지 크기 (1~100, limit 또는 cursor가 있으면 페이지 단위로 조회하고 next_cursor를 함께 반환)
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        required: false
+        description: 이전 응답의 next_cursor
+        schema:
+          type: string
     responses:
       200:
         description: 내 평점 목록 조회 성공
@@ -206,4 +229,58 @@ def get_all_my_ratings():
                     longitude: 127.5678
     """
     user_id = get_jwt_identity()
-    return RatingService.get_all_my_ratings(user_id)
+    try:
+        page = parse_page_args(request.args, (int,))
+    except ValueError as e:
+        return ApiResponse.fail(
+            error_code=ErrorCode.INVALID_INPUT,
+            message=str(e),
+            http_status=400
+        )
+    return RatingService.get_all_my_ratings(user_id, page)
+
+
+@rating_bp.route('/summary', methods=['GET'])
+def get_rating_summary():
+    """
+    여러 카페의 평점 요약 조회
+    ---
+    tags:
+      - Ratings
+    summary: 여러 카페의 평균 평점, 평가 인원 수, 콘센트/좌석 키워드를 한 번에 조회합니다.
+    description: 카페 목록 화면처럼 카페마다 평점 통계를 따로 조회하지 않도록 요약만 묶어서 반환합니다. (최대 200개)
+    parameters:
+      - in: query
+        name: cafe_ids
+        required: true
+        description: 쉼표로 구분한 카페 ID 목록 (예 1,2,3)
+        schema:
+          type: string
+    responses:
+      200:
+        description: 평점 요약 조회 성공
+        content:
+          application/json:
+            example:
+              status: SUCCESS
+              message: "평점 요약을 조회했습니다."
+              data:
+                - cafe_id: 1
+                  average_rating: 4.2
+                  total_count: 15
+                  consent_keyword: "많음"
+                  seat_keyword: "보통"
+      400:
+        description: cafe_ids 누락 또는 형식 오류
+    """
+    raw_ids = request.args.get('cafe_ids', '')
+    try:
+        cafe_ids = [int(cafe_id) for cafe_id in raw_ids.split(',') if cafe_id.strip()]
+    except ValueError:
+        return ApiResponse.fail(
+            error_code=ErrorCode.INVALID_INPUT,
+            message="cafe_ids는 쉼표로 구분한 숫자여야 합니다.",
+            http_status=400
+        )
+
+    return RatingService.get_rating_summary(cafe_ids)
@@ -1,6 +1,7 @@
 # routes/reservations.py
 
 from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from services import reservation_service
 
 
@@ -149,6 +150,279 @@ def check_availability():
 
 
 
+@reservation_bp.route('/availability/day', methods=['GET'])
+def check_day_availability():
+    """
+    하루 전체 슬롯별 예약 가능 좌석 조회
+    영업 시작부터 종료까지 30분 단위 슬롯마다 남은 좌석 수를 한 번에 반환
+    ---
+    tags:
+      - Reservation
+    parameters:
+      - name: cafe_id
+        in: query
+        type: integer
+        required: true
+        description: "카페 ID"
+      - name: date
+        in: query
+        type: string
+        required: true
+        description: "날짜 YYYY-MM-DD"
+    responses:
+      200:
+        description: "슬롯별 좌석 조회 성공"
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            data:
+              type: object
+              properties:
+                cafe_id:
+                  type: integer
+                  description: "카페 ID"
+                date:
+                  type: string
+                  description: "요청한 날짜"
+                total_seats:
+                  type: integer
+                  description: "총 좌석 수"
+                slots:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      time:
+                        type: string
+                        example: "14:00"
+                      reserved_seats:
+                        type: integer
+                      available_seats:
+                        type: integer
+                      is_available:
+                        type: boolean
+      400:
+        description: "잘못된 요청"
+      404:
+        description: "카페를 찾을 수 없음"
+      500:
+        description: "서버 오류"
+    """
+    try:
+        cafe_id = request.args.get('cafe_id', type=int)
+        date_str = request.args.get('date')
+
+        if not cafe_id:
+            return jsonify({
+                "success": False,
+                "error": "cafe_id는 필수 파라미터입니다."
+            }), 400
+
+        if not date_str:
+            return jsonify({
+                "success": False,
+                "error": "date는 필수 파라미터입니다. (형식: YYYY-MM-DD)"
+            }), 400
+
+        result = reservation_service.get_day_availability(cafe_id=cafe_id, date_str=date_str)
+
+        if result is None:
+            return jsonify({
+                "success": False,
+                "error": f"ID {cafe_id} 카페를 찾을 수 없습니다."
+            }), 404
+
+        if "error" in result:
+            return jsonify({
+                "success": False,
+                "error": result["error"]
+            }), 400
+
+        return jsonify({
+            "success": True,
+            "data": result
+        })
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"서버 오류 발생: {str(e)}"
+        }), 500
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+# 여러 카페 예약 가능 검색 제한값
+SEARCH_DEFAULT_LIMIT = 50
+SEARCH_MAX_LIMIT = 100
+SEARCH_MAX_RADIUS = 50000  # 50km
+
+
+@reservation_bp.route('/availability/search', methods=['GET'])
+def search_available_cafes():
+    """
+    여러 카페 예약 가능 검색
+    요청한 시간대에 원하는 좌석 수만큼 비어 있는 예약 가능 카페 목록 (위치를 주면 가까운 순)
+    ---
+    tags:
+      - Reservation
+    parameters:
+      - name: date
+        in: query
+        type: string
+        required: true
+        description: "날짜 YYYY-MM-DD"
+      - name: time
+        in: query
+        type: string
+        required: true
+        description: "시간 HH:MM"
+      - name: duration
+        in: query
+        type: integer
+        required: false
+        default: 2
+        description: "예약 시간 (1시간 단위)"
+      - name: seats
+        in: query
+        type: integer
+        required: false
+        default: 1
+        description: "필요한 좌석 수"
+      - name: lat
+        in: query
+        type: number
+        required: false
+        description: "검색 중심 위도 (lng와 함께 사용)"
+      - name: lng
+        in: query
+        type: number
+        required: false
+        description: "검색 중심 경도 (lat와 함께 사용)"
+      - name: radius
+        in: query
+        type: number
+        required: false
+        description: "검색 반경 (미터, 최대 50000)"
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 50
+        description: "최대 결과 수 (최대 100)"
+    responses:
+      200:
+        description: "검색 성공"
+      400:
+        description: "잘못된 요청"
+      500:
+        description: "서버 오류"
+    """
+    try:
+        date_str   = request.args.get('date')
+        time_str   = request.args.get('time')
+        duration   = request.args.get('duration', default=2, type=int)
+        seat_count = request.args.get('seats', default=1, type=int)
+        latitude   = request.args.get('lat', type=float)
+        longitude  = request.args.get('lng', type=float)
+        radius     = request.args.get('radius', type=float)
+        limit      = request.args.get('limit', default=SEARCH_DEFAULT_LIMIT, type=int)
+
+        if not date_str:
+            return jsonify({
+                "success": False,
+                "error": "date는 필수 파라미터입니다. (형식: YYYY-MM-DD)"
+            }), 400
+
+        if not time_str:
+            return jsonify({
+                "success": False,
+                "error": "time은 필수 파라미터입니다. (형식: HH:MM)"
+            }), 400
+
+        if not duration or duration < 1 or not seat_count or seat_count < 1:
+            return jsonify({
+                "success": False,
+                "error": "duration과 seats는 1 이상이어야 합니다."
+            }), 400
+
+        if (latitude is None) != (longitude is None):
+            return jsonify({
+                "success": False,
+                "error": "위도와 경도는 함께 제공되어야 합니다."
+            }), 400
+
+        if radius is not None and (latitude is None or not (0 < radius <= SEARCH_MAX_RADIUS)):
+            return jsonify({
+                "success": False,
+                "error": f"radius는 lat, lng와 함께 0보다 크고 {SEARCH_MAX_RADIUS} 이하로 제공되어야 합니다."
+            }), 400
+
+        if not (1 <= limit <= SEARCH_MAX_LIMIT):
+            return jsonify({
+                "success": False,
+                "error": f"limit는 1~{SEARCH_MAX_LIMIT} 사이여야 합니다."
+            }), 400
+
+        result = reservation_service.search_available_cafes(
+            date_str=date_str,
+            time_str=time_str,
+            duration_hours=duration,
+            seat_count=seat_count,
+            latitude=latitude,
+            longitude=longitude,
+            radius=radius,
+            limit=limit
+        )
+
+        if "error" in result:
+            return jsonify({
+                "success": False,
+                "error": result["error"]
+            }), 400
+
+        return jsonify({
+            "success": True,
+            "count": len(result["cafes"]),
+            "data": result
+        })
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"서버 오류 발생: {str(e)}"
+        }), 500
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
 @reservation_bp.route('/', methods=['POST'])
 def create_reservation():
     """
@@ -294,15 +568,64 @@ def create_reservation():
 
 
 
+@reservation_bp.route('/<int:reservation_id>', methods=['DELETE'])
+@jwt_required()
+def cancel_reservation(reservation_id):
+    """
+    예약 취소
+    본인 예약을 취소(status='cancelled')하고 해당 시간대 좌석을 반환합니다.
+    ---
+    tags:
+      - Reservation
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: reservation_id
+        in: path
+        type: integer
+        required: true
+        description: "예약 ID"
+    responses:
+      200:
+        description: "예약 취소 성공"
+      400:
+        description: "이미 취소된 예약"
+      403:
+        description: "본인 예약이 아님"
+      404:
+        description: "예약을 찾을 수 없음"
+      500:
+        description: "서버 오류"
+    """
+    try:
+        user_id = get_jwt_identity()
+        result = reservation_service.cancel_reservation(reservation_id, user_id)
 
+        if result is None:
+            return jsonify({
+                "success": False,
+                "error": f"ID {reservation_id} 예약을 찾을 수 없습니다."
+            }), 404
 
+        if "error" in result:
+            return jsonify({
+                "success": False,
+                "error": result["error"]
+            }), 500
 
+        if result.get("success") == False:
+            return jsonify({
+                "success": False,
+                "message": result["message"]
+            }), 403 if result.get("forbidden") else 400
 
+        return jsonify({
+            "success": True,
+            "data": result
+        })
 
-
-
-
-
-
-
-
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"서버 오류 발생: {str(e)}"
+        }), 500
@@ -0,0 +1,118 @@
+"""
+카페 목록 직렬화 벤치마크
+
+메모리 SQLite에 가상의 카페 N개(기본 10,000개)를 넣고
+1) 기존 방식: Cafe 모델 전체 조회 + to_dict() + jsonify
+2) 컬럼 단위 조회 + 필드 계획 + orjson (전체 필드)
+3) 2)와 같은 방식의 fields=id,name,latitude,longitude (지도 마커용)
+의 조회/직렬화 시간과 본문 크기를 비교하고, 1)과 2)의 결과가 같은지 확인한다.
+
+실제 DB 설정 없이 실행된다. (cagong_backend 디렉터리에서)
+    python scripts/bench_cafe_serializer.py --cafes 10000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+
+from common.fast_json import dumps, orjson  # noqa: E402
+from models import db, Cafe  # noqa: E402
+from services.cafe_hours import WEEKDAY_NAMES  # noqa: E402
+from services.cafe_serializer import parse_fields, query_cafe_dicts  # noqa: E402
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    return app
+
+
+def seed(count, rng):
+    now = datetime.utcnow()
+    rows = []
+    for cafe_id in range(1, count + 1):
+        row = {
+            'id': cafe_id,
+            'name': f"가상카페 {cafe_id}",
+            'address': f"서울특별시 가상구 가상로 {cafe_id}",
+            'latitude': Decimal(f"{37.4 + rng.random() * 0.3:.7f}"),
+            'longitude': Decimal(f"{126.8 + rng.random() * 0.4:.7f}"),
+            'message': "조용하고 콘센트 많은 카페",
+            'hours_weekday': rng.choice([2, 3, 4]),
+            'hours_weekend': rng.choice([2, 3]),
+            'price': "4500",
+            'last_order': "21:30",
+            'operating_hours': "*매주 일 정기휴무",
+            'likes_count': rng.randrange(100),
+            'reservation_enabled': cafe_id % 2 == 1,
+            'total_seats': rng.randrange(5, 40),
+            'total_consents': rng.randrange(0, 20),
+            'hourly_rate': 1000,
+            'created_at': now,
+            'updated_at': now,
+        }
+        for day in WEEKDAY_NAMES:
+            row[f"{day}_begin"], row[f"{day}_end"] = "09:00", "22:00"
+        rows.append(row)
+    db.session.bulk_insert_mappings(Cafe, rows)
+    db.session.commit()
+
+
+def measure(repeat, func):
+    """func를 repeat번 실행한 평균 시간(ms)과 마지막 결과"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db.session.expunge_all()  # 매번 DB에서 다시 읽도록 세션 비움
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카페 목록 직렬화 벤치마크")
+    parser.add_argument('--cafes', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.cafes, random.Random(args.seed))
+
+        def legacy():
+            cafes = [cafe.to_dict() for cafe in Cafe.query.order_by(Cafe.id).all()]
+            return jsonify({"success": True, "count": len(cafes), "data": cafes}).get_data()
+
+        def projected(fields=None):
+            cafes = query_cafe_dicts(fields)
+            return dumps({"success": True, "count": len(cafes), "data": cafes})
+
+        marker_fields = parse_fields("id,name,latitude,longitude")
+
+        legacy_ms, legacy_body = measure(args.repeat, legacy)
+        projected_ms, projected_body = measure(args.repeat, projected)
+        marker_ms, marker_body = measure(args.repeat, lambda: projected(marker_fields))
+
+    same = json.loads(legacy_body) == json.loads(projected_body)
+
+    print(f"카페 {args.cafes:,}개, {args.repeat}회 평균 (JSON: {'orjson' if orjson else 'Flask 기본'})")
+    print(f"to_dict + jsonify (기존):        {legacy_ms:8.1f} ms, {len(legacy_body):>10,} bytes")
+    print(f"컬럼 조회 + 필드 계획 (전체):    {projected_ms:8.1f} ms, {len(projected_body):>10,} bytes")
+    print(f"컬럼 조회 + 필드 계획 (마커용):  {marker_ms:8.1f} ms, {len(marker_body):>10,} bytes")
+    print("결과 일치: " + ("OK" if same else "FAIL"))
+
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
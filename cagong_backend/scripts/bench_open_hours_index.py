@@ -0,0 +1,101 @@
+"""
+영업 중 카페 필터링 벤치마크
+
+가상의 카페 N개(기본 50,000개)의 영업시간을 만들어
+1) 요일 컬럼 문자열 비교 (기존 방식: 카페마다 "HH:MM" 비교)
+2) 카페별 컴파일된 스케줄 구간 조회 (CafeSchedule.is_open_at)
+3) 시간대별 영업 인덱스 (OpenHoursIndex.open_ids)
+세 가지로 "지금 영업 중인 카페"를 구하는 시간을 비교하고, 결과가 모두 같은지 확인한다.
+
+DB나 Flask 앱 없이 실행된다. (cagong_backend 디렉터리에서)
+    python scripts/bench_open_hours_index.py --cafes 50000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cafe_hours import CafeSchedule, OpenHoursIndex  # noqa: E402
+
+
+def make_hours(rng):
+    """가상 카페 하나의 요일별 (begin, end), 설명, 정기휴무 요일"""
+    begin = f"{rng.choice([7, 8, 9, 10, 11]):02d}:{rng.choice(['00', '15', '30'])}"
+    end = rng.choice(["18:00", "20:00", "21:30", "22:00", "21:45", "23:00", "00:00", "01:15", "02:00"])
+    days = [(begin, end)] * 7
+    description, closed = None, None
+    if rng.random() < 0.3:
+        closed = rng.randrange(7)
+        description = f"*매주 {'월화수목금토일'[closed]} 정기휴무"
+    return days, description, closed
+
+
+def string_compare_is_open(days, closed_weekday, at):
+    """기존 check_availability와 같은 방식의 문자열 비교 (자정 넘는 영업은 지원하지 않음)"""
+    weekday = at.weekday()
+    if weekday == closed_weekday:
+        return False
+    begin, end = days[weekday]
+    time_str = at.strftime("%H:%M")
+    return begin <= time_str < end
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영업 중 카페 필터링 벤치마크")
+    parser.add_argument('--cafes', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cafes = []
+    for cafe_id in range(1, args.cafes + 1):
+        days, description, closed = make_hours(rng)
+        cafes.append((cafe_id, days, description, closed))
+
+    start = time.perf_counter()
+    schedules = [(cafe_id, CafeSchedule(days, description)) for cafe_id, days, description, _ in cafes]
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    index = OpenHoursIndex(schedules)
+    index_ms = (time.perf_counter() - start) * 1000
+
+    base = datetime(2030, 1, 7)
+    query_times = [base + timedelta(minutes=rng.randrange(7 * 24 * 60)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    for at in query_times:
+        [cafe_id for cafe_id, days, _, closed in cafes if string_compare_is_open(days, closed, at)]
+    string_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    start = time.perf_counter()
+    expected = []
+    for at in query_times:
+        expected.append({cafe_id for cafe_id, schedule in schedules if schedule.is_open_at(at)})
+    schedule_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    start = time.perf_counter()
+    actual = [index.open_ids(at) for at in query_times]
+    index_query_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    mismatches = sum(1 for e, a in zip(expected, actual) if e != a)
+
+    print(f"카페 {args.cafes:,}개, 조회 {args.queries}회 (한 주 안의 무작위 시각)")
+    print(f"스케줄 컴파일:        {compile_ms:9.1f} ms (1회)")
+    print(f"영업 인덱스 생성:     {index_ms:9.1f} ms (1회)")
+    print(f"문자열 비교 (기존):   {string_ms:9.3f} ms/조회")
+    print(f"카페별 구간 조회:     {schedule_ms:9.3f} ms/조회")
+    print(f"영업 인덱스 조회:     {index_query_ms:9.3f} ms/조회")
+    print("결과 일치: " + ("OK" if mismatches == 0 else f"FAIL ({mismatches}건 불일치)"))
+
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Google ID 토큰 인증서/검증 결과 캐시 점검 스크립트
+
+로컬에서 만든 RSA 키로 토큰을 서명하고, 그 공개키를 내려주는 인증서 스텁을 임의 포트로 띄운 뒤
+GOOGLE_CERTS_URL을 스텁으로 돌려 다음을 확인한다.
+1) 첫 검증에서만 인증서 요청 1번
+2) 같은 토큰 재검증(/google-login -> /google-signup)은 인증서 요청 없이 응답
+3) 새 토큰도 인증서가 max-age 안이면 인증서 요청 없음
+4) max-age가 지나면 인증서 다시 요청
+5) 키 교체(모르는 kid) 시 한 번만 다시 받아 검증 성공
+6) 만료/잘못된 aud/잘못된 iss/다른 키 서명 토큰은 거부
+7) 없는 kid 토큰이 반복돼도 최소 간격 안에서는 인증서를 다시 받지 않음
+
+실제 Google이나 DB 없이 실행된다. (cagong_backend 디렉터리에서)
+    python scripts/check_google_token_cache.py
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from flask import Flask, jsonify  # noqa: E402
+from google.auth import crypt, jwt as google_jwt  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from services import auth_service, google_id_token  # noqa: E402
+
+
+CLIENT_ID = "check-client.apps.googleusercontent.com"
+
+
+def new_key():
+    """(개인키 PEM, 공개키 PEM)"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+class CertStub:
+    """{kid: 공개키 PEM}을 Cache-Control max-age와 함께 내려주는 인증서 스텁"""
+
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self.certs = {}
+        self.request_count = 0
+        self.app = Flask('cert_stub')
+        self.app.add_url_rule('/oauth2/v1/certs', view_func=self.serve)
+
+    def serve(self):
+        self.request_count += 1
+        response = jsonify(self.certs)
+        response.headers['Cache-Control'] = f'public, max-age={self.max_age}, must-revalidate, no-transform'
+        return response
+
+    def start(self):
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)  # 스텁 요청 로그 숨김
+        self.server = make_server('127.0.0.1', 0, self.app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}/oauth2/v1/certs"
+
+
+def make_token(private_pem, kid, sub="1234567890", aud=CLIENT_ID,
+               iss="https://accounts.google.com", lifetime=3600):
+    now = int(time.time())
+    payload = {
+        'iss': iss, 'aud': aud, 'sub': sub, 'email': f"{sub}@example.com",
+        'iat': now, 'exp': now + lifetime,
+    }
+    signer = crypt.RSASigner.from_string(private_pem, key_id=kid)
+    return google_jwt.encode(signer, payload).decode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google ID 토큰 캐시 점검")
+    parser.add_argument('--max-age', type=int, default=1, help="스텁 인증서 max-age (초)")
+    parser.add_argument('--repeat', type=int, default=1000, help="캐시 적중 시간 측정 반복 수")
+    args = parser.parse_args()
+
+    private_1, public_1 = new_key()
+    private_2, public_2 = new_key()
+    stub = CertStub(args.max_age)
+    stub.certs = {'key-1': public_1}
+
+    app = Flask(__name__)
+    app.config.update(
+        GOOGLE_CLIENT_ID=CLIENT_ID,
+        GOOGLE_CERTS_URL=stub.start(),
+        GOOGLE_TOKEN_CACHE_SIZE=100,
+        GOOGLE_CERTS_MIN_REFRESH_SECONDS=args.max_age,
+    )
+
+    failed = 0
+
+    def check(name, ok, detail=""):
+        nonlocal failed
+        failed += 0 if ok else 1
+        print(f"[{'OK' if ok else 'FAIL'}]   {name} {detail}")
+
+    def verify(token):
+        with app.app_context():
+            return auth_service.verify_google_token(token)
+
+    # 1) 첫 검증
+    token = make_token(private_1, 'key-1')
+    start = time.perf_counter()
+    claims = verify(token)
+    cold_ms = (time.perf_counter() - start) * 1000
+    check("첫 검증", claims is not None and claims['sub'] == "1234567890" and stub.request_count == 1,
+          f"인증서 요청 {stub.request_count}번, {cold_ms:.1f} ms")
+
+    # 2) 같은 토큰 재검증
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        claims = verify(token)
+    hit_us = (time.perf_counter() - start) * 1e6 / args.repeat
+    check("같은 토큰 재검증", claims is not None and stub.request_count == 1,
+          f"인증서 요청 {stub.request_count}번, 평균 {hit_us:.1f} us")
+
+    # 반환된 claims를 고쳐도 캐시는 그대로
+    claims['sub'] = 'tampered'
+    check("캐시 claims 복사본 반환", verify(token)['sub'] == "1234567890")
+
+    # 3) 새 토큰 (인증서 max-age 안)
+    start = time.perf_counter()
+    claims = verify(make_token(private_1, 'key-1', sub="42"))
+    warm_ms = (time.perf_counter() - start) * 1000
+    check("새 토큰 (인증서 캐시)", claims is not None and claims['sub'] == "42" and stub.request_count == 1,
+          f"인증서 요청 {stub.request_count}번, {warm_ms:.1f} ms")
+
+    # 4) max-age 경과 (이번에는 오래 유효한 인증서를 받아 5)에서 만료가 아닌 kid로 다시 받는지 확인)
+    time.sleep(args.max_age + 0.1)
+    stub.max_age = 3600
+    claims = verify(make_token(private_1, 'key-1', sub="43"))
+    check("max-age 경과 후 재요청", claims is not None and stub.request_count == 2,
+          f"인증서 요청 {stub.request_count}번")
+
+    # 5) 키 교체: 스텁은 새 키를 내려주지만 캐시에는 아직 key-1만 있음
+    #    (4)에서 받은 지 최소 간격(--max-age와 같게 둠)이 지난 뒤 요청
+    stub.certs = {'key-1': public_1, 'key-2': public_2}
+    time.sleep(args.max_age + 0.1)
+    before = stub.request_count
+    claims = verify(make_token(private_2, 'key-2', sub="44"))
+    check("키 교체 (모르는 kid)", claims is not None and stub.request_count == before + 1,
+          f"인증서 요청 {stub.request_count - before}번")
+
+    # 6) 거부되어야 하는 토큰
+    before = stub.request_count
+    check("만료 토큰 거부", verify(make_token(private_1, 'key-1', lifetime=-600)) is None)
+    check("잘못된 aud 거부", verify(make_token(private_1, 'key-1', aud="other-client")) is None)
+    check("잘못된 iss 거부", verify(make_token(private_1, 'key-1', iss="https://evil.example.com")) is None)
+    check("다른 키 서명 거부", verify(make_token(private_2, 'key-1')) is None)
+    check("거부 토큰은 인증서 재요청 없음", stub.request_count == before,
+          f"인증서 요청 {stub.request_count - before}번")
+
+    # 7) 모르는 kid가 계속 와도 마지막으로 받은 지 최소 간격 안이면 다시 받지 않음
+    app.config['GOOGLE_CERTS_MIN_REFRESH_SECONDS'] = 60
+    before = stub.request_count
+    rejected = all(verify(make_token(private_1, f'key-unknown-{i}')) is None for i in range(20))
+    check("없는 kid 반복 거부", rejected and stub.request_count == before,
+          f"토큰 20개, 인증서 요청 {stub.request_count - before}번")
+
+    # 최소 간격이 지나면 다시 받을 수 있음
+    app.config['GOOGLE_CERTS_MIN_REFRESH_SECONDS'] = 0
+    check("최소 간격 후 재요청", verify(make_token(private_1, 'key-unknown')) is None
+          and stub.request_count == before + 1, f"인증서 요청 {stub.request_count - before}번")
+
+    stub.server.shutdown()
+    google_id_token._claims_cache = None
+    print("결과: " + ("OK" if failed == 0 else f"FAIL ({failed}개 항목)"))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+결제 outbox/보정 작업 점검 스크립트
+
+저장소 루트의 mock_server.py(Toss 승인/조회/취소 스텁)를 임의 포트로 띄우고 TOSS_API_URL을 스텁으로 돌린 뒤,
+임시 SQLite DB에서 결제 승인 도중 끊긴 상황을 만들어 reconcile_payments()가 마무리하는지 확인한다.
+1) 정상 승인: CONFIRM 작업이 주문 PAID와 같은 커밋으로 DONE
+2) 트랜잭션 A 직후 중단 (Toss 승인 요청 없음)  -> FAILED
+3) Toss 승인 후 트랜잭션 B 전에 중단           -> PAID (paymentKey 기록)
+4) Toss는 승인됐는데 주문은 FAILED              -> CANCEL 작업 -> cancel_payment로 환불 -> CANCELED
+5) outbox 작업 없이 PROCESSING에 멈춘 주문      -> CONFIRM 작업 추가 후 처리
+6) 아직 멈춘 것으로 보지 않는 최근 주문          -> 건드리지 않음
+7) Toss 일시 오류                               -> 재시도 예약, 다음 실행에서 처리
+8) 대량 작업도 동시 Toss 조회 수는 --concurrency 이하
+9) Toss가 승인 후 500 응답                       -> 주문 FAILED, CONFIRM은 PENDING -> 보정 시 환불
+10) Toss가 승인 거절(4xx)                        -> 주문 FAILED, CONFIRM DONE (보정할 작업 없음)
+11) Toss 통신 실패 (연결 불가)                   -> 주문 FAILED, CONFIRM은 PENDING -> 보정 시 Toss에 결제 없음 확인
+
+실제 DB나 Toss 키 없이 실행된다. (cagong_backend 디렉터리에서)
+    python scripts/check_payment_reconciler.py --stuck 40 --concurrency 4
+"""
+
+import argparse
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+import requests  # noqa: E402
+from flask import Flask  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import mock_server  # noqa: E402
+from config import Config  # noqa: E402
+from models import db, init_db, Order, PaymentOutbox, User  # noqa: E402
+from exceptions.custom_exceptions import PaymentApiCallException  # noqa: E402
+from services import payment_reconciler, payment_service  # noqa: E402
+
+
+STUCK_SECONDS = 300
+
+
+def start_stub():
+    """mock_server 앱을 빈 포트에서 백그라운드로 실행하고 서버 객체를 반환"""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # 스텁 요청 로그 숨김
+    server = make_server('127.0.0.1', 0, mock_server.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def create_app(db_path, toss_url):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}",
+        SQLALCHEMY_ECHO=False,
+        TOSS_API_URL=toss_url,
+        TOSS_SECRET_KEY='test_sk_stub',
+        HTTP_RETRIES=0,                      # 일시 오류는 보정 작업의 재시도로 처리되는지 확인
+        PAYMENT_RECONCILE_STUCK_SECONDS=STUCK_SECONDS,
+        PAYMENT_RECONCILE_RETRY_SECONDS=60,
+    )
+    app.logger.setLevel(logging.CRITICAL + 1)  # 점검 중 의도한 오류 로그 숨김
+    init_db(app)
+    with app.app_context():
+        db.create_all()
+        user = User(google_id='reconcile', email='reconcile@test.com', name='r', nickname='reconcile')
+        db.session.add(user)
+        db.session.commit()
+        app.config['CHECK_USER_ID'] = user.id
+    return app
+
+
+def new_order(app):
+    order = Order(user_id=app.config['CHECK_USER_ID'], order_name="보정 점검", amount=1000)
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+
+def age(order, seconds=STUCK_SECONDS * 2):
+    """주문/outbox 작업을 오래전에 멈춘 것처럼 시각을 되돌림"""
+    past = datetime.utcnow() - timedelta(seconds=seconds)
+    PaymentOutbox.query.filter_by(order_id=order.id).update({'created_at': past})
+    Order.query.filter_by(id=order.id).update({'updated_at': past})
+    db.session.commit()
+
+
+def toss_confirm(toss_url, order):
+    """Toss(스텁)에만 승인 요청 (서버가 응답을 받기 전에 죽은 상황)"""
+    requests.post(f"{toss_url}/v1/payments/confirm",
+                  json={"paymentKey": f"pk_{order.order_id}", "orderId": order.order_id, "amount": order.amount})
+
+
+def outbox(order, operation='CONFIRM'):
+    return PaymentOutbox.query.filter_by(order_id=order.id, operation=operation).first()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="결제 outbox/보정 작업 점검")
+    parser.add_argument('--stuck', type=int, default=40, help="대량 보정 점검용 멈춘 주문 수")
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    server = start_stub()
+    toss_url = f"http://127.0.0.1:{server.server_port}"
+    app = create_app(os.path.join(tempfile.mkdtemp(), 'reconcile.sqlite'), toss_url)
+    stats_url = f"{toss_url}/v1/payments:stats"
+
+    failed = 0
+
+    def check(name, ok, detail=""):
+        nonlocal failed
+        failed += 0 if ok else 1
+        print(f"[{'OK' if ok else 'FAIL'}]   {name} {detail}")
+
+    with app.app_context():
+        # 1) 정상 승인
+        paid = new_order(app)
+        payment_service.confirm_payment(f"pk_{paid.order_id}", paid.order_id, 1000)
+        check("정상 승인", paid.status == 'PAID' and outbox(paid).status == 'DONE',
+              f"주문 {paid.status}, CONFIRM {outbox(paid).status}")
+
+        # 2) 트랜잭션 A 직후 중단
+        crashed_before_toss = new_order(app)
+        payment_service._reserve_order(f"pk_{crashed_before_toss.order_id}", crashed_before_toss.order_id, 1000)
+        age(crashed_before_toss)
+
+        # 3) Toss 승인 후 트랜잭션 B 전에 중단
+        crashed_after_toss = new_order(app)
+        payment_service._reserve_order(f"pk_{crashed_after_toss.order_id}", crashed_after_toss.order_id, 1000)
+        toss_confirm(toss_url, crashed_after_toss)
+        age(crashed_after_toss)
+
+        # 4) Toss는 승인됐는데 주문은 FAILED (승인 응답 타임아웃 후 트랜잭션 C 등)
+        charged_but_failed = new_order(app)
+        payment_service._reserve_order(f"pk_{charged_but_failed.order_id}", charged_but_failed.order_id, 1000)
+        toss_confirm(toss_url, charged_but_failed)
+        charged_but_failed.status = 'FAILED'
+        db.session.commit()
+        age(charged_but_failed)
+
+        # 5) outbox 작업 없이 멈춘 주문 (outbox 도입 전)
+        legacy = new_order(app)
+        legacy.status = 'PROCESSING'
+        db.session.commit()
+        toss_confirm(toss_url, legacy)
+        age(legacy)
+
+        # 6) 최근 주문 (백그라운드 승인이 아직 진행 중일 수 있음)
+        recent = new_order(app)
+        payment_service._reserve_order(f"pk_{recent.order_id}", recent.order_id, 1000)
+
+        results = payment_reconciler.reconcile_payments(concurrency=args.concurrency)
+        db.session.expire_all()
+        print(f"         보정 결과: {dict(results)}")
+
+        check("A 직후 중단 -> FAILED", crashed_before_toss.status == 'FAILED'
+              and outbox(crashed_before_toss).status == 'DONE', crashed_before_toss.status)
+        check("Toss 승인 후 중단 -> PAID", crashed_after_toss.status == 'PAID'
+              and crashed_after_toss.payment_key == f"mock_pk_for_{crashed_after_toss.order_id}",
+              f"{crashed_after_toss.status} {crashed_after_toss.payment_key}")
+        cancel = outbox(charged_but_failed, 'CANCEL')
+        toss_status = mock_server.payments[charged_but_failed.order_id]['status']
+        check("승인됐는데 FAILED -> 환불", charged_but_failed.status == 'CANCELED'
+              and cancel is not None and cancel.status == 'DONE' and toss_status == 'CANCELED',
+              f"주문 {charged_but_failed.status}, Toss {toss_status}")
+        check("outbox 없이 멈춘 주문", legacy.status == 'PAID' and outbox(legacy).status == 'DONE', legacy.status)
+        check("최근 주문은 그대로", recent.status == 'PROCESSING' and outbox(recent).status == 'PENDING'
+              and outbox(recent).attempts == 0, recent.status)
+
+        again = payment_reconciler.reconcile_payments(concurrency=args.concurrency)
+        check("다시 실행하면 처리할 작업 없음", not again, str(dict(again)))
+
+        # 7) Toss 일시 오류
+        flaky = new_order(app)
+        payment_service._reserve_order(f"pk_{flaky.order_id}", flaky.order_id, 1000)
+        toss_confirm(toss_url, flaky)
+        age(flaky)
+        requests.post(stats_url, json={"fail_next_lookups": 1})
+        results = payment_reconciler.reconcile_payments(concurrency=args.concurrency)
+        db.session.expire_all()
+        entry = outbox(flaky)
+        check("일시 오류 -> 재시도 예약", results.get('RETRY') == 1 and entry.status == 'PENDING'
+              and entry.attempts == 1 and entry.next_attempt_at > datetime.utcnow() and entry.last_error,
+              f"시도 {entry.attempts}번, 오류: {(entry.last_error or '')[:40]}")
+        entry.next_attempt_at = datetime.utcnow()
+        db.session.commit()
+        payment_reconciler.reconcile_payments(concurrency=args.concurrency)
+        db.session.expire_all()
+        check("재시도 후 처리", flaky.status == 'PAID' and outbox(flaky).attempts == 2, flaky.status)
+
+        # 8) 대량 보정 (동시 Toss 조회 수 제한)
+        stuck = []
+        for i in range(args.stuck):
+            order = new_order(app)
+            payment_service._reserve_order(f"pk_{order.order_id}", order.order_id, 1000)
+            if i % 2 == 0:
+                toss_confirm(toss_url, order)
+            stuck.append(order)
+        for order in stuck:
+            age(order)
+
+        mock_server.payments_stats['max_inflight'] = 0
+        start = time.perf_counter()
+        results = payment_reconciler.reconcile_payments(batch_size=10, concurrency=args.concurrency)
+        elapsed = time.perf_counter() - start
+        db.session.expire_all()
+        statuses = {order.status for order in stuck}
+        max_inflight = requests.get(stats_url).json()['max_inflight']
+        check("대량 보정", results.get('PAID') == (args.stuck + 1) // 2 and results.get('FAILED') == args.stuck // 2
+              and statuses == {'PAID', 'FAILED'},
+              f"{args.stuck}건 {elapsed:.2f}s, {dict(results)}")
+        check("동시 Toss 조회 수 제한", max_inflight <= args.concurrency,
+              f"최대 {max_inflight}개 / 제한 {args.concurrency}개")
+
+        # 9) ~ 11) 승인 요청 중 Toss 오류: 확실한 거절(4xx)만 CONFIRM 작업을 끝냄
+        def confirm_with_error(order):
+            try:
+                payment_service.confirm_payment(f"pk_{order.order_id}", order.order_id, 1000)
+            except PaymentApiCallException as e:
+                return e
+            return None
+
+        requests.post(stats_url, json={"fail_next_confirms": 1})
+        charged_5xx = new_order(app)
+        error_5xx = confirm_with_error(charged_5xx)
+        requests.post(stats_url, json={"reject_next_confirms": 1})
+        rejected = new_order(app)
+        error_4xx = confirm_with_error(rejected)
+        with socket.socket() as sock:  # 아무도 듣지 않는 포트
+            sock.bind(('127.0.0.1', 0))
+            closed_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        app.config['TOSS_API_URL'] = closed_url
+        unreachable = new_order(app)
+        error_transport = confirm_with_error(unreachable)
+        app.config['TOSS_API_URL'] = toss_url
+        db.session.expire_all()
+
+        check("승인 후 500 -> CONFIRM 유지", error_5xx is not None and error_5xx.status_code == 500
+              and charged_5xx.status == 'FAILED' and outbox(charged_5xx).status == 'PENDING',
+              f"주문 {charged_5xx.status}, CONFIRM {outbox(charged_5xx).status}")
+        check("승인 거절(4xx) -> CONFIRM 완료", error_4xx is not None and error_4xx.status_code == 403
+              and rejected.status == 'FAILED' and outbox(rejected).status == 'DONE',
+              f"주문 {rejected.status}, CONFIRM {outbox(rejected).status}")
+        check("통신 실패 -> CONFIRM 유지", error_transport is not None and error_transport.status_code is None
+              and unreachable.status == 'FAILED' and outbox(unreachable).status == 'PENDING',
+              f"주문 {unreachable.status}, CONFIRM {outbox(unreachable).status}")
+
+        for order in (charged_5xx, rejected, unreachable):
+            age(order)
+        results = payment_reconciler.reconcile_payments(concurrency=args.concurrency)
+        db.session.expire_all()
+        toss_status = mock_server.payments[charged_5xx.order_id]['status']
+        check("승인 후 500 -> 보정 시 환불", charged_5xx.status == 'CANCELED' and toss_status == 'CANCELED'
+              and outbox(charged_5xx, 'CANCEL').status == 'DONE',
+              f"주문 {charged_5xx.status}, Toss {toss_status}, {dict(results)}")
+        check("통신 실패 -> 보정 시 FAILED 확정", unreachable.status == 'FAILED' and outbox(unreachable).status == 'DONE'
+              and outbox(unreachable, 'CANCEL') is None, unreachable.status)
+        check("거절된 주문은 보정 대상 아님", outbox(rejected, 'CANCEL') is None and rejected.status == 'FAILED')
+
+    server.shutdown()
+    print("결과: " + ("OK" if failed == 0 else f"FAIL ({failed}개 항목)"))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
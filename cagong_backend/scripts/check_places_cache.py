@@ -0,0 +1,110 @@
+"""
+Places 검색 캐시/요청 합치기 점검 스크립트
+
+저장소 루트의 mock_server.py(Places Text Search 스텁)를 임의 포트로 띄우고
+GOOGLE_PLACES_URL을 스텁으로 돌린 뒤 다음을 확인한다.
+1) 같은 검색(공백/좌표 소수점만 다른 경우 포함)을 동시에 여러 번 보내도 스텁 요청은 1번
+2) 캐시에 있는 검색은 스텁 요청 없이 응답
+3) 다른 검색은 따로 요청
+4) TTL이 지나면 다시 요청
+
+실제 Google API 키나 DB 없이 실행된다. (cagong_backend 디렉터리에서)
+    python scripts/check_places_cache.py --threads 20
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+from flask import Flask  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import mock_server  # noqa: E402
+from services import places_service  # noqa: E402
+
+
+def start_stub():
+    """mock_server 앱을 빈 포트에서 백그라운드로 실행하고 서버 객체를 반환"""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # 스텁 요청 로그 숨김
+    server = make_server('127.0.0.1', 0, mock_server.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Places 검색 캐시/요청 합치기 점검")
+    parser.add_argument('--threads', type=int, default=20)
+    parser.add_argument('--ttl', type=float, default=1.0, help="점검용 캐시 TTL (초)")
+    args = parser.parse_args()
+
+    server = start_stub()
+    app = Flask(__name__)
+    app.config.update(
+        GOOGLE_API_KEY='stub-key',
+        GOOGLE_PLACES_URL=f"http://127.0.0.1:{server.server_port}/v1/places:searchText",
+        PLACES_CACHE_SIZE=100,
+        PLACES_CACHE_TTL=args.ttl,
+    )
+
+    def search(query, lat=37.5662, lng=126.978):
+        with app.app_context():
+            return places_service.search_cafes_from_places(query, lat, lng, 3000)
+
+    def upstream_count():
+        return mock_server.places_request_count
+
+    results = []
+    failed = 0
+
+    def check(name, ok, detail=""):
+        nonlocal failed
+        failed += 0 if ok else 1
+        print(f"[{'OK' if ok else 'FAIL'}]   {name} {detail}")
+
+    # 1) 동시에 같은 검색 (공백, 좌표 4번째 자리만 다름)
+    barrier = threading.Barrier(args.threads)
+
+    def worker(i):
+        barrier.wait()
+        query = "스타벅스 강남" if i % 2 else "  스타벅스   강남 "
+        results.append(search(query, lat=37.5662 + (i % 3) * 0.00001))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cold_ms = (time.perf_counter() - start) * 1000
+    check("동시 같은 검색", upstream_count() == 1 and len(results) == args.threads,
+          f"스텁 요청 {upstream_count()}번 / 검색 {len(results)}번, {cold_ms:.0f} ms")
+
+    # 2) 캐시 적중
+    start = time.perf_counter()
+    search("스타벅스 강남")
+    hit_ms = (time.perf_counter() - start) * 1000
+    check("캐시 적중", upstream_count() == 1, f"스텁 요청 {upstream_count()}번, {hit_ms:.2f} ms")
+
+    # 3) 다른 검색
+    search("투썸플레이스")
+    check("다른 검색", upstream_count() == 2, f"스텁 요청 {upstream_count()}번")
+
+    # 4) TTL 만료
+    time.sleep(args.ttl + 0.1)
+    search("스타벅스 강남")
+    check("TTL 만료 후 재요청", upstream_count() == 3, f"스텁 요청 {upstream_count()}번")
+
+    server.shutdown()
+    print("결과: " + ("OK" if failed == 0 else f"FAIL ({failed}개 항목)"))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+API별 SQL 실행 횟수 점검 스크립트
+
+주요 조회 API를 테스트 클라이언트로 호출하면서 실행된 SQL 문 수를 세고,
+정해 둔 상한(QUERY_BUDGETS)을 넘으면 실행된 SQL 목록을 출력하고 실패 처리한다.
+댓글/평점이 많은 카페에서 N+1 쿼리가 다시 생기지 않았는지 확인하는 용도.
+
+사용법 (cagong_backend 디렉터리에서, 개발용 DB 설정으로 실행):
+    python scripts/check_query_counts.py --cafe-id 1 --user-id 1
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import app  # noqa: E402
+from query_counter import assert_max_queries  # noqa: E402
+
+
+# (설명, URL 템플릿, 로그인 필요 여부, 허용 SQL 문 수)
+# 댓글/평점 개수와 관계없이 이 수를 넘으면 안 된다.
+QUERY_BUDGETS = [
+    ("댓글 목록", "/api/comments/{cafe_id}", False, 2),
+    ("평점 통계", "/api/ratings/{cafe_id}", True, 4),  # 평점이 없는 카페는 카페 존재 확인까지 포함
+    ("평점 요약", "/api/ratings/summary?cafe_ids={cafe_id}", False, 1),
+    ("내 평점 목록", "/api/ratings/my-ratings", True, 1),
+    ("좋아요 한 카페 목록", "/api/likes/me", True, 1),
+    # 스냅샷 확인/재생성 2번 + 좋아요 여부 1번 (표시할 카페 수와 관계없음)
+    ("주변 카페+좋아요 여부", "/api/cafes/nearby?lat=37.5665&lng=126.978&include=liked_by_me", True, 3),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API별 SQL 실행 횟수 점검")
+    parser.add_argument('--cafe-id', type=int, required=True)
+    parser.add_argument('--user-id', type=int, required=True)
+    args = parser.parse_args()
+
+    failed = 0
+    with app.app_context():
+        token = create_access_token(identity=str(args.user_id))
+        client = app.test_client()
+
+        for name, url_template, needs_auth, limit in QUERY_BUDGETS:
+            url = url_template.format(cafe_id=args.cafe_id)
+            headers = {'Authorization': f'Bearer {token}'} if needs_auth else {}
+            try:
+                with assert_max_queries(limit) as counter:
+                    response = client.get(url, headers=headers)
+                print(f"[OK]   {name:<12} {url} -> {response.status_code}, SQL {counter.count}/{limit}")
+            except AssertionError as e:
+                failed += 1
+                print(f"[FAIL] {name:<12} {url}\n{e}")
+
+    print("결과: " + ("OK" if failed == 0 else f"FAIL ({failed}개 API 상한 초과)"))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
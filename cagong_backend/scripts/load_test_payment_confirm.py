@@ -0,0 +1,184 @@
+"""
+결제 승인 부하 테스트 (요청 안에서 Toss 대기 vs 백그라운드 승인)
+
+저장소 루트의 mock_server.py(Toss 승인 1.5초 스텁)를 임의 포트로 띄우고 TOSS_API_URL을 스텁으로 돌린 뒤,
+고정된 수의 요청 워커(gunicorn sync 워커 흉내)로 /api/payments/success 요청을 한꺼번에 보낸다.
+같은 워커 큐에 /api/health 요청도 섞어 보내, 결제 폭주 중 다른 API가 얼마나 기다리는지도 잰다.
+
+- sync : PAYMENT_CONFIRM_WORKERS=0 (기존 방식, 워커가 Toss 응답까지 묶임)
+- async: PAYMENT_CONFIRM_WORKERS=N (주문 선점 후 바로 리다이렉트, Toss 승인은 백그라운드)
+
+임시 SQLite DB를 쓰므로 실제 DB나 Toss 키 없이 실행된다. (cagong_backend 디렉터리에서)
+    python scripts/load_test_payment_confirm.py --orders 32 --request-workers 4 --confirm-workers 8
+"""
+
+import argparse
+import logging
+import os
+import queue
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+from flask import Flask  # noqa: E402
+from flask_jwt_extended import JWTManager, create_access_token  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import mock_server  # noqa: E402
+from config import Config  # noqa: E402
+from exceptions.handlers import register_handlers  # noqa: E402
+from models import db, init_db, Order, User  # noqa: E402
+from routes import register_blueprints  # noqa: E402
+from services import payment_service  # noqa: E402
+
+
+def start_stub():
+    """mock_server 앱을 빈 포트에서 백그라운드로 실행하고 서버 객체를 반환"""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # 스텁 요청 로그 숨김
+    server = make_server('127.0.0.1', 0, mock_server.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def create_app(db_path, toss_url):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}",
+        SQLALCHEMY_ECHO=False,
+        DEBUG=False,
+        TOSS_API_URL=toss_url,
+        TOSS_SECRET_KEY='test_sk_stub',
+        JWT_SECRET_KEY='load-test-jwt-secret-key-for-hs256',
+    )
+    app.logger.setLevel(logging.ERROR)
+    JWTManager(app)
+    register_handlers(app)
+    register_blueprints(app)
+    init_db(app)
+    with app.app_context():
+        db.create_all()
+        user = User(google_id='load-test', email='load@test.com', name='load', nickname='load')
+        db.session.add(user)
+        db.session.commit()
+        app.config['LOAD_TEST_USER_ID'] = user.id
+    return app
+
+
+def create_orders(app, count):
+    with app.app_context():
+        orders = [Order(user_id=app.config['LOAD_TEST_USER_ID'], order_name="부하 테스트", amount=1000)
+                  for _ in range(count)]
+        db.session.add_all(orders)
+        db.session.commit()
+        return [order.order_id for order in orders]
+
+
+def count_settled(app, order_ids):
+    with app.app_context():
+        return Order.query.filter(Order.order_id.in_(order_ids), Order.status.in_(('PAID', 'FAILED'))).count()
+
+
+def run(app, mode, args):
+    app.config['PAYMENT_CONFIRM_WORKERS'] = args.confirm_workers if mode == 'async' else 0
+    order_ids = create_orders(app, args.orders)
+
+    # 요청 워커: 큐에서 하나씩 꺼내 처리 (처리 중에는 다른 요청을 받지 못함)
+    jobs = queue.Queue()
+    results = {'success': [], 'health': []}
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            kind, url, enqueued = job
+            response = client.get(url)
+            with lock:
+                results[kind].append((time.perf_counter() - enqueued, response.status_code,
+                                      response.headers.get('Location', '')))
+
+    workers = [threading.Thread(target=worker) for _ in range(args.request_workers)]
+    for t in workers:
+        t.start()
+
+    start = time.perf_counter()
+    for i, order_id in enumerate(order_ids):
+        jobs.put(('success', f"/api/payments/success?paymentKey=pk_{order_id}&orderId={order_id}&amount=1000",
+                  time.perf_counter()))
+        if i % 4 == 0:
+            jobs.put(('health', "/api/health", time.perf_counter()))
+    for _ in workers:
+        jobs.put(None)
+    for t in workers:
+        t.join()
+    responded = time.perf_counter() - start
+
+    # 모든 주문이 PAID/FAILED로 확정될 때까지 대기
+    while count_settled(app, order_ids) < len(order_ids):
+        time.sleep(0.05)
+    settled = time.perf_counter() - start
+
+    with app.app_context():
+        paid = Order.query.filter(Order.order_id.in_(order_ids), Order.status == 'PAID').count()
+        # 상태 API 확인 (마지막 주문)
+        token = create_access_token(identity=str(app.config['LOAD_TEST_USER_ID']))
+    status = app.test_client().get(f"/api/payments/status/{order_ids[-1]}",
+                                   headers={'Authorization': f'Bearer {token}'}).get_json()
+
+    health_ms = [r[0] * 1000 for r in results['health']]
+    pages = {r[2].split('?')[0].rsplit('/', 1)[-1] for r in results['success']}
+    return {
+        'mode': mode,
+        'responded_s': responded,
+        'settled_s': settled,
+        'req_per_s': len(order_ids) / responded,
+        'paid': paid,
+        'health_p50_ms': statistics.median(health_ms),
+        'health_max_ms': max(health_ms),
+        'redirect_pages': sorted(pages),
+        'last_status': status['data']['status'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="결제 승인 부하 테스트 (sync vs async)")
+    parser.add_argument('--orders', type=int, default=32, help="동시에 들어오는 결제 승인 요청 수")
+    parser.add_argument('--request-workers', type=int, default=4, help="요청 워커 수 (gunicorn sync 워커 흉내)")
+    parser.add_argument('--confirm-workers', type=int, default=8, help="async 모드 백그라운드 승인 스레드 수")
+    args = parser.parse_args()
+
+    server = start_stub()
+    db_dir = tempfile.mkdtemp()
+    app = create_app(os.path.join(db_dir, 'load_test.sqlite'), f"http://127.0.0.1:{server.server_port}")
+
+    print(f"주문 {args.orders}건, 요청 워커 {args.request_workers}개, 백그라운드 승인 스레드 {args.confirm_workers}개 "
+          f"(Mock 승인 1.5초)")
+    reports = [run(app, mode, args) for mode in ('sync', 'async')]
+    for r in reports:
+        print(f"[{r['mode']:<5}] 응답 완료 {r['responded_s']:6.2f}s ({r['req_per_s']:6.1f} req/s), "
+              f"승인 확정 {r['settled_s']:6.2f}s, PAID {r['paid']}/{args.orders}, "
+              f"health p50 {r['health_p50_ms']:7.1f} ms / max {r['health_max_ms']:7.1f} ms, "
+              f"리다이렉트 {r['redirect_pages']}, 상태 API {r['last_status']}")
+
+    sync, async_ = reports
+    print(f"요청 처리량 {async_['req_per_s'] / sync['req_per_s']:.1f}배, "
+          f"승인 확정까지 {sync['settled_s'] / async_['settled_s']:.1f}배 빠름")
+
+    server.shutdown()
+    payment_service._confirm_executor.shutdown(wait=True)
+    ok = all(r['paid'] == args.orders and r['last_status'] == 'PAID' for r in reports)
+    print("결과: " + ("OK" if ok else "FAIL"))
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
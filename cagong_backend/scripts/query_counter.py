@@ -0,0 +1,54 @@
+"""
+점검 스크립트용 SQL 실행 횟수 카운터 (check_query_counts.py에서 사용, 서비스 코드에서는 쓰지 않음)
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from models import db
+
+
+class QueryCounter:
+    """count_queries() 블록 안에서 실행된 SQL 문 기록"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    블록 안에서 DB로 보낸 SQL 문 수를 센다. (앱 컨텍스트 안에서 사용)
+
+    사용 예:
+        with count_queries() as counter:
+            client.get('/api/comments/1')
+        print(counter.count)
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine=None):
+    """블록 안에서 실행된 SQL 문이 limit개를 넘으면 실행된 문장 목록과 함께 AssertionError"""
+    with count_queries(engine) as counter:
+        yield counter
+
+    if counter.count > limit:
+        statements = "\n".join(f"  {i + 1}. {statement}" for i, statement in enumerate(counter.statements))
+        raise AssertionError(f"SQL {counter.count}개 실행 (허용 {limit}개)\n{statements}")
@@ -0,0 +1,151 @@
+"""
+예약 동시성 스트레스 테스트 스크립트
+
+여러 스레드가 같은 카페/같은 슬롯에 동시에 예약을 넣고,
+성공한 좌석 수가 카페 총 좌석 수를 넘지 않는지(초과 예약이 없는지),
+처음 예약되는 슬롯에 동시에 몰려도 교착 상태로 500이 나지 않는지 확인한다.
+
+설정된 개발/운영 DB는 건드리지 않는다. 매번 빈 스키마를 새로 만들어 테이블/카페/사용자를 만들고 끝나면 지운다.
+- --mysql-url을 주면 해당 MySQL 서버에 임시 스키마(cagong_stress_xxxxxxxx)를 만들어 실행 (InnoDB 락 동작 확인용)
+- 주지 않으면 임시 SQLite 파일에서 실행
+
+사용법 (cagong_backend 디렉터리에서):
+    python scripts/stress_reservation_booking.py --threads 50
+    python scripts/stress_reservation_booking.py --mysql-url mysql+pymysql://user:pw@localhost:3306 --threads 50
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from config import Config  # noqa: E402
+from exceptions.handlers import register_handlers  # noqa: E402
+from models import db, init_db, Cafe, Reservation, User  # noqa: E402
+from routes import register_blueprints  # noqa: E402
+
+
+DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+
+def create_app(database_uri, total_seats, pool_size):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=database_uri,
+        SQLALCHEMY_ECHO=False,
+        DEBUG=False,
+    )
+    if database_uri.startswith('mysql'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': pool_size, 'max_overflow': 0}
+    app.logger.setLevel(logging.ERROR)
+    register_handlers(app)
+    register_blueprints(app)
+    init_db(app)
+
+    with app.app_context():
+        db.create_all()
+        hours = {}
+        for day in DAYS:
+            hours[f'{day}_begin'], hours[f'{day}_end'] = '09:00', '22:00'
+        cafe = Cafe(name="스트레스 테스트 카페", address="서울", latitude=37.5665, longitude=126.978,
+                    reservation_enabled=True, total_seats=total_seats, total_consents=total_seats,
+                    hourly_rate=1000, **hours)
+        user = User(google_id='stress', email='stress@test.com', name='stress', nickname='stress')
+        db.session.add_all([cafe, user])
+        db.session.commit()
+        app.config['STRESS_CAFE_ID'], app.config['STRESS_USER_ID'] = cafe.id, user.id
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예약 동시성 스트레스 테스트 (임시 스키마)")
+    parser.add_argument('--mysql-url', default=None,
+                        help="MySQL 서버 URL (스키마 제외, 예: mysql+pymysql://user:pw@localhost:3306)")
+    parser.add_argument('--seats', type=int, default=10, help="테스트 카페 총 좌석 수")
+    parser.add_argument('--duration', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=3, help="매번 처음 예약되는 슬롯으로 반복할 횟수")
+    args = parser.parse_args()
+
+    schema = None
+    if args.mysql_url:
+        schema = f"cagong_stress_{uuid.uuid4().hex[:8]}"
+        server = create_engine(args.mysql_url)
+        with server.begin() as conn:
+            conn.execute(text(f"CREATE DATABASE `{schema}` CHARACTER SET utf8mb4"))
+        database_uri = f"{args.mysql_url.rstrip('/')}/{schema}?charset=utf8mb4"
+    else:
+        database_uri = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'stress.sqlite')}"
+
+    failed = 0
+    try:
+        app = create_app(database_uri, args.seats, args.threads)
+        cafe_id, user_id = app.config['STRESS_CAFE_ID'], app.config['STRESS_USER_ID']
+        print(f"DB: {schema or database_uri}, 좌석 {args.seats}석, 스레드 {args.threads}개")
+
+        # 내일부터 하루씩 옮겨 가며 매 라운드 아무도 예약하지 않은 슬롯에 동시에 몰리게 함
+        first_day = datetime.now().date() + timedelta(days=1)
+        for round_no in range(args.rounds):
+            date_str = (first_day + timedelta(days=round_no)).isoformat()
+            start = datetime.strptime(f"{date_str} 14:00", "%Y-%m-%d %H:%M")
+            end = start + timedelta(hours=args.duration)
+
+            barrier = threading.Barrier(args.threads)
+            statuses = []
+            lock = threading.Lock()
+
+            def worker():
+                client = app.test_client()
+                barrier.wait()  # 모든 스레드가 동시에 요청하도록 맞춤
+                response = client.post('/api/reservations/', json={
+                    'cafe_id': cafe_id,
+                    'user_id': user_id,
+                    'date': date_str,
+                    'time': "14:00",
+                    'duration': args.duration,
+                    'seat_count': 1
+                })
+                with lock:
+                    statuses.append(response.status_code)
+
+            threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            with app.app_context():
+                reserved = db.session.query(db.func.sum(Reservation.seat_count)).filter(
+                    Reservation.cafe_id == cafe_id,
+                    Reservation.status != 'cancelled',
+                    Reservation.start_datetime < end,
+                    Reservation.end_datetime > start
+                ).scalar() or 0
+
+            codes = Counter(statuses)
+            ok = reserved == min(args.seats, args.threads) and codes.get(500, 0) == 0
+            failed += 0 if ok else 1
+            print(f"[{'OK' if ok else 'FAIL'}]   {date_str}: 응답 코드 {dict(codes)}, "
+                  f"예약 좌석 {reserved}/{args.seats}")
+    finally:
+        if schema:
+            with server.begin() as conn:
+                conn.execute(text(f"DROP DATABASE IF EXISTS `{schema}`"))
+
+    print("결과: " + ("OK (초과 예약/서버 오류 없음)" if failed == 0 else f"FAIL ({failed}개 라운드)"))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
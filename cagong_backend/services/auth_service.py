@@ -1,9 +1,8 @@
 from flask import current_app
 from models.user import User, db
-from google.oauth2 import id_token
-from google.auth.transport import requests
 import jwt
 import datetime
+from services import google_id_token
 from exceptions.custom_exceptions import AuthTokenException, InvalidInputException
 from flask_jwt_extended import create_access_token, get_jwt_identity
 
@@ -11,9 +10,9 @@ from flask_jwt_extended import create_access_token, get_jwt_identity
 #  공통: 토큰 검증 함수
 def verify_google_token(id_token_str):
     try:
-        idinfo = id_token.verify_oauth2_token(
+        # 인증서/검증 결과 캐시 사용 (캐시가 살아 있으면 네트워크 호출 없음)
+        idinfo = google_id_token.verify_oauth2_token(
             id_token_str,
-            requests.Request(),
             current_app.config.get("GOOGLE_CLIENT_ID")
         )
         return idinfo
@@ -0,0 +1,163 @@
+"""
+카페 카탈로그 내보내기 (앱 오프라인 캐시용)
+
+앱이 들고 있는 카페 정보(cafe_info.json)를 서버에서 버전 단위로 내려준다.
+카페별 객체 대신 컬럼별 배열로 담아 키 이름이 반복되지 않게 하고,
+카탈로그 버전(카페 추가/수정/삭제 커밋마다 1씩 오르는 카운터, models/cafe_catalog.py)을 기준으로
+바뀐 카페와 삭제된 카페 id만 내려주는 변경분(delta)을 지원한다.
+
+형식 (columns의 배열은 모두 같은 순서/길이, hours만 카페당 14칸):
+    {
+        "schema": 2,
+        "version": 1532,              # 다음 요청의 since_version으로 사용
+        "since_version": 1520,        # 전체 카탈로그면 null
+        "full": false,
+        "count": 2,                   # 이번 응답의 카페 수
+        "total": 1234,                # 현재 전체 카페 수 (보유 개수와 다르면 전체를 다시 받음)
+        "deleted": [17, 203],         # since_version 이후 삭제된 카페 id (전체 카탈로그면 빈 배열)
+        "columns": {
+            "id": [...], "name": [...], "address": [...],
+            "lat": [...], "lng": [...],          # 좌표 x 10^7 정수
+            "hours": [...],                      # 월~일 (시작분, 종료분) 14개씩, 없으면 -1
+            "closed_days": [...],                # 정기휴무 요일 비트 (bit0=월 ~ bit6=일)
+            "hours_description": [...],
+            "reservable": [...]
+        }
+    }
+
+msgpack 패키지가 있으면 format=msgpack으로 MessagePack 본문을 받을 수 있다. (없으면 JSON)
+"""
+
+import hashlib
+
+from sqlalchemy import select
+
+from common.fast_json import dumps
+from models import db, Cafe, CafeTombstone
+from models.cafe_catalog import current_catalog_version
+from services.cafe_hours import WEEKDAY_NAMES, parse_hhmm, parse_weekly_closures
+from services.cafe_service import get_all_cafe_dicts
+from services.cafe_snapshot import get_snapshot
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없는 환경에서는 JSON만 제공
+    msgpack = None
+
+
+CATALOG_SCHEMA = 2  # 2: 버전이 updated_at epoch 초에서 카탈로그 카운터로 바뀜, deleted 추가
+COORD_SCALE = 10 ** 7
+NO_HOURS = -1
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+# 변경분 본문을 (since_version, 형식)별로 보관하는 개수
+CATALOG_DELTA_CACHE_SIZE = 16
+
+_HOUR_COLUMNS = [getattr(Cafe, f"{day}_{edge}") for day in WEEKDAY_NAMES for edge in ('begin', 'end')]
+_CATALOG_COLUMNS = (
+    Cafe.id, Cafe.name, Cafe.address, Cafe.latitude, Cafe.longitude,
+    Cafe.operating_hours, Cafe.reservation_enabled,
+    *_HOUR_COLUMNS,
+)
+
+
+def build_catalog(since_version=None):
+    """
+    카탈로그 dict 생성 (버전 조회 1번 + 컬럼 단위 조회 1번 (+ 변경분이면 삭제 기록 조회 1번), 전체 개수는 스냅샷 사용)
+
+    since_version이 있으면 catalog_version이 그보다 큰 카페와 그 이후 삭제된 카페 id만 담는다.
+    버전은 커밋 순서대로 오르는 정수라 경계가 겹치거나 빠지는 카페가 없다.
+    since_version이 현재 버전보다 크면 (schema 1의 epoch 초 버전 등) 전체 카탈로그를 준다.
+
+    Args:
+        since_version (int, optional): 앱이 가진 카탈로그 버전
+
+    Returns:
+        dict: 카탈로그 (모듈 docstring 형식)
+    """
+    version = current_catalog_version()
+    if since_version and since_version > version:
+        since_version = None
+
+    query = select(*_CATALOG_COLUMNS).where(Cafe.catalog_version <= version).order_by(Cafe.id)
+    deleted = []
+    if since_version:
+        query = query.where(Cafe.catalog_version > since_version)
+        deleted = list(db.session.execute(
+            select(CafeTombstone.cafe_id)
+            .where(CafeTombstone.catalog_version > since_version, CafeTombstone.catalog_version <= version)
+            .order_by(CafeTombstone.cafe_id)
+        ).scalars())
+    rows = db.session.execute(query).all()
+
+    ids, names, addresses, lats, lngs = [], [], [], [], []
+    hours, closed_days, descriptions, reservable = [], [], [], []
+
+    for row in rows:
+        cafe_id, name, address, lat, lng, description, enabled = row[:7]
+        ids.append(cafe_id)
+        names.append(name)
+        addresses.append(address)
+        lats.append(round(lat * COORD_SCALE))
+        lngs.append(round(lng * COORD_SCALE))
+        for value in row[7:]:
+            minute = parse_hhmm(value)
+            hours.append(NO_HOURS if minute is None else minute)
+        closed_days.append(sum(1 << weekday for weekday in parse_weekly_closures(description)))
+        descriptions.append(description)
+        reservable.append(bool(enabled))
+
+    return {
+        "schema": CATALOG_SCHEMA,
+        "version": version,
+        "since_version": since_version or None,
+        "full": not since_version,
+        "count": len(ids),
+        "total": len(get_all_cafe_dicts()),
+        "deleted": deleted,
+        "columns": {
+            "id": ids,
+            "name": names,
+            "address": addresses,
+            "lat": lats,
+            "lng": lngs,
+            "hours": hours,
+            "closed_days": closed_days,
+            "hours_description": descriptions,
+            "reservable": reservable,
+        },
+    }
+
+
+def _encode(catalog, fmt):
+    if fmt == 'msgpack' and msgpack is not None:
+        return msgpack.packb(catalog, use_bin_type=True), MSGPACK_MIMETYPE
+    return dumps({"success": True, "data": catalog}), JSON_MIMETYPE
+
+
+def get_catalog_body(since_version=None, fmt='json'):
+    """
+    카탈로그 응답 본문 (카페가 바뀔 때까지 스냅샷에 보관)
+
+    Args:
+        since_version (int, optional): 앱이 가진 카탈로그 버전 (없으면 전체)
+        fmt (str): 'json' 또는 'msgpack' (msgpack이 없으면 JSON)
+
+    Returns:
+        tuple: (본문 bytes, mimetype, ETag)
+    """
+    # 스냅샷 버전마다 새 dict가 만들어지므로 카페가 바뀌면 캐시도 함께 비워진다
+    cache = get_snapshot("cafes:catalog", dict)
+    key = (since_version or None, fmt)
+
+    cached = cache.get(key)
+    if cached is None:
+        body, mimetype = _encode(build_catalog(since_version), fmt)
+        if since_version and len(cache) >= CATALOG_DELTA_CACHE_SIZE:
+            # 전체 카탈로그는 남기고 오래된 변경분부터 비움
+            oldest = next((k for k in cache if k[0] is not None), None)
+            cache.pop(oldest, None)
+        cached = cache[key] = (body, mimetype, hashlib.sha1(body).hexdigest())
+    return cached
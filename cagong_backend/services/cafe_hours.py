@@ -0,0 +1,264 @@
+"""
+카페 영업시간 스케줄 컴파일
+
+요일별 "HH:MM" 문자열 14개와 자유 텍스트 설명(operating_hours)을
+한 주(월요일 00:00 = 0분 ~ 일요일 24:00 = 10080분) 기준의 분 단위 구간 목록으로 한 번만 변환해 둔다.
+이후 영업 여부 확인은 모두 정수 구간 탐색(bisect)으로 처리한다.
+
+주요 기능:
+- 자정을 넘기는 영업시간 지원 (예: 18:00~02:00, 11:30~29:00)
+- 설명의 정기휴무 문구 반영 (예: "*매주 목 정기휴무", "*일,월 정기휴무")
+- 카페별 스케줄 캐시 (Cafe.updated_at이 바뀌면 다시 컴파일)
+- 전체 카페의 시간대별 영업 인덱스 (OpenHoursIndex)
+"""
+
+import re
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from itertools import chain
+from math import ceil
+
+from common.cache import LRUCache
+
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+WEEKDAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+KOREAN_WEEKDAYS = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
+
+# 설명 한 줄에서 요일 한 글자(또는 "O요일")만 골라낸다. "매일", "당일" 같은 단어 속 글자는 제외
+_WEEKDAY_TOKEN = re.compile(r'(?<![가-힣])([월화수목금토일])(?:요일)?(?![가-힣])')
+_LINE_SPLIT = re.compile(r'\\n|\r\n|\r|\n')
+
+
+def parse_hhmm(value):
+    """
+    "HH:MM" 문자열을 자정 기준 분으로 변환 ("9:00", "29:00"도 허용)
+
+    Returns:
+        int: 분 (형식이 잘못됐거나 값이 없으면 None)
+    """
+    if not value:
+        return None
+    try:
+        hour, minute = value.strip().split(':')
+        hour, minute = int(hour), int(minute)
+    except ValueError:
+        return None
+    if hour < 0 or not (0 <= minute < 60):
+        return None
+    return hour * 60 + minute
+
+
+def parse_weekly_closures(description):
+    """
+    운영시간 설명에서 정기휴무 요일을 찾는다.
+    "휴무"가 들어간 줄의 요일만 보며, "휴무확인 전화 필요"처럼 불확실한 문구와 공휴일/명절은 무시한다.
+
+    Returns:
+        set: 휴무 요일 번호 (0=월, 6=일)
+    """
+    closures = set()
+    if not description:
+        return closures
+
+    for line in _LINE_SPLIT.split(description):
+        if '휴무' not in line or '확인' in line:
+            continue
+        for token in _WEEKDAY_TOKEN.findall(line):
+            closures.add(KOREAN_WEEKDAYS[token])
+    return closures
+
+
+def minute_of_week(dt):
+    """datetime을 주 기준 분(월요일 00:00 = 0)으로 변환"""
+    return dt.weekday() * DAY_MINUTES + dt.hour * 60 + dt.minute
+
+
+class CafeSchedule:
+    """
+    컴파일된 주간 영업 스케줄
+
+    Args:
+        day_hours: 요일별 (begin, end) "HH:MM" 문자열 7개 (월~일)
+        description: 운영시간 설명 (정기휴무 파싱용)
+    """
+
+    def __init__(self, day_hours, description=None):
+        closures = parse_weekly_closures(description)
+
+        # 요일별 (시작분, 종료분) - 종료분은 시작 요일 00:00 기준이라 1440을 넘을 수 있다
+        self.days = []
+        raw_intervals = []
+        for weekday, (begin, end) in enumerate(day_hours):
+            begin_minute, end_minute = parse_hhmm(begin), parse_hhmm(end)
+            if weekday in closures or begin_minute is None or end_minute is None:
+                self.days.append(None)
+                continue
+            if end_minute <= begin_minute:
+                end_minute += DAY_MINUTES  # 자정을 넘기는 영업 (예: 18:00~02:00)
+            self.days.append((begin_minute, end_minute))
+
+            start = weekday * DAY_MINUTES + begin_minute
+            stop = weekday * DAY_MINUTES + end_minute
+            if stop > WEEK_MINUTES:
+                # 일요일 밤 -> 월요일 새벽으로 넘어가는 구간은 둘로 나눈다
+                raw_intervals.append((start, WEEK_MINUTES))
+                raw_intervals.append((0, stop - WEEK_MINUTES))
+            else:
+                raw_intervals.append((start, stop))
+
+        # 겹치거나 맞닿은 구간 병합
+        merged = []
+        for start, stop in sorted(raw_intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], stop)
+            else:
+                merged.append([start, stop])
+
+        self.intervals = [tuple(interval) for interval in merged]
+        self._starts = [start for start, _ in self.intervals]
+
+    def _interval_at(self, minute):
+        """minute을 포함하는 구간 (없으면 None)"""
+        i = bisect_right(self._starts, minute) - 1
+        if i >= 0 and minute < self.intervals[i][1]:
+            return self.intervals[i]
+        return None
+
+    def is_open_at(self, dt):
+        """dt 시각에 영업 중인지"""
+        return self._interval_at(minute_of_week(dt)) is not None
+
+    def covers(self, start_dt, end_dt):
+        """[start_dt, end_dt) 전체가 영업시간 안에 있는지"""
+        duration = int((end_dt - start_dt).total_seconds() // 60)
+        if duration <= 0:
+            return self.is_open_at(start_dt)
+        if duration > WEEK_MINUTES:
+            return False
+
+        start = minute_of_week(start_dt)
+        stop = start + duration
+        if stop > WEEK_MINUTES:
+            return self._covers(start, WEEK_MINUTES) and self._covers(0, stop - WEEK_MINUTES)
+        return self._covers(start, stop)
+
+    def _covers(self, start, stop):
+        interval = self._interval_at(start)
+        return interval is not None and stop <= interval[1]
+
+    def day_hours(self, date):
+        """
+        해당 날짜의 영업 시작/종료 시각
+
+        Returns:
+            tuple: (open_datetime, close_datetime) - 휴무일이면 None
+        """
+        hours = self.days[date.weekday()]
+        if hours is None:
+            return None
+        day_start = datetime(date.year, date.month, date.day)
+        return day_start + timedelta(minutes=hours[0]), day_start + timedelta(minutes=hours[1])
+
+
+# 영업 인덱스의 시간 칸 크기 (분) - 한 주를 336칸으로 나눈다
+DEFAULT_BUCKET_MINUTES = 30
+
+
+class OpenHoursIndex:
+    """
+    여러 카페의 스케줄을 한 주의 시간 칸(bucket)별로 나눠 담은 인덱스
+
+    칸 전체 동안 영업하는 카페는 id 집합으로, 칸 중간에 열거나 닫는 카페만 스케줄과 함께 따로 둔다.
+    조회 시에는 해당 칸의 "항상 영업" 집합에 경계 카페 몇 개만 구간 조회로 더한다.
+
+    Args:
+        schedules: (cafe_id, CafeSchedule) 튜플의 iterable
+        bucket_minutes (int): 칸 크기 (분, 한 주를 나누어 떨어지게)
+    """
+
+    def __init__(self, schedules, bucket_minutes=DEFAULT_BUCKET_MINUTES):
+        self.bucket_minutes = bucket_minutes
+        bucket_count = WEEK_MINUTES // bucket_minutes
+        opened = [[] for _ in range(bucket_count + 1)]  # 이 칸부터 칸 전체 영업 시작
+        closed = [[] for _ in range(bucket_count + 1)]  # 이 칸부터 칸 전체 영업 아님
+        partial = [{} for _ in range(bucket_count)]
+        self.size = 0
+
+        for cafe_id, schedule in schedules:
+            self.size += 1
+            # 스케줄 구간은 병합되어 있어 같은 카페의 구간끼리 칸을 나눠 쓰는 일은 경계 칸뿐이다
+            for start, stop in schedule.intervals:
+                first, last = start // bucket_minutes, ceil(stop / bucket_minutes)
+                full_first, full_last = ceil(start / bucket_minutes), stop // bucket_minutes
+                if full_first < full_last:
+                    opened[full_first].append(cafe_id)
+                    closed[full_last].append(cafe_id)
+                else:
+                    full_first = full_last = last  # 칸 전체를 덮는 부분이 없음
+                for b in chain(range(first, full_first), range(full_last, last)):
+                    partial[b][cafe_id] = schedule
+
+        # 칸 순서대로 훑으며 "칸 전체 영업" 집합을 갱신 (칸마다 구간을 다시 펼치지 않음)
+        current = set()
+        self._always = []
+        for b in range(bucket_count):
+            current.difference_update(closed[b])
+            current.update(opened[b])
+            self._always.append(frozenset(current))
+        self._partial = [list(bucket.items()) for bucket in partial]
+
+    def open_ids(self, dt):
+        """
+        dt 시각에 영업 중인 카페 id 집합
+
+        Returns:
+            frozenset: 카페 id 집합
+        """
+        minute = minute_of_week(dt)
+        b = minute // self.bucket_minutes
+        edge_ids = [cafe_id for cafe_id, schedule in self._partial[b] if schedule._interval_at(minute)]
+        if not edge_ids:
+            return self._always[b]
+        return self._always[b].union(edge_ids)
+
+
+# 카페 ID -> (updated_at ISO 문자열, CafeSchedule), 카페 수보다 넉넉하게 두고 넘으면 오래 안 쓴 것부터 제거
+SCHEDULE_CACHE_SIZE = 4096
+_schedule_cache = LRUCache(maxsize=SCHEDULE_CACHE_SIZE)
+
+
+def _version_key(updated_at):
+    """모델(datetime)과 to_dict()(ISO 문자열)의 updated_at을 같은 값으로 비교하도록 ISO 문자열로 맞춤"""
+    if isinstance(updated_at, datetime):
+        return updated_at.isoformat()
+    return updated_at
+
+
+def _get_cached(cafe_id, updated_at, compile_func):
+    version = _version_key(updated_at)
+    cached = _schedule_cache.get(cafe_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    schedule = compile_func()
+    _schedule_cache.set(cafe_id, (version, schedule))
+    return schedule
+
+
+def get_schedule(cafe):
+    """Cafe 모델의 컴파일된 스케줄 (updated_at이 같으면 캐시 사용)"""
+    return _get_cached(cafe.id, cafe.updated_at, lambda: CafeSchedule(
+        [(getattr(cafe, f"{day}_begin"), getattr(cafe, f"{day}_end")) for day in WEEKDAY_NAMES],
+        cafe.operating_hours
+    ))
+
+
+def get_schedule_for_dict(cafe):
+    """Cafe.to_dict() 결과의 컴파일된 스케줄 (updated_at이 같으면 캐시 사용)"""
+    hours = cafe['operating_hours']
+    return _get_cached(cafe['id'], cafe['updated_at'], lambda: CafeSchedule(
+        [(hours[day]['begin'], hours[day]['end']) for day in WEEKDAY_NAMES],
+        hours['description']
+    ))
@@ -0,0 +1,167 @@
+"""
+카페 응답 직렬화 (컬럼 단위 조회 + 미리 컴파일한 필드 계획)
+
+Cafe.to_dict()는 모델 객체 전체를 불러온 뒤 30여 개 속성을 매번 중첩 dict로 옮긴다.
+여기서는 요청한 필드에 필요한 컬럼만 SELECT해 튜플로 받고,
+필드 조합별로 한 번만 만든 변환 함수(필드 계획)로 to_dict()와 같은 형식의 dict를 만든다.
+
+필드 이름은 to_dict()의 최상위 키와 같으며, operating_hours와 reservation은 묶음 단위로 고른다.
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+
+from sqlalchemy import select
+
+from models import db, Cafe
+from services.cafe_hours import WEEKDAY_NAMES
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+# 최상위 필드 -> 값 모양
+#   컬럼 하나: 그대로 / (컬럼, 변환 함수) / {하위 키: 모양} 중첩 dict
+FIELD_SHAPES = {
+    'id': Cafe.id,
+    'name': Cafe.name,
+    'address': Cafe.address,
+    'latitude': Cafe.latitude,
+    'longitude': Cafe.longitude,
+    'message': Cafe.message,
+    'hours_weekday': Cafe.hours_weekday,
+    'hours_weekend': Cafe.hours_weekend,
+    'price': Cafe.price,
+    'video_url': Cafe.video_url,
+    'last_order': Cafe.last_order,
+    'operating_hours': {
+        **{
+            day: {
+                'begin': getattr(Cafe, f"{day}_begin"),
+                'end': getattr(Cafe, f"{day}_end"),
+            }
+            for day in WEEKDAY_NAMES
+        },
+        'description': Cafe.operating_hours,
+    },
+    'likes_count': Cafe.likes_count,
+    'reservation': {
+        'enabled': Cafe.reservation_enabled,
+        'total_seats': Cafe.total_seats,
+        'total_consents': Cafe.total_consents,
+        'start_time': Cafe.reservation_start_time,
+        'end_time': Cafe.reservation_end_time,
+        'hourly_rate': Cafe.hourly_rate,
+    },
+    'created_at': (Cafe.created_at, _iso),
+    'updated_at': (Cafe.updated_at, _iso),
+}
+
+FIELD_NAMES = tuple(FIELD_SHAPES)
+
+
+def parse_fields(value):
+    """
+    fields 쿼리 파라미터 해석 ("id,name,latitude" -> ('id', 'name', 'latitude'))
+
+    알 수 없는 이름은 무시한다. (기존 fields 필터와 같은 동작)
+
+    Returns:
+        tuple: FIELD_NAMES 순서의 필드 이름 (값이 없으면 None = 전체 필드)
+
+    Raises:
+        ValueError: 아는 필드 이름이 하나도 없을 때
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(',')}
+    fields = tuple(name for name in FIELD_NAMES if name in requested)
+    if not fields:
+        raise ValueError(f"fields에 사용할 수 있는 값: {', '.join(FIELD_NAMES)}")
+    return fields
+
+
+def project_cafe_dicts(cafes, fields):
+    """
+    이미 만들어 둔 카페 dict 목록에서 fields만 남긴 복사본
+    (스냅샷처럼 메모리에 있는 목록용, rating/distance 같은 추가 키는 유지)
+    """
+    if fields is None:
+        return cafes
+    dropped = set(FIELD_NAMES).difference(fields)
+    return [{key: value for key, value in cafe.items() if key not in dropped} for cafe in cafes]
+
+
+class FieldPlan:
+    """
+    필드 조합 하나에 대한 SELECT 컬럼 목록과 row 튜플 -> dict 변환 함수
+
+    변환 함수는 (키, 값 꺼내는 함수) 목록을 미리 만들어 두고 row마다 그 목록만 따라가므로
+    필드 모양(FIELD_SHAPES)을 row마다 다시 해석하지 않는다.
+
+    Args:
+        fields (tuple): 필드 이름 (None이면 전체)
+    """
+
+    def __init__(self, fields=None):
+        self.fields = FIELD_NAMES if fields is None else tuple(fields)
+        self.columns = []
+        self.build = _dict_builder(tuple((name, self._compile(FIELD_SHAPES[name])) for name in self.fields))
+
+    def _compile(self, shape):
+        """값 모양을 row 튜플에서 값을 꺼내는 함수로 바꾸고 필요한 컬럼을 self.columns에 추가"""
+        if isinstance(shape, dict):
+            return _dict_builder(tuple((key, self._compile(sub)) for key, sub in shape.items()))
+
+        converter = None
+        if isinstance(shape, tuple):
+            shape, converter = shape
+        self.columns.append(shape)
+        get = itemgetter(len(self.columns) - 1)
+        if converter is None:
+            return get
+        return lambda row: converter(get(row))
+
+
+def _dict_builder(entries):
+    """(키, 값 꺼내는 함수) 목록으로 row 하나를 dict로 만드는 함수"""
+    def build(row):
+        return {key: get(row) for key, get in entries}
+    return build
+
+
+@lru_cache(maxsize=64)
+def get_plan(fields=None) -> FieldPlan:
+    """필드 조합별 필드 계획 (한 번 만든 계획은 재사용)"""
+    return FieldPlan(fields)
+
+
+def query_cafe_dicts(fields=None, *criteria):
+    """
+    카페 목록을 필요한 컬럼만 조회해 dict 목록으로 (id 순)
+
+    Args:
+        fields (tuple, optional): parse_fields() 결과 (None이면 to_dict()와 같은 전체 필드)
+        *criteria: 추가 WHERE 조건 (예: Cafe.reservation_enabled.is_(True))
+    """
+    plan = get_plan(fields)
+    rows = db.session.execute(select(*plan.columns).where(*criteria).order_by(Cafe.id)).all()
+    build = plan.build
+    return [build(row) for row in rows]
+
+
+def query_cafe_dict(cafe_id, fields=None):
+    """
+    카페 한 곳을 필요한 컬럼과 버전 컬럼(updated_at, likes_count)만 조회
+
+    Returns:
+        tuple: (카페 dict, (updated_at, likes_count)) - 없으면 (None, None)
+    """
+    plan = get_plan(fields)
+    row = db.session.execute(
+        select(*plan.columns, Cafe.updated_at, Cafe.likes_count).where(Cafe.id == cafe_id)
+    ).first()
+    if row is None:
+        return None, None
+    return plan.build(row), tuple(row[-2:])
@@ -1,11 +1,28 @@
 
+import hashlib
+from bisect import bisect_right
+from datetime import datetime
+
+from common.etag import make_etag
+from common.fast_json import dumps
+from common.pagination import split_page
 from models import Cafe, db
+from services.cafe_hours import OpenHoursIndex, get_schedule_for_dict, minute_of_week
+from services.cafe_serializer import project_cafe_dicts, query_cafe_dict, query_cafe_dicts
+from services.cafe_snapshot import get_snapshot, invalidate_snapshots
+from services.geo_index import GeoGridIndex, ZoomClusters
+from services.like_service import LikeService
+from services.rating_service import RatingService
+
+
+# 이 줌 레벨 미만에서는 개별 카페 대신 클러스터를 반환
+CLUSTER_MAX_ZOOM = 15
 
 
 
 def get_all_cafes():
-    """모든 카페 객체 목록을 데이터베이스에서 조회"""
-    return Cafe.query.all()
+    """모든 카페 객체 목록을 데이터베이스에서 조회 (id 순)"""
+    return Cafe.query.order_by(Cafe.id).all()
 
 def get_cafe_by_id(cafe_id):
     """특정 ID의 카페를 데이터베이스에서 조회"""
@@ -23,6 +40,291 @@ def get_all_reservable_cafes():
     """ 예약 가능한 모든 카페"""
     return Cafe.query.filter_by(reservation_enabled=True).all()
 
+def get_all_cafe_dicts():
+    """모든 카페의 to_dict() 형식 dict 목록 (id 순, 스냅샷 캐시 사용, 반환값을 수정하면 안 됨)"""
+    return get_snapshot("cafes:dicts", query_cafe_dicts)
+
+def get_cafe_dict(cafe_id, fields=None):
+    """
+    카페 한 곳의 to_dict() 형식 dict (fields에 필요한 컬럼만 조회)
+
+    Returns:
+        tuple: (카페 dict, (updated_at, likes_count)) - 없으면 (None, None)
+    """
+    return query_cafe_dict(cafe_id, fields)
+
+def _build_cafe_list_json(cafe_list_dict):
+    """
+    카페 목록 응답 본문을 JSON bytes로 직렬화 (jsonify와 같은 구조, orjson 사용)
+
+    Returns:
+        tuple: (본문 bytes, ETag) - ETag는 본문 해시라서 워커가 달라도 같은 값
+    """
+    body = dumps({
+        "success": True,
+        "count": len(cafe_list_dict),
+        "data": cafe_list_dict
+    })
+    return body, hashlib.sha1(body).hexdigest()
+
+# 필드 조합별 목록 본문을 보관하는 개수
+FIELDS_JSON_CACHE_SIZE = 16
+
+def _get_fields_json(name, fields, *criteria):
+    """
+    fields에 필요한 컬럼만 SELECT해 만든 목록 응답 본문과 ETag
+    같은 스냅샷 버전 안에서는 필드 조합별로 본문을 재사용한다.
+    """
+    cache = get_snapshot(f"cafes:{name}_fields_json", dict)
+    cached = cache.get(fields)
+    if cached is None:
+        cached = _build_cafe_list_json(query_cafe_dicts(fields, *criteria))
+        if len(cache) >= FIELDS_JSON_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        cache[fields] = cached
+    return cached
+
+def get_all_cafes_json(fields=None):
+    """
+    모든 카페 목록 응답 본문과 ETag (스냅샷 캐시 사용)
+
+    Args:
+        fields (tuple, optional): parse_fields() 결과 - 지정하면 해당 컬럼만 조회
+    """
+    if fields is not None:
+        return _get_fields_json("all", fields)
+    return get_snapshot("cafes:all", lambda: _build_cafe_list_json(get_all_cafe_dicts()))
+
+def get_all_reservable_cafes_json(fields=None):
+    """
+    예약 가능한 카페 목록 응답 본문과 ETag (스냅샷 캐시 사용)
+
+    Args:
+        fields (tuple, optional): parse_fields() 결과 - 지정하면 해당 컬럼만 조회
+    """
+    if fields is not None:
+        return _get_fields_json("reservable", fields, Cafe.reservation_enabled.is_(True))
+    return get_snapshot("cafes:reservable", lambda: _build_cafe_list_json(
+        [cafe for cafe in get_all_cafe_dicts() if cafe['reservation']['enabled']]
+    ))
+
+def _get_open_hours_index():
+    """전체 카페의 시간대별 영업 인덱스 (카페가 바뀌면 스냅샷과 함께 다시 만듦)"""
+    return get_snapshot("cafes:open_index", lambda: OpenHoursIndex(
+        (cafe['id'], get_schedule_for_dict(cafe)) for cafe in get_all_cafe_dicts()
+    ))
+
+def get_open_cafe_ids(at):
+    """at 시각에 영업 중인 카페 id 집합 (영업 인덱스 조회, DB 조회 없음)"""
+    return _get_open_hours_index().open_ids(at)
+
+# 영업 중 카페 목록 본문을 분(minute-of-week)별로 보관하는 개수
+OPEN_CAFES_JSON_CACHE_SIZE = 8
+
+def get_open_cafes_json(at=None, fields=None):
+    """
+    지정 시각(기본: 현재)에 영업 중인 카페 목록 응답 본문과 ETag
+    같은 분(minute)/필드 조합의 요청은 직렬화한 본문을 재사용한다.
+    """
+    at = at or datetime.now()
+    key = (minute_of_week(at), fields)
+    # 스냅샷 버전마다 새 dict가 만들어지므로 카페가 바뀌면 캐시도 함께 비워진다
+    cache = get_snapshot("cafes:open_json", dict)
+
+    cached = cache.get(key)
+    if cached is None:
+        cached = _build_cafe_list_json(project_cafe_dicts(_get_open_cafe_dicts(at), fields))
+        if len(cache) >= OPEN_CAFES_JSON_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = cached
+    return cached
+
+def _get_open_cafe_dicts(at):
+    open_ids = get_open_cafe_ids(at)
+    return [cafe for cafe in get_all_cafe_dicts() if cafe['id'] in open_ids]
+
+# 평점 요약 포함 목록 본문을 ETag별로 보관하는 개수
+RATING_CAFES_JSON_CACHE_SIZE = 8
+
+def get_cafes_with_rating_json(open_at=None, fields=None):
+    """
+    카페 목록 + 카페별 평점 요약(rating) 응답 본문과 ETag
+
+    평점 요약은 평점 집계 테이블 쿼리 1번으로 한꺼번에 붙인다.
+    ETag는 카페 목록 ETag와 평점 집계 버전으로 만들고, 같은 ETag의 본문은 재사용한다.
+
+    Args:
+        open_at (datetime, optional): 지정하면 이 시각에 영업 중인 카페만
+        fields (tuple, optional): parse_fields() 결과 - 지정하면 해당 필드(+ rating)만
+    """
+    _, list_etag = get_open_cafes_json(open_at) if open_at else get_all_cafes_json()
+    etag = make_etag('cafes+rating', list_etag, fields, *RatingService.get_rating_summaries_version())
+
+    cache = get_snapshot("cafes:rating_json", dict)
+    cached = cache.get(etag)
+    if cached is None:
+        cafes = _get_open_cafe_dicts(open_at) if open_at else get_all_cafe_dicts()
+        body, _ = _build_cafe_list_json(project_cafe_dicts(_with_rating(cafes, all_cafes=True), fields))
+        if len(cache) >= RATING_CAFES_JSON_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        cached = cache[etag] = (body, etag)
+    return cached
+
+def _with_rating(cafes, all_cafes=False):
+    """
+    카페 dict 목록 복사본에 평점 요약(rating) 추가 (평점 집계 쿼리 1번)
+
+    Args:
+        all_cafes (bool): True면 IN 목록 없이 전체 집계를 읽는다 (전체 목록용)
+    """
+    summaries = RatingService.get_rating_summaries(None if all_cafes else [cafe['id'] for cafe in cafes])
+    empty_summary = RatingService._summary_from_stats(None)
+    return [{**cafe, 'rating': summaries.get(cafe['id'], empty_summary)} for cafe in cafes]
+
+# 이보다 많은 카페에 표시할 때는 IN 목록 대신 사용자의 좋아요 전체를 읽는다
+LIKED_IN_QUERY_MAX = 500
+
+def with_liked_by_me(cafes, user_id):
+    """
+    카페 dict 목록 복사본에 liked_by_me(bool) 추가
+
+    cafe_likes 조회는 요청당 1번 (좋아요 비트맵 캐시에 있으면 0번), 비로그인이면 모두 False.
+
+    Args:
+        cafes (list): 카페 dict 목록
+        user_id (int, optional): 로그인 사용자 ID
+    """
+    if user_id is None:
+        liked_ids = set()
+    elif len(cafes) > LIKED_IN_QUERY_MAX:
+        liked_ids = LikeService.get_liked_cafe_ids(user_id)
+    else:
+        liked_ids = LikeService.get_liked_cafe_ids(user_id, [cafe['id'] for cafe in cafes])
+    return [{**cafe, 'liked_by_me': cafe['id'] in liked_ids} for cafe in cafes]
+
+def get_cafes_with_liked_json(user_id, open_at=None, include_rating=False, fields=None):
+    """
+    카페 목록 + 카페별 liked_by_me 응답 본문과 ETag
+
+    사용자마다 본문이 달라 공유 캐시에 두지 않고 요청마다 직렬화한다.
+
+    Args:
+        user_id (int, optional): 로그인 사용자 ID (없으면 모두 False)
+        open_at (datetime, optional): 지정하면 이 시각에 영업 중인 카페만
+        include_rating (bool): True면 카페마다 평점 요약(rating) 포함
+        fields (tuple, optional): parse_fields() 결과 - 지정하면 해당 필드(+ 추가 항목)만
+    """
+    cafes = _get_open_cafe_dicts(open_at) if open_at else get_all_cafe_dicts()
+    if include_rating:
+        cafes = _with_rating(cafes, all_cafes=True)
+    return _build_cafe_list_json(project_cafe_dicts(with_liked_by_me(cafes, user_id), fields))
+
+def _get_cafe_ids():
+    """get_all_cafe_dicts()와 같은 순서(id 오름차순)의 카페 id 목록 (커서 위치 탐색용)"""
+    return get_snapshot("cafes:ids", lambda: [cafe['id'] for cafe in get_all_cafe_dicts()])
+
+def get_cafe_page(limit, after_id=None, open_at=None, include_rating=False):
+    """
+    카페 목록의 한 페이지 (id 순, 카페 id 커서)
+
+    스냅샷의 id 목록에서 커서 위치를 이진 탐색으로 찾고 그 뒤로 limit개만 꺼내므로,
+    카페 수와 관계없이 페이지 크기만큼만 처리한다.
+
+    Args:
+        limit (int): 페이지 크기
+        after_id (int, optional): 이전 페이지 마지막 카페 id
+        open_at (datetime, optional): 지정하면 이 시각에 영업 중인 카페만
+        include_rating (bool): True면 카페마다 평점 요약(rating) 포함
+
+    Returns:
+        tuple: (카페 dict 목록, 다음 커서 또는 None)
+    """
+    cafes = get_all_cafe_dicts()
+    accept = _open_filter(open_at)
+    start = bisect_right(_get_cafe_ids(), after_id) if after_id is not None else 0
+
+    rows = []
+    for i in range(start, len(cafes)):
+        if accept is None or accept(cafes[i]):
+            rows.append(cafes[i])
+            if len(rows) > limit:
+                break
+    page, next_cursor = split_page(rows, limit, key=lambda cafe: (cafe['id'],))
+
+    if include_rating:
+        page = _with_rating(page)
+
+    return page, next_cursor
+
+def _get_geo_index():
+    """카페 좌표 공간 인덱스 (카페가 바뀌면 스냅샷과 함께 다시 만듦)"""
+    return get_snapshot("cafes:geo_index", lambda: GeoGridIndex(
+        (cafe, cafe['latitude'], cafe['longitude']) for cafe in get_all_cafe_dicts()
+    ))
+
+def get_nearby_cafes(latitude, longitude, radius=None, limit=20, open_at=None):
+    """
+    주변 카페를 가까운 순으로 조회
+
+    Args:
+        latitude (float): 검색 중심 위도
+        longitude (float): 검색 중심 경도
+        radius (float, optional): 검색 반경 (미터). 없으면 가장 가까운 limit개
+        limit (int, optional): 최대 결과 수. None이면 반경 안의 모든 카페
+        open_at (datetime, optional): 지정하면 이 시각에 영업 중인 카페만
+
+    Returns:
+        list: 카페 dict 목록 (각 항목에 distance(미터) 추가)
+    """
+    geo_index = _get_geo_index()
+    if limit is None:
+        limit = geo_index.size
+    results = geo_index.nearest(latitude, longitude, limit, radius_m=radius, accept=_open_filter(open_at))
+    return [{**cafe, 'distance': round(distance, 1)} for distance, cafe in results]
+
+def _open_filter(open_at):
+    """open_at 시각에 영업 중인 카페 dict만 통과시키는 함수 (open_at이 없으면 None)"""
+    if open_at is None:
+        return None
+    open_ids = get_open_cafe_ids(open_at)
+    return lambda cafe: cafe['id'] in open_ids
+
+def _get_zoom_clusters():
+    """줌 단계별 카페 클러스터 (카페가 바뀌면 스냅샷과 함께 다시 만듦)"""
+    return get_snapshot("cafes:zoom_clusters", lambda: ZoomClusters(
+        ((cafe['id'], cafe['latitude'], cafe['longitude']) for cafe in get_all_cafe_dicts()),
+        max_zoom=CLUSTER_MAX_ZOOM
+    ))
+
+def get_cafes_in_bounds(sw_lat, sw_lng, ne_lat, ne_lng, zoom, open_at=None):
+    """
+    지도 화면 범위 안의 카페 조회
+
+    Args:
+        sw_lat, sw_lng: 남서쪽 모서리 좌표
+        ne_lat, ne_lng: 북동쪽 모서리 좌표
+        zoom (int): 지도 줌 레벨
+        open_at (datetime, optional): 지정하면 이 시각에 영업 중인 카페만
+            (클러스터는 미리 계산한 값 대신 영업 중인 카페로 즉석 계산)
+
+    Returns:
+        tuple: (결과 종류, 목록)
+            - 줌이 CLUSTER_MAX_ZOOM 미만: ("clusters", 클러스터 dict 목록)
+            - 그 이상: ("cafes", 카페 dict 목록, id 순)
+    """
+    accept = _open_filter(open_at)
+
+    if zoom < CLUSTER_MAX_ZOOM:
+        if accept is None:
+            return "clusters", _get_zoom_clusters().in_bounds(zoom, sw_lat, sw_lng, ne_lat, ne_lng)
+        return "clusters", _get_geo_index().cluster_in_bounds(
+            zoom, sw_lat, sw_lng, ne_lat, ne_lng, get_id=lambda cafe: cafe['id'], accept=accept
+        )
+
+    cafes = _get_geo_index().within_bounds(sw_lat, sw_lng, ne_lat, ne_lng, accept=accept)
+    cafes.sort(key=lambda cafe: cafe['id'])
+    return "cafes", cafes
+
 def get_all_cafes_names():
     """모든 카페 이름 리스트를 반환"""
     result = Cafe.query.with_entities(Cafe.name).all()
@@ -84,6 +386,9 @@ def add_cafe_from_places(name, address, latitude, longitude):
     db.session.add(new_cafe)
     db.session.commit()
 
+    # 카페 목록 스냅샷 무효화
+    invalidate_snapshots()
+
     return True, new_cafe
 
 
@@ -0,0 +1,98 @@
+"""
+카페 카탈로그 스냅샷 캐시
+
+카페 목록처럼 자주 조회되지만 거의 바뀌지 않는 데이터를 프로세스 메모리에 보관한다.
+
+주요 기능:
+- 키별로 한 번 만든 결과(직렬화된 JSON bytes 등)를 재사용
+- 카페 row가 바뀌면 버전을 올려 모든 스냅샷을 무효화
+- 다른 워커/마이그레이션에서 바뀐 경우를 위해 일정 주기로 DB 지문(fingerprint)을 확인
+"""
+
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import func
+
+from models import db, Cafe
+
+
+# DB 지문 재확인 주기 기본값 (초 단위)
+DEFAULT_REVALIDATE_SECONDS = 30
+
+
+_lock = threading.RLock()  # builder 안에서 다른 스냅샷을 조회할 수 있도록 재진입 허용
+_state = {
+    "version": 0,          # 스냅샷 세대 번호 (무효화될 때마다 +1)
+    "fingerprint": None,   # 마지막으로 확인한 cafes 테이블 지문
+    "checked_at": 0.0,     # 마지막 지문 확인 시각 (monotonic)
+}
+_snapshots = {}  # key -> (version, value)
+
+
+def _load_fingerprint():
+    """cafes 테이블의 변경 여부를 판단하기 위한 지문 (집계 쿼리 1번)"""
+    row = db.session.query(
+        func.count(Cafe.id),
+        func.max(Cafe.updated_at),
+        func.max(Cafe.catalog_version),
+        func.sum(Cafe.likes_count)
+    ).one()
+    return tuple(row)
+
+
+def _revalidate():
+    """주기가 지났으면 DB 지문을 다시 확인하고, 바뀌었으면 버전을 올린다."""
+    interval = current_app.config.get('CAFE_SNAPSHOT_REVALIDATE_SECONDS', DEFAULT_REVALIDATE_SECONDS)
+    now = time.monotonic()
+    if _state["fingerprint"] is not None and now - _state["checked_at"] < interval:
+        return
+
+    fingerprint = _load_fingerprint()
+    if fingerprint != _state["fingerprint"]:
+        _state["version"] += 1
+        _state["fingerprint"] = fingerprint
+    _state["checked_at"] = now
+
+
+def snapshot_version():
+    """현재 스냅샷 버전 반환"""
+    with _lock:
+        _revalidate()
+        return _state["version"]
+
+
+def get_snapshot(key, builder):
+    """
+    key에 해당하는 스냅샷을 반환한다. 없거나 오래됐으면 builder()로 다시 만든다.
+
+    Args:
+        key (str): 스냅샷 이름 (예: "cafes:all")
+        builder (callable): 인자 없이 호출되어 스냅샷 값을 만드는 함수
+
+    Returns:
+        builder()가 반환한 값 (캐시된 객체를 그대로 반환하므로 수정하면 안 됨)
+    """
+    with _lock:
+        _revalidate()
+        version = _state["version"]
+        cached = _snapshots.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        # 같은 키를 동시에 여러 요청이 다시 만들지 않도록 락 안에서 빌드
+        value = builder()
+        _snapshots[key] = (version, value)
+        return value
+
+
+def invalidate_snapshots():
+    """
+    카페 데이터가 바뀌었을 때 호출한다.
+    다음 조회 때 DB 지문을 다시 읽고 모든 스냅샷을 새로 만든다.
+    """
+    with _lock:
+        _state["version"] += 1
+        _state["fingerprint"] = None
+        _snapshots.clear()
@@ -1,18 +1,84 @@
 from models import db, Comment, Cafe, User
 from common.api_response import ApiResponse, ErrorCode
+from common.pagination import PageRequest, split_page
+from sqlalchemy import func, or_, and_
 
 class CommentService:
 
+    @staticmethod
+    def get_comments_version(cafe_id: int):
+        """
+        카페 댓글 목록의 버전 정보 (ETag 계산용)
+        - 댓글 개수/최신 ID/최신 작성 시각 + 작성자 정보 수정 시각(닉네임 변경, 탈퇴)
+        """
+        row = db.session.query(
+            func.count(Comment.id),
+            func.max(Comment.id),
+            func.max(Comment.created_at),
+            func.max(User.updated_at)
+        ).outerjoin(User, User.id == Comment.user_id).filter(
+            Comment.cafe_id == cafe_id
+        ).one()
+        return tuple(row)
 
 
     @staticmethod
-    def get_comments(cafe_id: int):
-
-        cafe = Cafe.query.get(cafe_id)
+    def get_comments(cafe_id: int, page: PageRequest = None):
+        """
+        카페 댓글 목록 (최신순)
+        - page가 있으면 (created_at, id) 커서 기준으로 page.limit개만 조회
+        """
 
         try:
-            comments = Comment.query.filter_by(cafe_id=cafe_id).order_by(Comment.created_at.desc()).all()
-            comments_data = [comment.to_dict() for comment in comments]
+            # 작성자 정보를 조인해서 필요한 컬럼만 가져옴 (댓글마다 User를 따로 조회하지 않음)
+            query = db.session.query(
+                Comment.id,
+                Comment.user_id,
+                Comment.cafe_id,
+                Comment.content,
+                Comment.created_at,
+                User.nickname,
+                User.photo_url
+            ).outerjoin(User, User.id == Comment.user_id).filter(
+                Comment.cafe_id == cafe_id
+            ).order_by(Comment.created_at.desc(), Comment.id.desc())
+
+            if page is not None:
+                # (cafe_id, created_at, id) 인덱스를 타는 keyset 조건
+                if page.after:
+                    after_created_at, after_id = page.after
+                    query = query.filter(or_(
+                        Comment.created_at < after_created_at,
+                        and_(Comment.created_at == after_created_at, Comment.id < after_id)
+                    ))
+                rows, next_cursor = split_page(
+                    query.limit(page.limit + 1).all(), page.limit,
+                    key=lambda row: (row.created_at, row.id)
+                )
+            else:
+                rows = query.all()
+
+            # Comment.to_dict()와 같은 형식
+            comments_data = [
+                {
+                    'id': row.id,
+                    'user_id': row.user_id,
+                    'user_nickname': row.nickname if row.nickname is not None else "알 수 없음",
+                    'user_photo': row.photo_url,
+                    'cafe_id': row.cafe_id,
+                    'content': row.content,
+                    'created_at': row.created_at.isoformat()
+                }
+                for row in rows
+            ]
+
+            if page is not None:
+                return ApiResponse.success_page(
+                    data=comments_data,
+                    next_cursor=next_cursor,
+                    message="댓글 목록을 불러왔습니다.",
+                    http_status=200
+                )
 
             return ApiResponse.success(
                 data=comments_data,
@@ -0,0 +1,301 @@
+"""
+카페 좌표용 인메모리 공간 인덱스
+
+위경도를 일정 크기(기본 0.01도, 약 1km)의 격자 칸으로 나눠 담아두고,
+검색 지점 주변 칸부터 바깥쪽으로 넓혀가며 후보를 찾는다.
+최종 거리와 정렬은 하버사인(haversine) 거리로 계산한다.
+
+주요 기능:
+- k-최근접 검색 (nearest)
+- 반경 검색 (radius_m 지정 시 nearest와 함께 사용)
+- 지도 화면 범위(bounding box) 검색 (within_bounds)
+- 줌 단계별 격자 클러스터 미리 계산 (ZoomClusters)
+- 필터링된 카페 목록의 즉석 클러스터 계산 (cluster_in_bounds)
+"""
+
+import heapq
+import math
+from collections import defaultdict
+
+
+# 지구 평균 반지름 (미터)
+EARTH_RADIUS_M = 6371008.8
+
+# 위도 1도의 길이 (미터)
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+# 격자 한 칸의 크기 기본값 (도 단위)
+DEFAULT_CELL_DEG = 0.01
+
+# 클러스터 한 칸의 화면 크기 (픽셀, 256px 타일 기준)
+DEFAULT_CLUSTER_CELL_PX = 64
+
+
+def _cells_in_bounds(cells, cell_deg, sw_lat, sw_lng, ne_lat, ne_lng):
+    """
+    범위와 겹치는 격자 칸의 키 목록
+    범위 안의 칸 수가 실제 데이터가 있는 칸 수보다 많으면 데이터가 있는 칸만 걸러서 본다.
+    """
+    min_i, max_i = math.floor(sw_lat / cell_deg), math.floor(ne_lat / cell_deg)
+    min_j, max_j = math.floor(sw_lng / cell_deg), math.floor(ne_lng / cell_deg)
+
+    if (max_i - min_i + 1) * (max_j - min_j + 1) <= len(cells):
+        return [
+            (i, j)
+            for i in range(min_i, max_i + 1)
+            for j in range(min_j, max_j + 1)
+            if (i, j) in cells
+        ]
+    return [
+        (i, j) for (i, j) in cells
+        if min_i <= i <= max_i and min_j <= j <= max_j
+    ]
+
+
+def _cluster_cell_deg(zoom, cell_px):
+    """줌 z에서 cell_px 픽셀 크기 클러스터 칸의 크기 (도 단위)"""
+    return 360 / (2 ** zoom) * cell_px / 256
+
+
+def _clusters_in_bounds(tier, cell_deg, sw_lat, sw_lng, ne_lat, ne_lng):
+    """
+    {칸: [count, lat_sum, lng_sum, first_id]} 중 무게중심이 범위 안에 있는 클러스터 목록
+    카페가 1개뿐인 클러스터는 해당 카페 id를 함께 반환
+    """
+    results = []
+    for cell in _cells_in_bounds(tier, cell_deg, sw_lat, sw_lng, ne_lat, ne_lng):
+        count, lat_sum, lng_sum, first_id = tier[cell]
+        lat, lng = lat_sum / count, lng_sum / count
+        if not (sw_lat <= lat <= ne_lat and sw_lng <= lng <= ne_lng):
+            continue
+        cluster = {
+            "count": count,
+            "latitude": round(lat, 7),
+            "longitude": round(lng, 7)
+        }
+        if count == 1:
+            cluster["id"] = first_id
+        results.append(cluster)
+    return results
+
+
+def _add_to_tier(tier, key, point_id, lat, lng):
+    cluster = tier.get(key)
+    if cluster is None:
+        tier[key] = [1, lat, lng, point_id]
+    else:
+        cluster[0] += 1
+        cluster[1] += lat
+        cluster[2] += lng
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """두 좌표 사이의 거리 (미터)"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoGridIndex:
+    """
+    격자(grid) 기반 공간 인덱스
+
+    Args:
+        points: (payload, latitude, longitude) 튜플의 iterable
+            payload는 검색 결과로 그대로 돌려줄 객체 (예: 카페 dict)
+        cell_deg: 격자 한 칸의 크기 (도 단위)
+    """
+
+    def __init__(self, points, cell_deg=DEFAULT_CELL_DEG):
+        self.cell_deg = cell_deg
+        self._cells = defaultdict(list)  # (i, j) -> [(payload, lat, lng), ...]
+        self.size = 0
+
+        for payload, lat, lng in points:
+            if lat is None or lng is None:
+                continue
+            lat, lng = float(lat), float(lng)
+            self._cells[self._cell_of(lat, lng)].append((payload, lat, lng))
+            self.size += 1
+
+        self._cells = dict(self._cells)
+        if self._cells:
+            rows = [i for i, _ in self._cells]
+            cols = [j for _, j in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = None
+
+    def _cell_of(self, lat, lng):
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _ring(self, ci, cj, r):
+        """(ci, cj) 칸에서 체비셰프 거리 r인 칸들 (정사각형 테두리)"""
+        if r == 0:
+            yield ci, cj
+            return
+        for j in range(cj - r, cj + r + 1):
+            yield ci - r, j
+            yield ci + r, j
+        for i in range(ci - r + 1, ci + r):
+            yield i, cj - r
+            yield i, cj + r
+
+    def _min_cell_span_m(self, lat, r):
+        """
+        검색 지점에서 r칸 떨어진 범위 안의 칸 크기 중 가장 짧은 변 (미터)
+        경도 방향 길이는 고위도로 갈수록 줄어들기 때문에 가장 먼 위도 기준으로 계산한다.
+        """
+        far_lat = min(89.9, abs(lat) + (r + 1) * self.cell_deg)
+        lat_span = self.cell_deg * METERS_PER_DEGREE
+        lng_span = lat_span * math.cos(math.radians(far_lat))
+        return min(lat_span, lng_span)
+
+    def _max_ring(self, ci, cj):
+        """데이터가 있는 모든 칸을 덮는 데 필요한 최대 링 번호"""
+        min_i, max_i, min_j, max_j = self._bounds
+        return max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+
+    def nearest(self, lat, lng, limit, radius_m=None, accept=None):
+        """
+        가까운 순으로 최대 limit개의 결과를 반환한다.
+
+        Args:
+            lat, lng: 검색 중심 좌표
+            limit (int): 최대 결과 수
+            radius_m (float, optional): 지정하면 이 반경(미터) 안의 결과만 반환
+            accept (callable, optional): payload를 받아 False를 돌려주면 결과에서 제외
+
+        Returns:
+            list: [(distance_m, payload), ...] 거리 오름차순
+        """
+        if not self._cells or limit <= 0:
+            return []
+
+        ci, cj = self._cell_of(lat, lng)
+        max_ring = self._max_ring(ci, cj)
+
+        # 최대 힙 (거리를 음수로 저장) - 지금까지 찾은 가장 가까운 limit개
+        best = []
+        seq = 0  # payload끼리 비교하지 않도록 넣는 순번
+
+        r = 0
+        while r <= max_ring:
+            # 링 테두리 칸 수(8r)가 데이터가 있는 칸 수보다 많아지면 (모든 카페에서 먼 지점)
+            # 빈 칸을 계속 도는 대신 아직 보지 않은 데이터 칸만 한 번에 훑고 끝낸다
+            scan_rest = r > 0 and 8 * r > len(self._cells)
+            if scan_rest:
+                cells = [(i, j) for (i, j) in self._cells if max(abs(i - ci), abs(j - cj)) >= r]
+            else:
+                cells = self._ring(ci, cj, r)
+
+            for cell in cells:
+                for payload, p_lat, p_lng in self._cells.get(cell, ()):
+                    if accept is not None and not accept(payload):
+                        continue
+                    distance = haversine_m(lat, lng, p_lat, p_lng)
+                    if radius_m is not None and distance > radius_m:
+                        continue
+                    seq += 1
+                    if len(best) < limit:
+                        heapq.heappush(best, (-distance, seq, payload))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, seq, payload))
+
+            if scan_rest:
+                break
+
+            # 아직 보지 않은 칸(r+1 이상)의 점은 최소 r칸 너비만큼 떨어져 있다
+            lower_bound = r * self._min_cell_span_m(lat, r)
+            if radius_m is not None and lower_bound > radius_m:
+                break
+            if len(best) == limit and lower_bound >= -best[0][0]:
+                break
+            r += 1
+
+        return [(-neg_distance, payload) for neg_distance, _, payload in sorted(best, reverse=True)]
+
+    def within_bounds(self, sw_lat, sw_lng, ne_lat, ne_lng, accept=None):
+        """
+        남서(sw)~북동(ne) 사각형 안의 payload 목록
+
+        Args:
+            accept (callable, optional): payload를 받아 False를 돌려주면 결과에서 제외
+
+        Returns:
+            list: payload 목록 (순서 보장 없음)
+        """
+        return [payload for payload, _, _ in self._points_in_bounds(sw_lat, sw_lng, ne_lat, ne_lng, accept)]
+
+    def _points_in_bounds(self, sw_lat, sw_lng, ne_lat, ne_lng, accept=None):
+        results = []
+        for cell in _cells_in_bounds(self._cells, self.cell_deg, sw_lat, sw_lng, ne_lat, ne_lng):
+            for point in self._cells[cell]:
+                payload, p_lat, p_lng = point
+                if accept is not None and not accept(payload):
+                    continue
+                if sw_lat <= p_lat <= ne_lat and sw_lng <= p_lng <= ne_lng:
+                    results.append(point)
+        return results
+
+    def cluster_in_bounds(self, zoom, sw_lat, sw_lng, ne_lat, ne_lng, get_id,
+                          accept=None, cell_px=DEFAULT_CLUSTER_CELL_PX):
+        """
+        조건에 맞는 점만으로 해당 줌의 클러스터를 즉석에서 계산한다. (ZoomClusters.in_bounds와 같은 형식)
+        가장자리 칸의 무게중심이 미리 계산한 값과 같도록 범위를 한 칸씩 넓혀서 점을 모은다.
+
+        Args:
+            zoom (int): 지도 줌 레벨
+            get_id (callable): payload에서 id를 꺼내는 함수
+            accept (callable, optional): payload를 받아 False를 돌려주면 제외
+        """
+        cell_deg = _cluster_cell_deg(zoom, cell_px)
+        tier = {}
+        for payload, lat, lng in self._points_in_bounds(
+            sw_lat - cell_deg, sw_lng - cell_deg, ne_lat + cell_deg, ne_lng + cell_deg, accept
+        ):
+            key = (math.floor(lat / cell_deg), math.floor(lng / cell_deg))
+            _add_to_tier(tier, key, get_id(payload), lat, lng)
+        return _clusters_in_bounds(tier, cell_deg, sw_lat, sw_lng, ne_lat, ne_lng)
+
+
+class ZoomClusters:
+    """
+    줌 단계별로 미리 계산한 격자 클러스터
+
+    줌 z에서 256px 타일 하나는 경도 360 / 2^z 도를 차지하므로,
+    cell_px 픽셀 크기의 칸은 (360 / 2^z) * cell_px / 256 도가 된다.
+    각 칸에는 개수와 좌표 합계를 저장해 두고 조회 시 무게중심을 돌려준다.
+
+    Args:
+        points: (id, latitude, longitude) 튜플의 iterable
+        max_zoom (int): 이 줌 미만에서만 클러스터를 만든다
+        cell_px (int): 클러스터 칸의 화면 크기 (픽셀)
+    """
+
+    def __init__(self, points, max_zoom, cell_px=DEFAULT_CLUSTER_CELL_PX):
+        self.max_zoom = max_zoom
+        self._cell_deg = {z: _cluster_cell_deg(z, cell_px) for z in range(max_zoom)}
+        # zoom -> {(i, j): [count, lat_sum, lng_sum, first_id]}
+        self._tiers = {z: {} for z in range(max_zoom)}
+
+        for point_id, lat, lng in points:
+            if lat is None or lng is None:
+                continue
+            lat, lng = float(lat), float(lng)
+            for z, cell_deg in self._cell_deg.items():
+                key = (math.floor(lat / cell_deg), math.floor(lng / cell_deg))
+                _add_to_tier(self._tiers[z], key, point_id, lat, lng)
+
+    def in_bounds(self, zoom, sw_lat, sw_lng, ne_lat, ne_lng):
+        """
+        화면 범위 안에 무게중심이 있는 클러스터 목록
+
+        Returns:
+            list: [{"count", "latitude", "longitude"(, "id")}, ...]
+                  카페가 1개뿐인 클러스터는 해당 카페 id를 함께 반환
+        """
+        return _clusters_in_bounds(self._tiers[zoom], self._cell_deg[zoom], sw_lat, sw_lng, ne_lat, ne_lng)
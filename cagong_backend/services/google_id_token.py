@@ -0,0 +1,140 @@
+"""
+Google ID 토큰 검증 (인증서 캐시 + 검증 결과 캐시)
+
+google.oauth2.id_token.verify_oauth2_token()은 호출할 때마다 Google 공개 인증서를 다시 받는다.
+여기서는 같은 검증을 하되
+- 인증서는 응답의 Cache-Control max-age 동안 메모리에 두고 재사용하고
+  (키 교체로 토큰 헤더의 kid가 보관 중인 인증서에 없으면 그때만 다시 받되,
+   마지막으로 받은 지 GOOGLE_CERTS_MIN_REFRESH_SECONDS가 지나지 않았으면 다시 받지 않음)
+- 검증에 성공한 토큰의 claims는 토큰의 exp까지 보관해
+  /google-login 뒤 /google-signup처럼 같은 토큰을 다시 검증할 때 서명 검증도 건너뛴다.
+"""
+
+import hashlib
+import re
+import threading
+import time
+
+from flask import current_app
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+
+from common.cache import LRUCache, SingleFlight
+from common.http_client import get_client
+
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Cache-Control에 max-age가 없을 때 인증서 보관 시간 (초)
+DEFAULT_CERTS_MAX_AGE = 300
+
+# 모르는 kid로 인증서를 강제로 다시 받을 때 최소 간격 기본값 (초)
+DEFAULT_MIN_REFRESH_SECONDS = 60
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+_certs_lock = threading.Lock()
+_certs_state = {"certs": None, "expires_at": 0.0, "fetched_at": None}
+_certs_flight = SingleFlight()
+
+# 토큰 해시 -> 검증된 claims
+_claims_cache = None
+
+
+def _certs_url():
+    return current_app.config.get('GOOGLE_CERTS_URL') or GOOGLE_CERTS_URL
+
+
+def _fetch_certs():
+    """인증서를 받아 max-age 동안 보관 (동시에 만료된 요청들은 한 번만 받음)"""
+    response = get_client('google').get(_certs_url())
+    if response.status_code != 200:
+        raise google_exceptions.TransportError(f"Google 인증서 조회 실패: {response.status_code}")
+
+    match = _MAX_AGE.search(response.headers.get('Cache-Control', ''))
+    max_age = int(match.group(1)) if match else DEFAULT_CERTS_MAX_AGE
+    certs = response.json()
+    with _certs_lock:
+        _certs_state["certs"] = certs
+        _certs_state["fetched_at"] = time.monotonic()
+        _certs_state["expires_at"] = _certs_state["fetched_at"] + max_age
+    return certs
+
+
+def get_google_certs(force=False):
+    """
+    Google 공개 인증서 {kid: PEM} (보관 중이고 만료 전이면 네트워크 호출 없음)
+
+    Args:
+        force (bool): True면 보관 중이어도 다시 받음 (모르는 kid가 왔을 때).
+            단, 마지막으로 받은 지 GOOGLE_CERTS_MIN_REFRESH_SECONDS 안이면 보관 중인 인증서를 그대로 반환
+            (없는 kid를 단 토큰이 반복돼도 Google 호출이 늘지 않도록)
+    """
+    min_refresh = current_app.config.get('GOOGLE_CERTS_MIN_REFRESH_SECONDS', DEFAULT_MIN_REFRESH_SECONDS)
+    with _certs_lock:
+        certs = _certs_state["certs"]
+        now = time.monotonic()
+        fresh = certs is not None and now < _certs_state["expires_at"]
+        recently_fetched = certs is not None and now - _certs_state["fetched_at"] < min_refresh
+    if fresh and (not force or recently_fetched):
+        return certs
+    return _certs_flight.do(_certs_url(), _fetch_certs)
+
+
+def _token_kid(id_token_str):
+    """토큰 헤더의 kid (헤더를 읽을 수 없거나 kid가 없으면 None - 검증 단계에서 거부됨)"""
+    try:
+        kid = google_jwt.decode_header(id_token_str).get('kid')
+    except (ValueError, AttributeError):
+        return None
+    return kid if isinstance(kid, str) else None
+
+
+def _get_claims_cache():
+    """검증 결과 캐시 (GOOGLE_TOKEN_CACHE_SIZE가 0이면 None - 캐시 사용 안 함)"""
+    global _claims_cache
+    size = current_app.config.get('GOOGLE_TOKEN_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    if _claims_cache is None:
+        _claims_cache = LRUCache(maxsize=size)
+    return _claims_cache
+
+
+def _decode(id_token_str, certs, audience):
+    claims = google_jwt.decode(id_token_str, certs=certs, audience=audience)
+    if claims.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError(f"잘못된 발급자입니다: {claims.get('iss')}")
+    return claims
+
+
+def verify_oauth2_token(id_token_str, audience):
+    """
+    Google ID 토큰 검증 (서명, aud, iss, exp/iat)
+
+    Returns:
+        dict: 토큰 claims
+
+    Raises:
+        ValueError: 검증 실패 (google.auth.exceptions.MalformedError 등 포함)
+    """
+    cache = _get_claims_cache()
+    key = hashlib.sha256(id_token_str.encode('utf-8')).hexdigest()
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None and cached.get('aud') == audience:
+            return dict(cached)
+
+    certs = get_google_certs()
+    kid = _token_kid(id_token_str)
+    if kid is not None and kid not in certs:
+        # 인증서 교체 직후라 보관 중인 인증서에 kid가 없으면 새로 받아 검증 (최소 간격 제한)
+        certs = get_google_certs(force=True)
+    claims = _decode(id_token_str, certs, audience)
+
+    if cache is not None:
+        ttl = claims['exp'] - time.time()
+        if ttl > 0:
+            cache.set(key, claims, ttl=ttl)
+    return dict(claims)
@@ -0,0 +1,187 @@
+"""
+카페 좋아요 수(cafes.likes_count) 갱신
+
+좋아요 row(cafe_likes)가 기준 데이터이고, likes_count는 목록 표시용 비정규화 카운터다.
+
+주요 기능:
+- 즉시 반영: 좋아요와 같은 트랜잭션에서 UPDATE likes_count = likes_count ± 1 (SQL 쪽에서 계산)
+- 지연 반영(write-behind, LIKE_COUNTER_WRITE_BEHIND): 좋아요가 커밋된 카페 id만 프로세스 메모리에 모아 두었다가
+  백그라운드 스레드가 주기(LIKE_COUNTER_FLUSH_SECONDS) 또는 개수(LIKE_COUNTER_FLUSH_SIZE)마다
+  해당 카페들의 cafe_likes를 다시 세어 UPDATE 1번으로 반영 (요청 처리와 분리, 워커 종료 시 atexit로 한 번 더)
+- 보정(reconcile): cafe_likes의 COUNT(*)로 likes_count를 다시 맞춤 (flask reconcile-like-counts)
+"""
+
+import atexit
+import os
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import case, func, select, update
+
+from models import db, Cafe, CafeLike
+from services.cafe_snapshot import invalidate_snapshots
+
+
+_lock = threading.Lock()
+_dirty = set()  # 좋아요가 커밋됐지만 likes_count를 아직 다시 세지 않은 카페 id
+_state = {
+    "pending_events": 0,   # 마지막 반영 이후 쌓인 좋아요/취소 수
+    "flusher_pid": None,   # 반영 스레드를 띄운 프로세스 (gunicorn fork 후에는 다시 띄움)
+}
+_wakeup = threading.Event()  # 개수 기준을 넘으면 반영 스레드를 바로 깨움
+
+
+def _increment_statement(cafe_id, delta):
+    """likes_count에 delta를 더하는 UPDATE (0 미만으로 내려가지 않음, updated_at은 그대로 둠)"""
+    new_count = Cafe.likes_count + delta
+    return (
+        update(Cafe)
+        .where(Cafe.id == cafe_id)
+        .values(
+            likes_count=case((new_count < 0, 0), else_=new_count),
+            updated_at=Cafe.updated_at  # 좋아요는 카페 정보 변경이 아니므로 수정 시각을 올리지 않음
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _recount_statement():
+    """likes_count를 커밋된 cafe_likes 개수로 다시 맞추는 UPDATE (값이 다른 카페만, updated_at은 그대로 둠)"""
+    actual_count = (
+        select(func.count(CafeLike.id))
+        .where(CafeLike.cafe_id == Cafe.id)
+        .scalar_subquery()
+    )
+    return (
+        update(Cafe)
+        .where(Cafe.likes_count != actual_count)
+        .values(likes_count=actual_count, updated_at=Cafe.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def write_behind_enabled():
+    return current_app.config.get('LIKE_COUNTER_WRITE_BEHIND', False)
+
+
+def record_like_delta(cafe_id, delta):
+    """
+    좋아요 증감(+1/-1)을 현재 트랜잭션에 반영 (커밋은 호출한 쪽)
+
+    즉시 반영 모드에서만 UPDATE를 실행한다. 지연 반영 모드에서는 아무것도 하지 않고,
+    커밋이 성공한 뒤 호출한 쪽이 mark_like_committed()로 알린다.
+    """
+    if not write_behind_enabled():
+        db.session.execute(_increment_statement(cafe_id, delta))
+
+
+def mark_like_committed(cafe_id):
+    """
+    (지연 반영 모드) 좋아요 커밋 후 카페를 다시 셀 대상으로 표시
+
+    증감 값은 들고 있지 않는다. 반영 스레드가 이 카페의 cafe_likes를 다시 세므로
+    반영 전에 reconcile-like-counts가 먼저 돌아도 같은 좋아요가 두 번 더해지지 않는다.
+    """
+    app = current_app._get_current_object()
+    with _lock:
+        _dirty.add(cafe_id)
+        _state["pending_events"] += 1
+        due = _state["pending_events"] >= app.config.get('LIKE_COUNTER_FLUSH_SIZE', 100)
+    _ensure_flusher(app)
+    if due:
+        _wakeup.set()
+
+
+def _ensure_flusher(app):
+    """이 프로세스의 반영 스레드가 없으면 띄움 (종료 시 남은 대상은 atexit에서 반영)"""
+    pid = os.getpid()
+    with _lock:
+        if _state["flusher_pid"] == pid:
+            return
+        _state["flusher_pid"] = pid
+    threading.Thread(target=_flush_loop, args=(app,), name='like-counter-flush', daemon=True).start()
+    atexit.register(_flush_at_exit, app)
+
+
+def _flush_loop(app):
+    """LIKE_COUNTER_FLUSH_SECONDS마다(또는 개수 기준을 넘으면 바로) 모아둔 카페를 반영"""
+    interval = app.config.get('LIKE_COUNTER_FLUSH_SECONDS', 5)
+    while True:
+        _wakeup.wait(interval)
+        _wakeup.clear()
+        with app.app_context():
+            try:
+                flush_pending()
+            except Exception as e:
+                # 반영하지 못한 카페는 다음 주기에 다시 시도 (좋아요 자체는 이미 커밋됨)
+                app.logger.warning(f"[좋아요 수] 지연 반영 실패, 다음 주기에 재시도: {e}")
+
+
+def _flush_at_exit(app):
+    """워커 종료 시 남은 대상 반영 (실패해도 다음 reconcile-like-counts에서 맞춰짐)"""
+    if os.getpid() != _state["flusher_pid"]:
+        return
+    with app.app_context():
+        try:
+            flush_pending()
+        except Exception as e:
+            app.logger.warning(f"[좋아요 수] 종료 시 반영 실패: {e}")
+
+
+def flush_pending():
+    """
+    다시 셀 대상으로 모아둔 카페의 likes_count를 cafe_likes 개수로 맞춤 (UPDATE 1번, 트랜잭션 1번)
+
+    Returns:
+        int: 반영 대상 카페 수
+    """
+    with _lock:
+        cafe_ids = sorted(_dirty)
+        _dirty.clear()
+        _state["pending_events"] = 0
+
+    if not cafe_ids:
+        return 0
+
+    try:
+        db.session.execute(_recount_statement().where(Cafe.id.in_(cafe_ids)))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # 반영하지 못한 카페는 다음 반영 때 다시 시도
+        with _lock:
+            _dirty.update(cafe_ids)
+        raise
+
+    invalidate_snapshots()
+    return len(cafe_ids)
+
+
+def reconcile_like_counts(cafe_id=None):
+    """
+    likes_count를 cafe_likes의 실제 개수로 다시 맞춘다. (주기 실행용)
+
+    커밋된 좋아요 row만 세며, 웹 워커에 남은 지연 반영 대상은 나중에 다시 세기만 하므로
+    여기서 맞춘 값 위에 증감이 한 번 더 더해지지 않는다.
+
+    Args:
+        cafe_id (int, optional): 지정하면 해당 카페만
+
+    Returns:
+        int: 값이 바뀐 카페 수
+    """
+    statement = _recount_statement()
+    if cafe_id is not None:
+        statement = statement.where(Cafe.id == cafe_id)
+
+    try:
+        changed = db.session.execute(statement).rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if changed:
+        invalidate_snapshots()
+    return changed
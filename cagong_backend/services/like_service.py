@@ -1,47 +1,96 @@
+import threading
+
+from flask import current_app
+
 from models import db, Cafe, CafeLike, User
 from common.api_response import ApiResponse, ErrorCode
+from common.cache import LRUCache
+from common.pagination import PageRequest, split_page
+from sqlalchemy import func, or_, and_
+from services.cafe_snapshot import invalidate_snapshots
+from services import like_counter
+from sqlalchemy.exc import IntegrityError
+
+# 사용자별 좋아요 한 카페 id 비트맵 캐시 (user_id -> (좋아요 버전, int), cafe_id번째 비트가 1이면 좋아요)
+_liked_cafes_cache = None
+_liked_cafes_cache_lock = threading.Lock()
+
+
+def _get_liked_cafes_cache():
+    """비트맵 캐시 (LIKED_CAFES_CACHE_SIZE가 0이면 None - 캐시 사용 안 함)"""
+    global _liked_cafes_cache
+    size = current_app.config.get('LIKED_CAFES_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    if _liked_cafes_cache is None:
+        with _liked_cafes_cache_lock:
+            if _liked_cafes_cache is None:
+                _liked_cafes_cache = LRUCache(maxsize=size, ttl=current_app.config.get('LIKED_CAFES_CACHE_TTL'))
+    return _liked_cafes_cache
+
+
+def _like_version(user_id):
+    """
+    사용자 좋아요의 (개수, 최대 id) - 어느 워커에서든 좋아요/취소가 커밋되면 값이 바뀜
+    (추가는 최대 id, 취소는 개수를 바꾸고, 취소 후 다시 추가해도 새 id가 더 큼)
+    user_id로 시작하는 인덱스만 읽는다.
+    """
+    count, max_id = (
+        db.session.query(func.count(CafeLike.id), func.max(CafeLike.id))
+        .filter(CafeLike.user_id == user_id)
+        .one()
+    )
+    return count, max_id
+
+
+def _bitmap_to_ids(bitmap):
+    """비트맵에서 1인 비트 위치(카페 id) 집합 (좋아요 수만큼만 반복)"""
+    ids = set()
+    while bitmap:
+        lowest = bitmap & -bitmap
+        ids.add(lowest.bit_length() - 1)
+        bitmap ^= lowest
+    return ids
+
 
 class LikeService:
 
     @staticmethod
     def toggle_like(user_id: int, cafe_id: int):
 
-        # Cafe 존재 여부 확인
-        cafe = Cafe.query.get(cafe_id)
-        if not cafe:
+        # Cafe 존재 여부 확인 (카페 row 전체를 읽지 않음)
+        cafe_exists = db.session.query(Cafe.id).filter(Cafe.id == cafe_id).first()
+        if not cafe_exists:
             return ApiResponse.fail(
                 error_code=ErrorCode.INVALID_INPUT,
                 message="존재하지 않는 카페입니다.",
                 http_status=404
             )
 
-        existing = CafeLike.query.filter_by(
-            user_id=user_id,
-            cafe_id=cafe_id
-        ).first()
-
         try:
-            if existing:
-                db.session.delete(existing)
-                cafe.likes_count = max(0, cafe.likes_count - 1)
+            # 좋아요가 있으면 바로 삭제 (삭제된 row 수로 취소 여부 판단)
+            deleted = CafeLike.query.filter_by(
+                user_id=user_id,
+                cafe_id=cafe_id
+            ).delete(synchronize_session=False)
 
-                db.session.commit()
-                return ApiResponse.success(
-                    data={"liked": False},
-                    message="좋아요가 취소되었습니다.",
-                    http_status=200
-                )
+            if deleted:
+                # likes_count는 SQL에서 증감 (읽고 다시 쓰지 않음)
+                like_counter.record_like_delta(cafe_id, -1)
+            else:
+                db.session.add(CafeLike(user_id=user_id, cafe_id=cafe_id))
+                db.session.flush()  # 동시에 같은 좋아요가 들어오면 여기서 IntegrityError
+                like_counter.record_like_delta(cafe_id, 1)
 
-            new_like = CafeLike(user_id=user_id, cafe_id=cafe_id)
-            db.session.add(new_like)
-
-            cafe.likes_count += 1
             db.session.commit()
 
+        except IntegrityError:
+            # 같은 사용자의 동시 요청이 먼저 좋아요를 추가함 - 카운터는 그 요청이 반영
+            db.session.rollback()
             return ApiResponse.success(
                 data={"liked": True},
                 message="좋아요가 추가되었습니다.",
-                http_status=201
+                http_status=200
             )
 
         except Exception:
@@ -52,15 +101,99 @@ class LikeService:
                 http_status=500
             )
 
+        # 커밋 이후 처리는 요청 오류 처리 밖에서 (이미 저장된 좋아요를 500으로 응답하지 않음)
+        LikeService._after_like_change(user_id, cafe_id)
+
+        if deleted:
+            return ApiResponse.success(
+                data={"liked": False},
+                message="좋아요가 취소되었습니다.",
+                http_status=200
+            )
+
+        return ApiResponse.success(
+            data={"liked": True},
+            message="좋아요가 추가되었습니다.",
+            http_status=201
+        )
+
+    @staticmethod
+    def get_liked_cafe_ids(user_id, cafe_ids=None) -> set:
+        """
+        사용자가 좋아요 한 카페 id 집합 (cafe_ids를 주면 그중에서만)
+
+        - 비트맵 캐시가 켜져 있으면 사용자 좋아요 버전(개수, 최대 id)을 1번 조회해 캐시와 같을 때만 캐시로 답하고,
+          다르거나 없으면 사용자 좋아요를 다시 조회해 채움 (다른 워커에서 바뀐 좋아요도 반영)
+        - 캐시가 꺼져 있으면 user_id = ? AND cafe_id IN (...) 쿼리 1번
+        """
+        cache = _get_liked_cafes_cache()
+
+        if cache is None:
+            query = db.session.query(CafeLike.cafe_id).filter(CafeLike.user_id == user_id)
+            if cafe_ids is not None:
+                if not cafe_ids:
+                    return set()
+                query = query.filter(CafeLike.cafe_id.in_(cafe_ids))
+            return {cafe_id for (cafe_id,) in query.all()}
+
+        version = _like_version(user_id)
+        cached = cache.get(int(user_id))
+        if cached is not None and cached[0] == version:
+            bitmap = cached[1]
+        else:
+            bitmap = 0
+            for (cafe_id,) in db.session.query(CafeLike.cafe_id).filter(CafeLike.user_id == user_id).all():
+                bitmap |= 1 << cafe_id
+            cache.set(int(user_id), (version, bitmap))
+
+        liked_ids = _bitmap_to_ids(bitmap)
+        return liked_ids if cafe_ids is None else liked_ids.intersection(cafe_ids)
+
     @staticmethod
-    def get_liked_cafes(user_id: int):
-        liked = (
-            db.session.query(Cafe)
+    def _after_like_change(user_id, cafe_id):
+        """
+        좋아요 커밋 후 처리 (메모리 작업만 함, DB 반영은 하지 않음)
+        - 사용자의 좋아요 비트맵 캐시 무효화
+        - 즉시 반영이면 카페 목록 스냅샷 무효화, 지연 반영이면 카페를 다시 셀 대상으로 표시
+        """
+        cache = _get_liked_cafes_cache()
+        if cache is not None:
+            cache.delete(int(user_id))
+
+        if like_counter.write_behind_enabled():
+            like_counter.mark_like_committed(cafe_id)  # 반영 스레드가 다시 셀 때 스냅샷도 함께 무효화됨
+        else:
+            invalidate_snapshots()  # likes_count가 바뀌었으므로 카페 목록 스냅샷 무효화
+
+    @staticmethod
+    def get_liked_cafes(user_id: int, page: PageRequest = None):
+        """
+        좋아요 한 카페 목록 (최근에 좋아요 한 순)
+        - page가 있으면 좋아요의 (created_at, id) 커서 기준으로 page.limit개만 조회
+        """
+        query = (
+            db.session.query(Cafe.id, Cafe.name, Cafe.address, CafeLike.created_at, CafeLike.id.label('like_id'))
             .join(CafeLike, Cafe.id == CafeLike.cafe_id)
             .filter(CafeLike.user_id == user_id)
-            .all()
+            .order_by(CafeLike.created_at.desc(), CafeLike.id.desc())
         )
 
+        next_cursor = None
+        if page is not None:
+            # (user_id, created_at, id) 인덱스를 타는 keyset 조건
+            if page.after:
+                after_created_at, after_id = page.after
+                query = query.filter(or_(
+                    CafeLike.created_at < after_created_at,
+                    and_(CafeLike.created_at == after_created_at, CafeLike.id < after_id)
+                ))
+            liked, next_cursor = split_page(
+                query.limit(page.limit + 1).all(), page.limit,
+                key=lambda row: (row.created_at, row.like_id)
+            )
+        else:
+            liked = query.all()
+
         cafe_list = [
             {
                 "id": c.id,
@@ -70,9 +203,16 @@ class LikeService:
             for c in liked
         ]
 
+        if page is not None:
+            return ApiResponse.success_page(
+                data=cafe_list,
+                next_cursor=next_cursor,
+                message="좋아요 한 카페 목록 조회 성공",
+                http_status=200
+            )
+
         return ApiResponse.success(
             data=cafe_list,
             message="좋아요 한 카페 목록 조회 성공",
             http_status=200
         )
-
@@ -0,0 +1,212 @@
+"""
+결제 보정 작업 (payment_outbox 처리)
+
+결제 승인 트랜잭션 A와 B/C 사이에 프로세스가 죽거나, Toss 승인 후 DB 저장이 실패하면
+주문이 PROCESSING에 멈추고 CONFIRM 작업이 PENDING으로 남는다.
+이 작업을 배치로 가져와 Toss에 결제 상태를 조회하고 주문 상태를 확정한다. (flask reconcile-payments)
+
+- CONFIRM: Toss 승인 완료(DONE) + 주문 PROCESSING -> PAID
+           Toss 승인 완료 + 주문 FAILED/CANCELED  -> CANCEL 작업 추가 (환불)
+           Toss에 결제가 없거나 승인 안 됨           -> FAILED
+- CANCEL : cancel_payment()로 환불 후 주문 CANCELED
+
+Toss 호출은 스레드 풀에서 동시에 최대 PAYMENT_RECONCILE_CONCURRENCY개만 실행하고,
+실패한 작업은 PAYMENT_RECONCILE_RETRY_SECONDS * 2^(시도-1)초 뒤 다시 시도한다.
+PAYMENT_RECONCILE_MAX_ATTEMPTS번 실패하면 FAILED로 두고 CRITICAL 로그를 남긴다. (수동 확인)
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import or_, select
+
+from models import db, Order, PaymentOutbox
+from services import payment_service
+
+
+# 가져간 작업을 다른 보정 작업이 다시 가져가지 않도록 미뤄 두는 시간 (처리 중 죽으면 이후 다시 처리)
+CLAIM_LEASE = timedelta(minutes=5)
+
+CANCEL_REASON = "결제 확정 실패로 인한 자동 취소"
+
+# 아직 환불할 금액이 남은 Toss 결제 상태
+REFUNDABLE_STATUSES = ('DONE', 'PARTIAL_CANCELED')
+
+
+def enqueue_stuck_orders(stuck_before, limit):
+    """
+    CONFIRM 작업 없이 PROCESSING에 멈춘 주문에 CONFIRM 작업 추가 (outbox 도입 전에 멈춘 주문 등)
+
+    Returns:
+        int: 추가한 작업 수
+    """
+    pending_orders = select(PaymentOutbox.order_id).where(PaymentOutbox.status == 'PENDING')
+    orders = (
+        Order.query
+        .filter(Order.status == 'PROCESSING',
+                Order.updated_at < stuck_before,
+                Order.id.not_in(pending_orders))
+        .order_by(Order.id)
+        .limit(limit)
+        .all()
+    )
+    for order in orders:
+        db.session.add(PaymentOutbox(order_id=order.id, operation='CONFIRM', amount=order.amount,
+                                     created_at=order.updated_at))
+    db.session.commit()
+    return len(orders)
+
+
+def _claim_batch(batch_size, stuck_before):
+    """
+    처리할 작업을 최대 batch_size개 선점 (시도 횟수 증가 + next_attempt_at을 선점 시간만큼 미룸)
+
+    CONFIRM은 stuck_before 이전에 생긴 것만 (백그라운드 승인이 아직 진행 중일 수 있음),
+    CANCEL은 바로 처리한다. SKIP LOCKED로 여러 보정 작업이 동시에 돌아도 같은 작업을 가져가지 않는다.
+    """
+    now = datetime.utcnow()
+    entries = (
+        PaymentOutbox.query
+        .filter(PaymentOutbox.status == 'PENDING',
+                PaymentOutbox.next_attempt_at <= now,
+                or_(PaymentOutbox.operation == 'CANCEL', PaymentOutbox.created_at < stuck_before))
+        .order_by(PaymentOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for entry in entries:
+        entry.attempts += 1
+        entry.next_attempt_at = now + CLAIM_LEASE
+    ids = [entry.id for entry in entries]
+    db.session.commit()
+    return ids
+
+
+def _apply_confirm(entry, order, toss_payment):
+    """CONFIRM 작업 결과를 주문에 반영 (커밋은 호출한 쪽)"""
+    toss_status = toss_payment.get('status') if toss_payment else None
+    entry.status = 'DONE'
+
+    if toss_status == 'DONE':
+        if order.status == 'PROCESSING':
+            order.status = 'PAID'
+            order.payment_key = toss_payment.get('paymentKey')
+            order.payment_type = toss_payment.get('method')
+            return 'PAID'
+        if order.status == 'PAID':
+            return 'ALREADY_PAID'
+        # 결제는 승인됐는데 주문은 실패/취소로 끝남 -> 환불
+        db.session.add(PaymentOutbox(order_id=order.id, operation='CANCEL',
+                                     payment_key=toss_payment.get('paymentKey'),
+                                     amount=toss_payment.get('totalAmount', order.amount)))
+        return 'CANCEL_QUEUED'
+
+    if toss_status in ('CANCELED', 'PARTIAL_CANCELED'):
+        if order.status != 'PAID':
+            order.status = 'CANCELED'
+        return 'CANCELED'
+
+    # Toss에 결제가 없거나(승인 요청 전 중단) 승인되지 않음(ABORTED, EXPIRED 등)
+    if order.status == 'PROCESSING':
+        order.status = 'FAILED'
+    return 'FAILED'
+
+
+def _process_entry(entry_id):
+    """작업 하나 처리 (앱 컨텍스트 안에서 호출), 결과 이름 반환"""
+    entry = db.session.get(PaymentOutbox, entry_id)
+    operation, payment_key, order_uuid = entry.operation, entry.payment_key, entry.order.order_id
+    # Toss 응답을 기다리는 동안 DB 연결/락을 잡고 있지 않도록 트랜잭션 종료
+    db.session.commit()
+
+    toss_payment = payment_service.get_toss_payment_by_order(order_uuid)
+    toss_status = toss_payment.get('status') if toss_payment else None
+    if operation == 'CANCEL' and toss_status in REFUNDABLE_STATUSES:
+        payment_service.cancel_payment(payment_key or toss_payment.get('paymentKey'), CANCEL_REASON)
+
+    entry = db.session.get(PaymentOutbox, entry_id)
+    order = Order.query.filter_by(id=entry.order_id).with_for_update().first()
+    if operation == 'CANCEL':
+        entry.status = 'DONE'
+        if toss_status in REFUNDABLE_STATUSES + ('CANCELED',):
+            order.status = 'CANCELED'
+            result = 'CANCELED'
+        else:
+            result = 'NOTHING_TO_CANCEL'
+    else:
+        result = _apply_confirm(entry, order, toss_payment)
+    db.session.commit()
+
+    current_app.logger.info(f"[결제 보정] {operation} 주문 {order_uuid}: {result}")
+    return result
+
+
+def _record_failure(entry_id, error, max_attempts, retry_seconds):
+    """처리 실패 기록: 재시도 시각을 미루거나, 한도를 넘으면 FAILED"""
+    db.session.rollback()
+    entry = db.session.get(PaymentOutbox, entry_id)
+    entry.last_error = str(error)[:500]
+
+    if entry.attempts >= max_attempts:
+        entry.status = 'FAILED'
+        current_app.logger.critical(
+            f"!!!!!!!!!! [심각] 결제 보정 {max_attempts}회 실패 - 수동 확인 필요 !!!!!!!!!!\n"
+            f"작업 ID: {entry.id}, 주문 PK: {entry.order_id}, 작업: {entry.operation}, "
+            f"Payment Key: {entry.payment_key}, 오류: {error}"
+        )
+        result = 'GAVE_UP'
+    else:
+        entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_seconds * 2 ** (entry.attempts - 1))
+        current_app.logger.warning(f"[결제 보정] 작업 {entry.id} 실패 ({entry.attempts}/{max_attempts}): {error}")
+        result = 'RETRY'
+    db.session.commit()
+    return result
+
+
+def _run_entry(app, entry_id, max_attempts, retry_seconds):
+    """스레드 풀에서 작업 하나 실행 (스레드마다 별도 앱 컨텍스트/DB 세션)"""
+    with app.app_context():
+        try:
+            return _process_entry(entry_id)
+        except Exception as e:
+            return _record_failure(entry_id, e, max_attempts, retry_seconds)
+
+
+def reconcile_payments(batch_size=None, concurrency=None, stuck_seconds=None, max_attempts=None):
+    """
+    멈춘 결제 보정 1회 실행: 처리할 작업이 없을 때까지 배치 단위로 가져와 처리
+
+    Args:
+        batch_size (int): 한 번에 가져올 작업 수 (기본 PAYMENT_RECONCILE_BATCH_SIZE)
+        concurrency (int): 동시에 실행할 Toss 호출 수 (기본 PAYMENT_RECONCILE_CONCURRENCY)
+        stuck_seconds (int): 이 시간보다 오래된 PROCESSING/CONFIRM만 처리 (기본 PAYMENT_RECONCILE_STUCK_SECONDS)
+        max_attempts (int): 작업별 최대 시도 횟수 (기본 PAYMENT_RECONCILE_MAX_ATTEMPTS)
+
+    Returns:
+        Counter: 결과별 작업 수 (PAID, FAILED, CANCELED, CANCEL_QUEUED, RETRY, GAVE_UP ...)
+    """
+    config = current_app.config
+    batch_size = batch_size or config.get('PAYMENT_RECONCILE_BATCH_SIZE', 50)
+    concurrency = concurrency or config.get('PAYMENT_RECONCILE_CONCURRENCY', 4)
+    stuck_seconds = stuck_seconds if stuck_seconds is not None else config.get('PAYMENT_RECONCILE_STUCK_SECONDS', 300)
+    max_attempts = max_attempts or config.get('PAYMENT_RECONCILE_MAX_ATTEMPTS', 8)
+    retry_seconds = config.get('PAYMENT_RECONCILE_RETRY_SECONDS', 30)
+
+    stuck_before = datetime.utcnow() - timedelta(seconds=stuck_seconds)
+    results = Counter()
+    results['ENQUEUED_STUCK'] = enqueue_stuck_orders(stuck_before, batch_size)
+
+    app = current_app._get_current_object()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='payment-reconcile') as executor:
+        while True:
+            entry_ids = _claim_batch(batch_size, stuck_before)
+            if not entry_ids:
+                break
+            results.update(executor.map(
+                lambda entry_id: _run_entry(app, entry_id, max_attempts, retry_seconds), entry_ids
+            ))
+
+    return +results
@@ -1,13 +1,24 @@
 import requests
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app, abort
 from sqlalchemy.exc import SQLAlchemyError
 
+from common.http_client import get_client
 from exceptions.custom_exceptions import (InvalidInputException, UserNotFoundException, PaymentApiCallException,
                                           OrderNotFoundException, DuplicatePaymentException, PaymentMismatchException,
                                           DatabaseUpdateException)
 from models import db, User
 from models.order import Order
+from models.payment_outbox import PaymentOutbox
+
+
+TOSS_API_URL = "https://api.tosspayments.com"
+
+# 결제 승인 백그라운드 실행기 (처음 쓸 때 PAYMENT_CONFIRM_WORKERS 크기로 생성)
+_confirm_executor = None
+_confirm_executor_lock = threading.Lock()
 
 
 # -----------------------------------------------------
@@ -46,27 +57,45 @@ def create_new_order(user_id, item_name, amount):
     }
 
 
+def _toss_headers():
+    """Toss API 인증 헤더 (시크릿 키 Basic 인증)"""
+    secret_key = current_app.config['TOSS_SECRET_KEY']
+    encoded_key = base64.b64encode(f"{secret_key}:".encode('utf-8')).decode('utf-8')
+    return {
+        "Authorization": f"Basic {encoded_key}",
+        "Content-Type": "application/json"
+    }
+
+
+def _toss_url(path):
+    """Toss API URL (TOSS_API_URL 설정으로 Mock 서버로 바꿀 수 있음, 예: http://127.0.0.1:5001)"""
+    return (current_app.config.get('TOSS_API_URL') or TOSS_API_URL).rstrip('/') + path
+
+
+def _finish_outbox(order_pk, operation):
+    """주문의 대기 중인 outbox 작업을 DONE 처리 (커밋은 호출한 쪽, 주문 상태 변경과 같은 트랜잭션)"""
+    PaymentOutbox.query.filter_by(order_id=order_pk, operation=operation, status='PENDING').update(
+        {'status': 'DONE'}, synchronize_session=False
+    )
+
+
 def _call_toss_api(method, url, json_data=None):
-    """Toss API 호출"""
+    """Toss API 호출 (공용 HTTP 클라이언트의 keep-alive 연결 재사용)"""
     try:
-        secret_key = current_app.config['TOSS_SECRET_KEY']
-        encoded_key = base64.b64encode(f"{secret_key}:".encode('utf-8')).decode('utf-8')
-        headers = {
-            "Authorization": f"Basic {encoded_key}",
-            "Content-Type": "application/json"
-        }
-
-        # POST 요청만 처리 (confirm, cancel 등)
-        response = requests.post(url, json=json_data, headers=headers, timeout=10)
+        response = get_client('toss').request(method, url, json=json_data, headers=_toss_headers())
 
         # HTTP 4xx, 5xx 에러 시 예외 발생
         response.raise_for_status()
         return response.json()
 
     except requests.exceptions.HTTPError as e:
-        # API가 반환한 구체적인 에러 메시지를 포함하여 예외 발생
-        error_details = e.response.json()
-        raise PaymentApiCallException(f"Toss API Error: {error_details.get('message', e.response.text)}")
+        # API가 반환한 구체적인 에러 메시지를 포함하여 예외 발생 (게이트웨이 5xx 등 JSON이 아닌 본문도 있음)
+        try:
+            error_details = e.response.json()
+        except ValueError:
+            error_details = {}
+        raise PaymentApiCallException(f"Toss API Error: {error_details.get('message', e.response.text)}",
+                                      status_code=e.response.status_code, toss_code=error_details.get('code'))
 
     except requests.exceptions.RequestException as e:
         # 네트워크 타임아웃 등
@@ -74,11 +103,26 @@ def _call_toss_api(method, url, json_data=None):
         raise PaymentApiCallException(f"API 통신 중 오류가 발생했습니다: {e}")
 
 
+# 4xx여도 승인 여부가 확정되지 않은 응답 (요청 시간 초과, 충돌, 호출 제한, 이미 처리된 결제)
+_UNCERTAIN_STATUSES = (408, 409, 429)
+_UNCERTAIN_TOSS_CODES = ('ALREADY_PROCESSED_PAYMENT', 'PROVIDER_ERROR')
+
+
+def _is_definite_rejection(api_error):
+    """Toss가 승인을 확실히 거절했는지 (True면 결제가 승인되지 않았음이 확정)"""
+    status = api_error.status_code
+    return (
+        status is not None and 400 <= status < 500
+        and status not in _UNCERTAIN_STATUSES
+        and api_error.toss_code not in _UNCERTAIN_TOSS_CODES
+    )
+
+
 # -----------------------------------------------------
 # 2. 결제 최종 승인 서비스 로직 (가장 중요)
 # -----------------------------------------------------
-def confirm_payment(payment_key, order_id, amount):
-    # === 1. [트랜잭션 A]: 락(Lock) 걸고, 검증하고, 'PROCESSING'으로 선점 ===
+def _reserve_order(payment_key, order_id, amount):
+    """[트랜잭션 A]: 락(Lock) 걸고, 검증하고, 'PROCESSING'으로 선점한 뒤 주문 PK 반환"""
     # 이 트랜잭션은 0.01초 안에 끝나야 합니다.
     try:
         # with_for_update(): 락(lock)을 걸어 동시 접근을 막습니다.
@@ -104,9 +148,13 @@ def confirm_payment(payment_key, order_id, amount):
 
         # 상태를 'PAID'가 아닌 'PROCESSING'으로 변경합니다.
         order.status = 'PROCESSING'
+        # 같은 커밋으로 CONFIRM 작업을 남겨, B/C 전에 프로세스가 죽어도 보정 작업이 마무리하게 합니다.
+        db.session.add(PaymentOutbox(order_id=order.id, operation='CONFIRM',
+                                     payment_key=payment_key, amount=order.amount))
         # 즉시 커밋하여 락을 해제합니다.
         db.session.commit()
         # --- [트랜잭션 A 종료] ---
+        return order.id
 
     except SQLAlchemyError as e:
         db.session.rollback()  # DB 세션 원상 복구
@@ -117,11 +165,13 @@ def confirm_payment(payment_key, order_id, amount):
         db.session.rollback()  # 혹시 모를 세션 롤백
         raise e
 
+
+def _confirm_with_toss(order_pk, payment_key, order_id, amount):
+    """Toss 승인 API 호출 후 [트랜잭션 B] 'PAID' 또는 [트랜잭션 C] 'FAILED'로 확정"""
     # === 2. [외부 API 호출]: 락이 없는(No-Lock) 상태에서 실행 ===
     # 이 작업이 1.5초(Mock)가 걸려도 DB 커넥션 풀과 무관합니다.
 
-    url = "https://api.tosspayments.com/v1/payments/confirm"
-    # url = "http://127.0.0.1:5001/v1/payments/confirm"  # Mock API
+    url = _toss_url("/v1/payments/confirm")
     params = {
         "paymentKey": payment_key,
         "orderId": order_id,
@@ -137,11 +187,16 @@ def confirm_payment(payment_key, order_id, amount):
 
         # --- ★★★ 핵심 변경점 2 ★★★ ---
         # [트랜잭션 C]: API 호출 실패 시, 'FAILED'로 상태 확정
+        # CONFIRM 작업은 Toss가 확실히 거절한 4xx일 때만 끝낸다.
+        # 타임아웃/통신 실패/5xx는 Toss에서 승인됐을 수 있으므로 PENDING으로 두어
+        # 보정 작업이 Toss에 조회해 승인된 결제면 환불(CANCEL)하도록 한다.
         try:
             # 'order' 객체는 T-A 세션이므로, 새 세션에서 객체를 다시 조회
-            order_to_fail = Order.query.get(order.id)
+            order_to_fail = Order.query.get(order_pk)
             if order_to_fail and order_to_fail.status == 'PROCESSING':
                 order_to_fail.status = 'FAILED'
+                if _is_definite_rejection(api_error):
+                    _finish_outbox(order_pk, 'CONFIRM')
                 db.session.commit()
         except SQLAlchemyError as db_fail_error:
             db.session.rollback()
@@ -156,15 +211,23 @@ def confirm_payment(payment_key, order_id, amount):
     # === 3. [트랜잭션 B]: API 성공 시, 'PAID'로 최종 상태 확정 ===
     try:
         # T-A 세션과 분리하기 위해, order 객체를 id로 다시 조회하는 것이 가장 안전
-        order_to_pay = Order.query.get(order.id)
+        order_to_pay = Order.query.get(order_pk)
 
         if not order_to_pay or order_to_pay.status != 'PROCESSING':
             current_app.logger.error(f"결제 승인 [T-B: 최종 확정] 실패. 주문이 PROCESSING 상태가 아님: {order_id}")
+            if order_to_pay:
+                # 결제는 이미 승인됐으므로 보정 작업이 환불(cancel_payment)하도록 CANCEL 작업을 남김
+                _finish_outbox(order_pk, 'CONFIRM')
+                db.session.add(PaymentOutbox(order_id=order_pk, operation='CANCEL',
+                                             payment_key=response_data.get('paymentKey') or payment_key,
+                                             amount=order_to_pay.amount))
+                db.session.commit()
             raise DatabaseUpdateException("주문 상태가 올바르지 않아 처리에 실패했습니다.")
 
         order_to_pay.status = 'PAID'
         order_to_pay.payment_key = response_data.get('paymentKey')
         order_to_pay.payment_type = response_data.get('method')
+        _finish_outbox(order_pk, 'CONFIRM')
 
         db.session.commit()  # <--- [트랜잭션 B 종료]
 
@@ -180,11 +243,117 @@ def confirm_payment(payment_key, order_id, amount):
             "!!!!!!!!!! [심각] 결제 성공 후 DB 저장 실패 !!!!!!!!!!\n"
             f"주문 ID: {order_id}, Payment Key: {payment_key}\n"
             f"오류: {db_error}\n"
-            "!!!!!!!!!! 즉시 [수동 환불] 및 원인 파악 필요 !!!!!!!!!!"
+            "!!!!!!!!!! 원인 파악 필요 (CONFIRM 작업이 남아 있어 결제 보정 작업이 PAID 확정 또는 환불) !!!!!!!!!!"
         )
         raise DatabaseUpdateException(
             "결제는 성공했으나, 서버 내부 오류로 주문 처리에 실패했습니다. 즉시 관리자에게 문의하세요."
         )
+
+
+def confirm_payment(payment_key, order_id, amount):
+    """결제 승인 (트랜잭션 A -> Toss 승인 -> 트랜잭션 B/C를 요청 스레드에서 모두 처리)"""
+    order_pk = _reserve_order(payment_key, order_id, amount)
+    return _confirm_with_toss(order_pk, payment_key, order_id, amount)
+
+
+def _get_confirm_executor():
+    """결제 승인 백그라운드 실행기 (PAYMENT_CONFIRM_WORKERS가 0이면 None - 요청 스레드에서 처리)"""
+    global _confirm_executor
+    workers = current_app.config.get('PAYMENT_CONFIRM_WORKERS', 0)
+    if workers <= 0:
+        return None
+    if _confirm_executor is None:
+        with _confirm_executor_lock:
+            if _confirm_executor is None:
+                _confirm_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='payment-confirm')
+    return _confirm_executor
+
+
+def _confirm_in_background(app, order_pk, payment_key, order_id, amount):
+    """실행기 스레드에서 Toss 승인 + 트랜잭션 B/C 실행 (결과는 주문 상태로만 남김)"""
+    with app.app_context():
+        try:
+            _confirm_with_toss(order_pk, payment_key, order_id, amount)
+        except (PaymentApiCallException, DatabaseUpdateException):
+            # 로그와 'FAILED' 기록은 _confirm_with_toss에서 이미 처리
+            pass
+        except Exception as e:
+            current_app.logger.error(f"백그라운드 결제 승인 중 알 수 없는 에러 (order_id: {order_id}): {e}",
+                                     exc_info=True)
+
+
+def enqueue_confirm_payment(payment_key, order_id, amount):
+    """
+    결제 승인 접수: 트랜잭션 A(검증 + 'PROCESSING' 선점)만 요청 스레드에서 처리하고
+    1.5초 이상 걸리는 Toss 승인 호출과 트랜잭션 B/C는 실행기 스레드로 넘긴다.
+    (요청 워커가 Toss 응답을 기다리며 묶이지 않음, 결과는 get_order_status로 확인)
+
+    실행기 작업은 프로세스 메모리에만 있으므로 워커가 재시작되면 (gunicorn timeout, 배포 등)
+    아직 끝나지 않은 승인은 사라지고 주문은 PROCESSING에 남는다.
+    이런 주문은 트랜잭션 A에서 남긴 CONFIRM outbox 작업으로 결제 보정 작업(flask reconcile-payments)이
+    PAYMENT_RECONCILE_STUCK_SECONDS 뒤에 Toss에 조회해 확정하므로, 실행기를 켤 때는 보정 작업도 함께 실행해야 한다.
+
+    Returns:
+        str: 응답 시점의 주문 상태 ('PROCESSING', 실행기를 끈 경우 'PAID')
+
+    Raises:
+        OrderNotFoundException, DuplicatePaymentException, PaymentMismatchException, DatabaseUpdateException:
+            트랜잭션 A 실패 (실행기를 끈 경우 confirm_payment와 같음)
+    """
+    executor = _get_confirm_executor()
+    if executor is None:
+        confirm_payment(payment_key, order_id, amount)
+        return 'PAID'
+
+    order_pk = _reserve_order(payment_key, order_id, amount)
+    executor.submit(_confirm_in_background, current_app._get_current_object(),
+                    order_pk, payment_key, order_id, amount)
+    return 'PROCESSING'
+
+
+def get_order_status(order_id, user_id):
+    """
+    주문 결제 상태 조회 (결제 승인 결과 폴링용)
+
+    Raises:
+        OrderNotFoundException: 주문이 없거나 본인 주문이 아님
+    """
+    order = Order.query.filter_by(order_id=order_id).first()
+    if not order or order.user_id != int(user_id):
+        raise OrderNotFoundException(f"주문 ID {order_id}를 찾을 수 없습니다.")
+
+    return {
+        'orderId': order.order_id,
+        'status': order.status,
+        'amount': order.amount,
+        'orderName': order.order_name,
+        'paymentType': order.payment_type
+    }
+
+
+def get_toss_payment_by_order(order_id):
+    """
+    주문 ID로 Toss 결제 조회 (결제 보정 작업에서 승인 결과 확인용)
+
+    Returns:
+        dict | None: Toss Payment 객체 (status: DONE, CANCELED, ABORTED ...), Toss에 결제가 없으면 None
+
+    Raises:
+        PaymentApiCallException: Toss 응답 오류 또는 통신 실패
+    """
+    try:
+        response = get_client('toss').get(_toss_url(f"/v1/payments/orders/{order_id}"), headers=_toss_headers())
+    except requests.exceptions.RequestException as e:
+        raise PaymentApiCallException(f"API 통신 중 오류가 발생했습니다: {e}")
+
+    if response.status_code == 404:
+        return None
+    if not response.ok:
+        raise PaymentApiCallException(f"Toss API Error: {response.status_code} {response.text[:200]}",
+                                      status_code=response.status_code)
+    return response.json()
+
+
 # -----------------------------------------------------
 # 3. 결제 실패 처리 서비스 로직
 # -----------------------------------------------------
@@ -218,17 +387,11 @@ def cancel_payment(payment_key, cancel_reason="서버 내부 오류로 인한 
     """
     paymentKey를 이용해 토스페이먼츠에 결제 취소(환불)를 요청합니다.
     """
-    url = f"https://api.tosspayments.com/v1/payments/{payment_key}/cancel"
-    secret_key = current_app.config['TOSS_SECRET_KEY']
-    encoded_key = base64.b64encode(f"{secret_key}:".encode('utf-8')).decode('utf-8')
-    headers = {
-        "Authorization": f"Basic {encoded_key}",
-        "Content-Type": "application/json"
-    }
+    url = _toss_url(f"/v1/payments/{payment_key}/cancel")
     params = {"cancelReason": cancel_reason}
 
     try:
-        response = requests.post(url, json=params, headers=headers)
+        response = get_client('toss').post(url, json=params, headers=_toss_headers())
         response.raise_for_status()
         current_app.logger.info(f"결제 자동 취소 성공: {payment_key}")
         return response.json()
@@ -5,19 +5,42 @@ Google Places API v1을 사용하여 카페를 검색하는 서비스
 - Text Search (New)로 카페 검색
 - 위치 기반 검색 지원 (locationBias)
 - 검색 결과를 표준화된 형식으로 반환
+- 같은 검색(정규화한 검색어, 반올림한 좌표, 반경)의 결과 캐시 (TTL + LRU)
+- 동시에 들어온 같은 검색은 Places API 호출 1번으로 합침 (single-flight)
 """
 
 import requests
 from flask import current_app
+from common.cache import LRUCache, SingleFlight
+from common.http_client import get_client
 from exceptions.custom_exceptions import InvalidInputException
 
 
-# Google Places API v1 베이스 URL
+# Google Places API v1 베이스 URL (GOOGLE_PLACES_URL 설정으로 변경 가능)
 PLACES_API_V1_URL = "https://places.googleapis.com/v1/places:searchText"
 
 # 검색 반경 기본값 (미터 단위)
 DEFAULT_SEARCH_RADIUS = 5000  # 5km
 
+# 캐시 키/요청에 쓰는 좌표 소수점 자리수 (3자리 = 약 100m)
+COORD_PRECISION = 3
+
+
+# 검색 결과 캐시 (검색 키 -> 카페 리스트)
+_places_cache = None
+_places_flight = SingleFlight()
+
+
+def _get_places_cache():
+    """검색 결과 캐시 (PLACES_CACHE_SIZE가 0이면 None - 캐시 사용 안 함)"""
+    global _places_cache
+    size = current_app.config.get('PLACES_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    if _places_cache is None:
+        _places_cache = LRUCache(maxsize=size, ttl=current_app.config.get('PLACES_CACHE_TTL'))
+    return _places_cache
+
 
 def search_cafes_from_places(query, latitude=None, longitude=None, radius=None):
     """
@@ -55,6 +78,37 @@ def search_cafes_from_places(query, latitude=None, longitude=None, radius=None):
     if not api_key:
         raise InvalidInputException("Google API 키가 설정되지 않았습니다.")
 
+    # 검색 조건 정규화 (공백 정리, 좌표 반올림, 반경 기본값) - 같은 검색은 같은 키/요청이 되도록
+    query = ' '.join(query.split())
+    if latitude is not None and longitude is not None:
+        try:
+            latitude = round(float(latitude), COORD_PRECISION)
+            longitude = round(float(longitude), COORD_PRECISION)
+            radius = round(float(radius)) if radius else DEFAULT_SEARCH_RADIUS
+        except (TypeError, ValueError):
+            raise InvalidInputException("위도, 경도, 반경은 숫자여야 합니다.")
+    else:
+        latitude = longitude = radius = None
+
+    key = (query.lower(), latitude, longitude, radius)
+    cache = _get_places_cache()
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    def fetch():
+        cafes = _request_places(api_key, query, latitude, longitude, radius)
+        if cache is not None:
+            cache.set(key, cafes)
+        return cafes
+
+    # 같은 검색이 이미 진행 중이면 그 결과를 함께 사용
+    return _places_flight.do(key, fetch)
+
+
+def _request_places(api_key, query, latitude, longitude, radius):
+    """Places API Text Search 호출 후 결과를 표준 형식 리스트로 변환"""
     # 요청 헤더 설정
     headers = {
         'Content-Type': 'application/json',
@@ -73,24 +127,22 @@ def search_cafes_from_places(query, latitude=None, longitude=None, radius=None):
 
     # 위치 기반 검색 추가 (선택적)
     if latitude is not None and longitude is not None:
-        search_radius = radius if radius else DEFAULT_SEARCH_RADIUS
         request_body['locationBias'] = {
             'circle': {
                 'center': {
                     'latitude': latitude,
                     'longitude': longitude
                 },
-                'radius': search_radius
+                'radius': radius
             }
         }
 
     try:
-        # API 호출 (POST 요청)
-        response = requests.post(
-            PLACES_API_V1_URL,
+        # API 호출 (POST 요청, 공용 HTTP 클라이언트의 keep-alive 연결 재사용)
+        response = get_client('places').post(
+            current_app.config.get('GOOGLE_PLACES_URL') or PLACES_API_V1_URL,
             json=request_body,
-            headers=headers,
-            timeout=10
+            headers=headers
         )
         response.raise_for_status()
 
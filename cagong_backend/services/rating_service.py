@@ -1,6 +1,12 @@
-from models import db, CafeRating, Cafe
+from datetime import datetime
+from collections import defaultdict
+
+from models import db, CafeRating, Cafe, CafeRatingStats
+from models.cafe_rating_stats import RATE_VALUES, LEVEL_VALUES
 from common.api_response import ApiResponse, ErrorCode
-from sqlalchemy import func
+from common.pagination import PageRequest, split_page
+from sqlalchemy import func, case, update
+from sqlalchemy.exc import IntegrityError
 
 class RatingService:
 
@@ -15,10 +21,130 @@ class RatingService:
         max_key = max(distribution, key=lambda k: distribution[k])
         return RatingService.KEYWORD_MAP.get(int(max_key))
 
+    # 평점 항목 (cafe_ratings 컬럼, 집계 컬럼 접두어, 가능한 값)
+    STATS_DIMENSIONS = (
+        ('rate', 'rate', RATE_VALUES),
+        ('consent_rate', 'consent', LEVEL_VALUES),
+        ('seat_rate', 'seat', LEVEL_VALUES),
+    )
+
+    @staticmethod
+    def _rating_values(rating) -> dict:
+        """평점 row의 항목별 값 (집계 증감 계산용)"""
+        if rating is None:
+            return {}
+        return {field: getattr(rating, field) for field, _, _ in RatingService.STATS_DIMENSIONS}
+
+    @staticmethod
+    def _stats_deltas(before: dict, after: dict) -> dict:
+        """평점 변경 전/후 값으로 집계 컬럼별 증감량 계산 (예: {"rate_3": -1, "rate_5": 1, "rate_sum": 2})"""
+        deltas = defaultdict(int)
+        for field, prefix, _ in RatingService.STATS_DIMENSIONS:
+            old_value, new_value = before.get(field), after.get(field)
+            if old_value == new_value:
+                continue
+            if old_value is not None:
+                deltas[f"{prefix}_{old_value}"] -= 1
+                deltas[f"{prefix}_sum"] -= old_value
+            if new_value is not None:
+                deltas[f"{prefix}_{new_value}"] += 1
+                deltas[f"{prefix}_sum"] += new_value
+        return {column: delta for column, delta in deltas.items() if delta}
+
+    @staticmethod
+    def _apply_stats_deltas(cafe_id: int, deltas: dict):
+        """
+        카페 평점 집계에 증감량을 원자적으로 반영 (UPDATE col = col + delta)
+        평점 변경과 같은 트랜잭션에서 호출하고, 커밋은 호출한 쪽에서 한다.
+        """
+        if not deltas:
+            return
+
+        exists = db.session.query(CafeRatingStats.cafe_id).filter(
+            CafeRatingStats.cafe_id == cafe_id
+        ).first()
+        if not exists:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(CafeRatingStats(cafe_id=cafe_id))
+            except IntegrityError:
+                # 다른 요청이 먼저 만든 경우 - 그 row를 그대로 사용
+                pass
+
+        values = {column: getattr(CafeRatingStats, column) + delta for column, delta in deltas.items()}
+        values['updated_at'] = datetime.utcnow()
+        db.session.execute(
+            update(CafeRatingStats)
+            .where(CafeRatingStats.cafe_id == cafe_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild_rating_stats(cafe_id: int = None) -> int:
+        """
+        평점 집계를 cafe_ratings로부터 다시 계산한다. (유지보수 명령어용)
+
+        Args:
+            cafe_id (int, optional): 지정하면 해당 카페만 다시 계산
+
+        Returns:
+            int: 새로 기록한 카페 집계 row 수
+        """
+        columns = [CafeRating.cafe_id]
+        names = []
+        for field, prefix, values in RatingService.STATS_DIMENSIONS:
+            rating_column = getattr(CafeRating, field)
+            for value in values:
+                columns.append(func.sum(case((rating_column == value, 1), else_=0)))
+                names.append(f"{prefix}_{value}")
+            columns.append(func.coalesce(func.sum(rating_column), 0))
+            names.append(f"{prefix}_sum")
+        columns.append(func.max(CafeRating.updated_at))
+        names.append('updated_at')
+
+        rating_query = db.session.query(*columns)
+        stats_query = CafeRatingStats.query
+        if cafe_id is not None:
+            rating_query = rating_query.filter(CafeRating.cafe_id == cafe_id)
+            stats_query = stats_query.filter(CafeRatingStats.cafe_id == cafe_id)
+
+        rows = [
+            {"cafe_id": row[0], **dict(zip(names, row[1:]))}
+            for row in rating_query.group_by(CafeRating.cafe_id).all()
+        ]
+
+        try:
+            stats_query.delete(synchronize_session=False)
+            db.session.bulk_insert_mappings(CafeRatingStats, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return len(rows)
+
+    @staticmethod
+    def get_rating_version(cafe_id: int):
+        """
+        카페 평점 데이터의 버전 정보 (ETag 계산용)
+        - 평점 집계 row의 PK 조회 1번 (같은 요청의 get_rating_stats는 세션에 올라온 row를 재사용)
+        """
+        stats = db.session.get(CafeRatingStats, cafe_id)
+        if stats is None:
+            return ()
+        return (
+            stats.updated_at,
+            *stats.distribution('rate', RATE_VALUES).values(),
+            *stats.distribution('consent', LEVEL_VALUES).values(),
+            *stats.distribution('seat', LEVEL_VALUES).values(),
+            stats.rate_sum, stats.consent_sum, stats.seat_sum
+        )
+
     @staticmethod
     def get_rating_stats(cafe_id: int, user_id: int = None):
         """
-        카페의 평점 통계 조회
+        카페의 평점 통계 조회 (평점 집계 테이블 PK 조회)
         - average_rating: 평균 평점 (소수점 1자리)
         - total_count: 총 평가 인원 수
         - my_rating: 내가 준 평점 (로그인 시)
@@ -27,68 +153,29 @@ class RatingService:
         - seat_keyword: 좌석 다수결 키워드
         """
 
-        cafe = Cafe.query.get(cafe_id)
-        if not cafe:
-            return ApiResponse.fail(
-                error_code=ErrorCode.INVALID_INPUT,
-                message="존재하지 않는 카페입니다.",
-                http_status=404
-            )
-
         try:
-            # 카공지수 통계
-            stats = db.session.query(
-                func.avg(CafeRating.rate).label('average'),
-                func.count(CafeRating.id).label('count')
-            ).filter(
-                CafeRating.cafe_id == cafe_id,
-                CafeRating.rate.isnot(None)
-            ).first()
-
-            average_rating = round(float(stats.average), 1) if stats.average else 0.0
-            total_count = stats.count or 0
-
-            # 카공지수 분포 (1~5)
-            distribution_query = db.session.query(
-                CafeRating.rate,
-                func.count(CafeRating.id)
-            ).filter(
-                CafeRating.cafe_id == cafe_id,
-                CafeRating.rate.isnot(None)
-            ).group_by(CafeRating.rate).all()
-
-            rating_distribution = {str(i): 0 for i in range(1, 6)}
-            for rate, count in distribution_query:
-                if rate:
-                    rating_distribution[str(rate)] = count
-
-            # 콘센트 분포 (1~3)
-            consent_query = db.session.query(
-                CafeRating.consent_rate,
-                func.count(CafeRating.id)
-            ).filter(
-                CafeRating.cafe_id == cafe_id,
-                CafeRating.consent_rate.isnot(None)
-            ).group_by(CafeRating.consent_rate).all()
-
-            consent_distribution = {str(i): 0 for i in range(1, 4)}
-            for rate, count in consent_query:
-                if rate:
-                    consent_distribution[str(rate)] = count
-
-            # 좌석 분포 (1~3)
-            seat_query = db.session.query(
-                CafeRating.seat_rate,
-                func.count(CafeRating.id)
-            ).filter(
-                CafeRating.cafe_id == cafe_id,
-                CafeRating.seat_rate.isnot(None)
-            ).group_by(CafeRating.seat_rate).all()
+            stats = db.session.get(CafeRatingStats, cafe_id)
+
+            if stats is None:
+                # 평점이 한 번도 등록되지 않은 카페 - 카페 존재 여부만 확인
+                if not Cafe.query.get(cafe_id):
+                    return ApiResponse.fail(
+                        error_code=ErrorCode.INVALID_INPUT,
+                        message="존재하지 않는 카페입니다.",
+                        http_status=404
+                    )
+                rating_distribution = {str(i): 0 for i in RATE_VALUES}
+                consent_distribution = {str(i): 0 for i in LEVEL_VALUES}
+                seat_distribution = {str(i): 0 for i in LEVEL_VALUES}
+                rate_sum = 0
+            else:
+                rating_distribution = stats.distribution('rate', RATE_VALUES)
+                consent_distribution = stats.distribution('consent', LEVEL_VALUES)
+                seat_distribution = stats.distribution('seat', LEVEL_VALUES)
+                rate_sum = stats.rate_sum or 0
 
-            seat_distribution = {str(i): 0 for i in range(1, 4)}
-            for rate, count in seat_query:
-                if rate:
-                    seat_distribution[str(rate)] = count
+            total_count = sum(rating_distribution.values())
+            average_rating = round(rate_sum / total_count, 1) if total_count else 0.0
 
             # 내 평점 조회
             my_rating = None
@@ -128,6 +215,100 @@ class RatingService:
                 http_status=500
             )
 
+    # 한 번에 요약을 조회할 수 있는 최대 카페 수
+    SUMMARY_MAX_CAFES = 200
+
+    @staticmethod
+    def _summary_from_stats(stats) -> dict:
+        """평점 집계 row로 목록 표시용 요약 생성 (평균, 인원 수, 콘센트/좌석 다수결 키워드)"""
+        if stats is None:
+            return {
+                "average_rating": 0.0,
+                "total_count": 0,
+                "consent_keyword": None,
+                "seat_keyword": None
+            }
+        total_count = stats.rate_count
+        return {
+            "average_rating": round((stats.rate_sum or 0) / total_count, 1) if total_count else 0.0,
+            "total_count": total_count,
+            "consent_keyword": RatingService._get_majority_keyword(stats.distribution('consent', LEVEL_VALUES)),
+            "seat_keyword": RatingService._get_majority_keyword(stats.distribution('seat', LEVEL_VALUES))
+        }
+
+    @staticmethod
+    def get_rating_summaries(cafe_ids=None) -> dict:
+        """
+        여러 카페의 평점 요약을 평점 집계 테이블 쿼리 1번으로 조회
+
+        Args:
+            cafe_ids (list, optional): 카페 ID 목록. None이면 평점이 있는 모든 카페
+
+        Returns:
+            dict: {카페 ID: 요약 dict} - 평점이 없는 카페는 포함되지 않음
+        """
+        query = CafeRatingStats.query
+        if cafe_ids is not None:
+            query = query.filter(CafeRatingStats.cafe_id.in_(cafe_ids))
+        return {stats.cafe_id: RatingService._summary_from_stats(stats) for stats in query.all()}
+
+    @staticmethod
+    def get_rating_summaries_version():
+        """
+        전체 평점 요약의 버전 정보 (ETag 계산용)
+        - 집계 row 수, 마지막 갱신 시각, 값별 인원 수 합계 (같은 초 안의 변경도 구분되도록)
+        """
+        count_columns = [
+            func.sum(getattr(CafeRatingStats, f"{prefix}_{value}"))
+            for _, prefix, values in RatingService.STATS_DIMENSIONS
+            for value in values
+        ]
+        row = db.session.query(
+            func.count(CafeRatingStats.cafe_id),
+            func.max(CafeRatingStats.updated_at),
+            *count_columns
+        ).one()
+        return tuple(row)
+
+    @staticmethod
+    def get_rating_summary(cafe_ids: list):
+        """
+        여러 카페의 평점 요약 조회 (카페 목록 화면용)
+        - 요청한 순서대로 반환하며, 평점이 없는 카페는 0점/0명으로 채운다.
+        """
+        if not cafe_ids:
+            return ApiResponse.fail(
+                error_code=ErrorCode.INVALID_INPUT,
+                message="cafe_ids를 입력해주세요.",
+                http_status=400
+            )
+
+        if len(cafe_ids) > RatingService.SUMMARY_MAX_CAFES:
+            return ApiResponse.fail(
+                error_code=ErrorCode.INVALID_INPUT,
+                message=f"cafe_ids는 최대 {RatingService.SUMMARY_MAX_CAFES}개까지 조회할 수 있습니다.",
+                http_status=400
+            )
+
+        try:
+            summaries = RatingService.get_rating_summaries(cafe_ids)
+
+            return ApiResponse.success(
+                data=[
+                    {"cafe_id": cafe_id, **summaries.get(cafe_id, RatingService._summary_from_stats(None))}
+                    for cafe_id in cafe_ids
+                ],
+                message="평점 요약을 조회했습니다.",
+                http_status=200
+            )
+
+        except Exception:
+            return ApiResponse.fail(
+                error_code=ErrorCode.DATABASE_ERROR,
+                message="평점 조회 중 데이터베이스 오류가 발생했습니다.",
+                http_status=500
+            )
+
     @staticmethod
     def upsert_rating(user_id: int, cafe_id: int, data: dict):
         """
@@ -186,12 +367,15 @@ class RatingService:
             )
 
         try:
+            # 집계 증감을 정확히 계산하기 위해 기존 평점 row를 잠그고 읽음
             existing_rating = CafeRating.query.filter_by(
                 user_id=user_id,
                 cafe_id=cafe_id
-            ).first()
+            ).with_for_update().first()
 
             if existing_rating:
+                before = RatingService._rating_values(existing_rating)
+
                 # 전달된 필드만 업데이트
                 if rate is not None:
                     existing_rating.rate = rate
@@ -199,6 +383,10 @@ class RatingService:
                     existing_rating.consent_rate = consent_rate
                 if seat_rate is not None:
                     existing_rating.seat_rate = seat_rate
+
+                RatingService._apply_stats_deltas(
+                    cafe_id, RatingService._stats_deltas(before, RatingService._rating_values(existing_rating))
+                )
                 db.session.commit()
 
                 return ApiResponse.success(
@@ -215,6 +403,11 @@ class RatingService:
                     seat_rate=seat_rate
                 )
                 db.session.add(new_rating)
+                db.session.flush()  # 중복 평점이면 집계를 건드리기 전에 실패
+
+                RatingService._apply_stats_deltas(
+                    cafe_id, RatingService._stats_deltas({}, RatingService._rating_values(new_rating))
+                )
                 db.session.commit()
 
                 return ApiResponse.success(
@@ -240,7 +433,7 @@ class RatingService:
         rating = CafeRating.query.filter_by(
             user_id=user_id,
             cafe_id=cafe_id
-        ).first()
+        ).with_for_update().first()
 
         if not rating:
             return ApiResponse.fail(
@@ -250,6 +443,9 @@ class RatingService:
             )
 
         try:
+            RatingService._apply_stats_deltas(
+                cafe_id, RatingService._stats_deltas(RatingService._rating_values(rating), {})
+            )
             db.session.delete(rating)
             db.session.commit()
 
@@ -297,37 +493,70 @@ class RatingService:
             )
 
     @staticmethod
-    def get_all_my_ratings(user_id: int):
+    def get_all_my_ratings(user_id: int, page: PageRequest = None):
         """
         내가 평점을 매긴 모든 카페 목록 조회
+        - page가 있으면 평점 id 커서 기준으로 page.limit개만 조회
         """
         try:
-            ratings = CafeRating.query.filter_by(user_id=user_id).all()
+            # 카페를 조인해서 필요한 컬럼만 한 번에 조회 (평점마다 카페를 따로 조회하지 않음)
+            query = db.session.query(
+                CafeRating.id,
+                CafeRating.rate,
+                CafeRating.consent_rate,
+                CafeRating.seat_rate,
+                CafeRating.created_at,
+                CafeRating.updated_at,
+                Cafe.id.label('cafe_id'),
+                Cafe.name.label('cafe_name'),
+                Cafe.address.label('cafe_address')
+            ).join(Cafe, Cafe.id == CafeRating.cafe_id).filter(
+                CafeRating.user_id == user_id
+            ).order_by(CafeRating.id)
+
+            next_cursor = None
+            if page is not None:
+                # (user_id, id) 인덱스를 타는 keyset 조건
+                if page.after:
+                    query = query.filter(CafeRating.id > page.after[0])
+                rows, next_cursor = split_page(
+                    query.limit(page.limit + 1).all(), page.limit,
+                    key=lambda row: (row.id,)
+                )
+            else:
+                rows = query.all()
 
-            if not ratings:
+            if not rows and page is None:
                 return ApiResponse.success(
                     data=[],
                     message="평점을 매긴 카페가 없습니다.",
                     http_status=200
                 )
 
-            result = []
-            for rating in ratings:
-                cafe = Cafe.query.get(rating.cafe_id)
-                if cafe:
-                    result.append({
-                        "rating_id": rating.id,
-                        "rate": rating.rate,
-                        "consent_rate": rating.consent_rate,
-                        "seat_rate": rating.seat_rate,
-                        "created_at": rating.created_at.isoformat(),
-                        "updated_at": rating.updated_at.isoformat(),
-                        "cafe": {
-                            "id": cafe.id,
-                            "name": cafe.name,
-                            "address": cafe.address
-                        }
-                    })
+            result = [
+                {
+                    "rating_id": row.id,
+                    "rate": row.rate,
+                    "consent_rate": row.consent_rate,
+                    "seat_rate": row.seat_rate,
+                    "created_at": row.created_at.isoformat(),
+                    "updated_at": row.updated_at.isoformat(),
+                    "cafe": {
+                        "id": row.cafe_id,
+                        "name": row.cafe_name,
+                        "address": row.cafe_address
+                    }
+                }
+                for row in rows
+            ]
+
+            if page is not None:
+                return ApiResponse.success_page(
+                    data=result,
+                    next_cursor=next_cursor,
+                    message="내가 평점을 매긴 카페 목록을 조회했습니다.",
+                    http_status=200
+                )
 
             return ApiResponse.success(
                 data=result,
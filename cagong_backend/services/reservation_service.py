@@ -1,5 +1,162 @@
-from models import Cafe, Reservation, db
+from models import Cafe, Reservation, ReservationSlotOccupancy, db
 from datetime import datetime, timedelta
+from collections import defaultdict
+
+from sqlalchemy import update, func, case, or_
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import OperationalError
+
+from services import cafe_service
+from services.cafe_hours import get_schedule, get_schedule_for_dict
+
+
+# 예약 좌석을 계산하는 시간 단위 (분)
+SLOT_MINUTES = 30
+SLOT_DELTA = timedelta(minutes=SLOT_MINUTES)
+
+# MySQL 교착 상태(1213)/락 대기 시간 초과(1205) 시 좌석 확보를 다시 시도하는 횟수
+LOCK_RETRY_ERRORS = (1213, 1205)
+LOCK_RETRIES = 2
+
+
+def _aligned_slot_starts(start_datetime, end_datetime):
+    """[start, end)와 겹치는 30분 정렬 슬롯의 시작 시각 목록 (예: 14:10~15:10 -> 14:00, 14:30, 15:00)"""
+    slot = start_datetime.replace(
+        minute=start_datetime.minute - start_datetime.minute % SLOT_MINUTES,
+        second=0,
+        microsecond=0
+    )
+    slot_starts = []
+    while slot < end_datetime:
+        slot_starts.append(slot)
+        slot += SLOT_DELTA
+    return slot_starts
+
+
+def _ensure_slot_rows(cafe_id, slot_starts):
+    """
+    좌석 장부에 슬롯 row가 없으면 0석으로 만든다. (INSERT 1번, 이미 있는 row는 그대로 둠)
+
+    savepoint INSERT 후 중복 키 오류를 무시하는 방식은 InnoDB에서 중복 row에 공유 락(S)을 남기고,
+    같은 슬롯을 처음 예약하는 요청 둘 이상이 뒤이은 UPDATE에서 서로의 S 락을 기다리며 교착 상태(1213)가 된다.
+    MySQL은 ON DUPLICATE KEY UPDATE(값은 그대로)로 중복 row에 처음부터 배타 락(X)을 잡아 이 대기를 없앤다.
+    (SQLite 등은 ON CONFLICT DO NOTHING)
+    """
+    rows = [{'cafe_id': cafe_id, 'slot_start': slot_start, 'reserved_seats': 0}
+            for slot_start in sorted(slot_starts)]
+    table = ReservationSlotOccupancy.__table__
+
+    if db.session.get_bind().dialect.name == 'mysql':
+        statement = mysql.insert(table).values(rows)
+        statement = statement.on_duplicate_key_update(reserved_seats=table.c.reserved_seats)
+    else:
+        statement = sqlite.insert(table).values(rows).on_conflict_do_nothing()
+    db.session.execute(statement)
+
+
+def _claim_slot_seats(cafe_id, slot_starts, seat_count, total_seats):
+    """
+    모든 슬롯에 seat_count석을 원자적으로 더한다. (조건부 UPDATE 1번)
+
+    `reserved_seats + n <= total_seats` 조건을 만족하는 row만 증가하므로,
+    하나라도 꽉 찬 슬롯이 있으면 갱신된 row 수가 슬롯 수보다 적다.
+    MySQL에서는 UPDATE가 슬롯 row에 배타 락을 잡기 때문에 동시 요청은 슬롯 단위로만 직렬화된다.
+    락은 PK 순서로 잡지만 InnoDB의 갭 락 등으로 교착 상태(1213)가 날 수 있으므로
+    호출자(create_reservation)가 트랜잭션을 되돌리고 다시 시도한다.
+
+    Returns:
+        bool: 모든 슬롯 확보 성공 여부 (실패 시 호출자가 rollback 해야 함)
+    """
+    result = db.session.execute(
+        update(ReservationSlotOccupancy)
+        .where(
+            ReservationSlotOccupancy.cafe_id == cafe_id,
+            ReservationSlotOccupancy.slot_start.in_(slot_starts),
+            ReservationSlotOccupancy.reserved_seats + seat_count <= total_seats
+        )
+        .values(reserved_seats=ReservationSlotOccupancy.reserved_seats + seat_count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == len(slot_starts)
+
+
+def _load_slot_occupancy(cafe_id, start_datetime, end_datetime):
+    """좌석 장부에서 [start, end) 구간 슬롯의 {slot_start: 예약 좌석 수} (PK 범위 조회 1번)"""
+    rows = ReservationSlotOccupancy.query.with_entities(
+        ReservationSlotOccupancy.slot_start,
+        ReservationSlotOccupancy.reserved_seats
+    ).filter(
+        ReservationSlotOccupancy.cafe_id == cafe_id,
+        ReservationSlotOccupancy.slot_start >= start_datetime,
+        ReservationSlotOccupancy.slot_start < end_datetime
+    ).all()
+    return dict(rows)
+
+
+def _release_slot_seats(cafe_id, slot_starts, seat_count):
+    """예약 취소 시 슬롯별 좌석 수를 되돌린다. (호출자의 트랜잭션 안에서 실행)"""
+    db.session.execute(
+        update(ReservationSlotOccupancy)
+        .where(
+            ReservationSlotOccupancy.cafe_id == cafe_id,
+            ReservationSlotOccupancy.slot_start.in_(slot_starts)
+        )
+        .values(reserved_seats=case(
+            (ReservationSlotOccupancy.reserved_seats >= seat_count,
+             ReservationSlotOccupancy.reserved_seats - seat_count),
+            else_=0
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_slot_occupancy(cafe_id=None):
+    """
+    좌석 장부를 예약 테이블로부터 처음부터 다시 계산한다. (유지보수 명령어용)
+
+    계산하는 동안 해당 범위의 장부 row를 잠그므로 그 사이 예약/취소 요청은 대기한다.
+    전체 카페를 다시 계산하면 모든 예약이 멈추므로 트래픽이 적을 때 실행한다.
+
+    Args:
+        cafe_id (int, optional): 지정하면 해당 카페만 다시 계산
+
+    Returns:
+        int: 새로 기록한 슬롯 row 수
+    """
+    # status가 NULL인 예전 예약도 유효 예약으로 센다 (마이그레이션 a3f1c2d4e5b6 백필과 같은 조건)
+    reservation_query = Reservation.query.with_entities(
+        Reservation.cafe_id,
+        Reservation.start_datetime,
+        Reservation.end_datetime,
+        Reservation.seat_count
+    ).filter(or_(Reservation.status.is_(None), Reservation.status != 'cancelled'))
+    occupancy_query = ReservationSlotOccupancy.query
+    if cafe_id is not None:
+        reservation_query = reservation_query.filter(Reservation.cafe_id == cafe_id)
+        occupancy_query = occupancy_query.filter(ReservationSlotOccupancy.cafe_id == cafe_id)
+
+    try:
+        # 예약 조회 전에 다시 계산할 범위의 장부 row(와 그 사이 갭)에 배타 락을 잡는다.
+        # 진행 중인 예약/취소는 커밋될 때까지 기다렸다가 계산에 포함되고,
+        # 이후 예약/취소는 이 트랜잭션이 끝날 때까지 장부 INSERT/UPDATE에서 대기한다. (MySQL InnoDB 기준)
+        occupancy_query.with_entities(ReservationSlotOccupancy.cafe_id).with_for_update().all()
+
+        occupancy = defaultdict(int)
+        for r_cafe_id, r_start, r_end, r_seats in reservation_query.yield_per(1000):
+            for slot_start in _aligned_slot_starts(r_start, r_end):
+                occupancy[(r_cafe_id, slot_start)] += r_seats
+
+        occupancy_query.delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(ReservationSlotOccupancy, [
+            {"cafe_id": slot_cafe_id, "slot_start": slot_start, "reserved_seats": seats}
+            for (slot_cafe_id, slot_start), seats in occupancy.items()
+        ])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return len(occupancy)
 
 
 # 카페마다 존재하는 Reservation 모델에서 예약 일시 정보 기반으로 시간이 겹치는 예약 레코드를 조회한다.  
@@ -48,27 +205,22 @@ def check_availability(cafe_id, date_str, time_str, duration_hours):
             "message": "과거 시간에는 예약할 수 없습니다."
         }
 
-    # 5. 요일 확인 및 영업시간 체크
-    weekday = request_date.weekday()  # 0=월, 6=일
-    weekday_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    day_name = weekday_names[weekday]
-
-    open_time = getattr(cafe, f"{day_name}_begin")
-    close_time = getattr(cafe, f"{day_name}_end")
+    # 5. 영업시간 체크 (컴파일된 주간 스케줄, 자정 넘는 영업/정기휴무 포함)
+    schedule = get_schedule(cafe)
+    end_datetime = request_datetime + timedelta(hours=duration_hours)
 
-    # 휴무일 체크
-    if not open_time or not close_time:
-        return {
-            "reservation_enabled": True,
-            "is_available": False,
-            "message": f"{date_str}은(는) 휴무일입니다."
-        }
+    if not schedule.covers(request_datetime, end_datetime):
+        day_hours = schedule.day_hours(request_date)
 
-    # 영업시간 내 예약인지 확인
-    end_datetime = request_datetime + timedelta(hours=duration_hours)
-    end_time_str = end_datetime.strftime("%H:%M")
+        # 휴무일 체크 (전날 밤부터 이어지는 영업에도 걸리지 않는 경우)
+        if day_hours is None:
+            return {
+                "reservation_enabled": True,
+                "is_available": False,
+                "message": f"{date_str}은(는) 휴무일입니다."
+            }
 
-    if time_str < open_time or end_time_str > close_time:
+        open_time, close_time = (dt.strftime("%H:%M") for dt in day_hours)
         return {
             "reservation_enabled": True,
             "is_available": False,
@@ -79,30 +231,18 @@ def check_availability(cafe_id, date_str, time_str, duration_hours):
             }
         }
 
-    # 6. 해당 시간대에 겹치는 예약들 조회 (실시간 계산)
-    overlapping_reservations = Reservation.query.filter(
-        Reservation.cafe_id == cafe_id,
-        Reservation.start_datetime < end_datetime,
-        Reservation.end_datetime > request_datetime
-    ).all()
+    day_hours = schedule.day_hours(request_date)
+    if day_hours is None or request_datetime < day_hours[0]:
+        # 전날 밤 영업이 이어지는 시간대 (예: 토 18:00~02:00 영업 후 일요일 새벽)
+        day_hours = schedule.day_hours(request_date - timedelta(days=1)) or day_hours
+    open_time, close_time = (dt.strftime("%H:%M") for dt in day_hours)
 
-    # 7. 30분 단위로 각 슬롯의 예약된 좌석 수 계산
-    max_reserved_seats = 0
-    current_time = request_datetime
-    slot_count = 0
+    # 6. 좌석 장부에서 해당 시간대 슬롯들의 예약 좌석 수 조회 (PK 범위 조회)
+    slot_starts = _aligned_slot_starts(request_datetime, end_datetime)
+    occupancy = _load_slot_occupancy(cafe_id, slot_starts[0], end_datetime)
 
-    while current_time < end_datetime:
-        slot_end = current_time + timedelta(minutes=30)
-
-        # 현재 슬롯과 겹치는 예약들의 좌석 수 합계
-        reserved_in_slot = sum(
-            r.seat_count for r in overlapping_reservations
-            if r.start_datetime < slot_end and r.end_datetime > current_time
-        )
-
-        max_reserved_seats = max(max_reserved_seats, reserved_in_slot)
-        current_time = slot_end
-        slot_count += 1
+    # 7. 30분 단위 슬롯 중 가장 많이 예약된 좌석 수
+    max_reserved_seats = max((occupancy.get(slot_start, 0) for slot_start in slot_starts), default=0)
 
     # 8. 예약 가능 좌석 수 계산
     available_seats = cafe.total_seats - max_reserved_seats
@@ -135,6 +275,199 @@ def check_availability(cafe_id, date_str, time_str, duration_hours):
 
 
 
+def get_day_availability(cafe_id, date_str):
+    """
+    특정 카페의 하루 전체(영업 시작~종료) 30분 슬롯별 남은 좌석 수를 한 번에 계산
+
+    Args:
+        cafe_id: 카페 ID
+        date_str: 날짜 문자열 (예: "2025-10-19")
+
+    Returns:
+        dict: 슬롯 목록과 상세 정보
+        None: 카페를 찾을 수 없는 경우
+    """
+    cafe = Cafe.query.get(cafe_id)
+    if not cafe:
+        return None
+
+    if not cafe.reservation_enabled:
+        return {
+            "reservation_enabled": False,
+            "slots": [],
+            "message": "이 카페는 예약 시스템을 운영하지 않습니다."
+        }
+
+    try:
+        request_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return {
+            "error": "날짜 형식이 잘못되었습니다. (형식: YYYY-MM-DD)"
+        }
+
+    day_hours = get_schedule(cafe).day_hours(request_date)
+    if day_hours is None:
+        return {
+            "reservation_enabled": True,
+            "cafe_id": cafe_id,
+            "date": date_str,
+            "slots": [],
+            "message": f"{date_str}은(는) 휴무일입니다."
+        }
+
+    # 자정을 넘겨 영업하는 경우 종료 시각은 다음날로 계산되어 있음 (예: 18:00~02:00)
+    open_datetime, close_datetime = day_hours
+    open_time, close_time = open_datetime.strftime("%H:%M"), close_datetime.strftime("%H:%M")
+
+    # 영업 시작 이후 첫 30분 정렬 슬롯부터 영업 종료까지
+    slot_starts = [
+        slot_start for slot_start in _aligned_slot_starts(open_datetime, close_datetime)
+        if slot_start >= open_datetime
+    ]
+
+    # 하루치 슬롯 좌석 수를 좌석 장부에서 PK 범위 조회 1번으로 가져옴
+    occupancy = _load_slot_occupancy(cafe_id, open_datetime, close_datetime)
+
+    now = datetime.now()
+    slots = []
+    for slot_start in slot_starts:
+        reserved_seats = occupancy.get(slot_start, 0)
+        available_seats = max(0, cafe.total_seats - reserved_seats)
+        slots.append({
+            "time": slot_start.strftime("%H:%M"),
+            "reserved_seats": reserved_seats,
+            "available_seats": available_seats,
+            "is_available": available_seats > 0 and slot_start >= now
+        })
+
+    return {
+        "reservation_enabled": True,
+        "cafe_id": cafe_id,
+        "cafe_name": cafe.name,
+        "date": date_str,
+        "slot_minutes": SLOT_MINUTES,
+        "total_seats": cafe.total_seats,
+        "operating_hours": {
+            "open": open_time,
+            "close": close_time
+        },
+        "hourly_rate": cafe.hourly_rate,
+        "slots": slots
+    }
+
+
+
+
+
+
+def search_available_cafes(date_str, time_str, duration_hours, seat_count=1,
+                           latitude=None, longitude=None, radius=None, limit=50):
+    """
+    요청한 시간대에 seat_count석 이상 비어 있는 예약 가능 카페 검색
+
+    카페 정보는 카페 스냅샷 캐시에서, 예약은 cafes와 조인한 쿼리 1번으로 가져와
+    카페별로 슬롯 좌석 수를 계산한다. (카페마다 check_availability를 호출하지 않음)
+
+    Args:
+        date_str: 날짜 문자열 (예: "2025-10-19")
+        time_str: 시간 문자열 (예: "14:00")
+        duration_hours: 예약 시간 (시간 단위)
+        seat_count: 필요한 좌석 수
+        latitude, longitude (optional): 검색 중심 좌표 (있으면 가까운 순 정렬)
+        radius (optional): 검색 반경 (미터, 좌표와 함께 사용)
+        limit: 최대 결과 수
+
+    Returns:
+        dict: 검색 조건과 카페 목록
+    """
+    try:
+        request_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        request_datetime = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return {
+            "error": "날짜 또는 시간 형식이 잘못되었습니다. (형식: YYYY-MM-DD, HH:MM)"
+        }
+
+    end_datetime = request_datetime + timedelta(hours=duration_hours)
+
+    result = {
+        "requested_date": date_str,
+        "requested_time": time_str,
+        "duration_hours": duration_hours,
+        "seat_count": seat_count,
+        "cafes": []
+    }
+
+    if request_datetime < datetime.now():
+        result["message"] = "과거 시간에는 예약할 수 없습니다."
+        return result
+
+    # 1. 후보 카페 (스냅샷 캐시 사용, DB 조회 없음)
+    if latitude is not None and longitude is not None:
+        candidates = cafe_service.get_nearby_cafes(latitude, longitude, radius=radius, limit=None)
+    else:
+        candidates = cafe_service.get_all_cafe_dicts()
+
+    # 2. 예약 기능 + 영업시간(컴파일된 스케줄의 구간 조회)을 한 번에 필터링
+    open_cafes = {}
+    for cafe in candidates:
+        if not cafe['reservation']['enabled']:
+            continue
+        if (cafe['reservation']['total_seats'] or 0) < seat_count:
+            continue
+        if not get_schedule_for_dict(cafe).covers(request_datetime, end_datetime):
+            continue  # 휴무일 또는 영업시간 밖
+        open_cafes[cafe['id']] = cafe
+
+    if not open_cafes:
+        return result
+
+    # 3. 후보 카페들의 슬롯별 최대 예약 좌석 수를 그룹 쿼리 1번으로 조회 (cafes 조인)
+    slot_starts = _aligned_slot_starts(request_datetime, end_datetime)
+    occupancy_query = db.session.query(
+        ReservationSlotOccupancy.cafe_id,
+        func.max(ReservationSlotOccupancy.reserved_seats)
+    ).join(Cafe, Cafe.id == ReservationSlotOccupancy.cafe_id).filter(
+        Cafe.reservation_enabled.is_(True),
+        ReservationSlotOccupancy.slot_start >= slot_starts[0],
+        ReservationSlotOccupancy.slot_start < end_datetime
+    )
+    if latitude is not None and longitude is not None:
+        occupancy_query = occupancy_query.filter(ReservationSlotOccupancy.cafe_id.in_(list(open_cafes)))
+
+    max_reserved_by_cafe = dict(occupancy_query.group_by(ReservationSlotOccupancy.cafe_id).all())
+
+    # 4. 카페별 남은 좌석 계산
+    for cafe in open_cafes.values():
+        available_seats = cafe['reservation']['total_seats'] - (max_reserved_by_cafe.get(cafe['id']) or 0)
+        if available_seats < seat_count:
+            continue
+
+        item = {
+            "id": cafe['id'],
+            "name": cafe['name'],
+            "address": cafe['address'],
+            "latitude": cafe['latitude'],
+            "longitude": cafe['longitude'],
+            "available_seats": available_seats,
+            "total_seats": cafe['reservation']['total_seats'],
+            "hourly_rate": cafe['reservation']['hourly_rate'],
+            "total_price": (cafe['reservation']['hourly_rate'] or 0) * duration_hours
+        }
+        if 'distance' in cafe:
+            item["distance"] = cafe['distance']
+        result["cafes"].append(item)
+
+        if len(result["cafes"]) >= limit:
+            break
+
+    return result
+
+
+
+
+
+
 def create_reservation(cafe_id, user_id, date_str, time_str, duration_hours, seat_count=1, payment_key=None):
     """
     예약 생성
@@ -180,39 +513,121 @@ def create_reservation(cafe_id, user_id, date_str, time_str, duration_hours, sea
     cafe = Cafe.query.get(cafe_id)
     total_amount = cafe.hourly_rate * duration_hours
 
-    # 4. 예약 생성
-    new_reservation = Reservation(
-        cafe_id=cafe_id,
-        user_id=user_id,
-        start_datetime=start_datetime,
-        end_datetime=end_datetime,
-        seat_count=seat_count,
-        total_amount=total_amount,
-        payment_key=payment_key,
-        status='confirmed'
-    )
+    for attempt in range(LOCK_RETRIES + 1):
+        try:
+            # 4. 좌석 장부에서 슬롯별 좌석 확보 (조회와 저장 사이의 경쟁 상태 방지)
+            slot_starts = _aligned_slot_starts(start_datetime, end_datetime)
+            _ensure_slot_rows(cafe_id, slot_starts)
+
+            if not _claim_slot_seats(cafe_id, slot_starts, seat_count, cafe.total_seats):
+                db.session.rollback()
+                return {
+                    "success": False,
+                    "message": "해당 시간대에 예약 가능한 좌석이 없습니다."
+                }
+
+            # 5. 예약 생성 (좌석 확보와 같은 트랜잭션)
+            new_reservation = Reservation(
+                cafe_id=cafe_id,
+                user_id=user_id,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                seat_count=seat_count,
+                total_amount=total_amount,
+                payment_key=payment_key,
+                status='confirmed'
+            )
+            db.session.add(new_reservation)
+            db.session.commit()
+            break
+        except OperationalError as e:
+            db.session.rollback()
+            # 교착 상태/락 대기 초과는 트랜잭션 전체를 되돌린 뒤 다시 시도하면 된다
+            if getattr(e.orig, 'args', (None,))[0] in LOCK_RETRY_ERRORS and attempt < LOCK_RETRIES:
+                continue
+            return {
+                "error": f"예약 저장 중 오류가 발생했습니다: {str(e)}"
+            }
+        except Exception as e:
+            db.session.rollback()
+            return {
+                "error": f"예약 저장 중 오류가 발생했습니다: {str(e)}"
+            }
+
+    return {
+        "success": True,
+        "message": "예약이 완료되었습니다.",
+        "reservation": {
+            "id": new_reservation.id,
+            "cafe_id": cafe_id,
+            "cafe_name": cafe.name,
+            "user_id": user_id,
+            "start_datetime": start_datetime.isoformat(),
+            "end_datetime": end_datetime.isoformat(),
+            "duration_hours": duration_hours,
+            "seat_count": seat_count,
+            "total_amount": total_amount
+        }
+    }
+
+
+
+
+
+
+def cancel_reservation(reservation_id, user_id):
+    """
+    예약 취소 (status='cancelled') - 좌석 장부 반환과 같은 트랜잭션에서 처리
+
+    Args:
+        reservation_id: 예약 ID
+        user_id: 요청한 사용자 ID (본인 예약만 취소 가능)
+
+    Returns:
+        dict: 취소 결과
+        None: 예약을 찾을 수 없는 경우
+    """
+    # 같은 예약을 동시에 두 번 취소해 좌석이 두 번 반환되지 않도록 락
+    reservation = Reservation.query.filter_by(id=reservation_id).with_for_update().first()
+    if not reservation:
+        db.session.rollback()
+        return None
+
+    if str(reservation.user_id) != str(user_id):
+        db.session.rollback()
+        return {
+            "success": False,
+            "forbidden": True,
+            "message": "본인의 예약만 취소할 수 있습니다."
+        }
+
+    if reservation.status == 'cancelled':
+        db.session.rollback()
+        return {
+            "success": False,
+            "message": "이미 취소된 예약입니다."
+        }
 
     try:
-        db.session.add(new_reservation)
+        reservation.status = 'cancelled'
+        _release_slot_seats(
+            reservation.cafe_id,
+            _aligned_slot_starts(reservation.start_datetime, reservation.end_datetime),
+            reservation.seat_count
+        )
         db.session.commit()
 
         return {
             "success": True,
-            "message": "예약이 완료되었습니다.",
+            "message": "예약이 취소되었습니다.",
             "reservation": {
-                "id": new_reservation.id,
-                "cafe_id": cafe_id,
-                "cafe_name": cafe.name,
-                "user_id": user_id,
-                "start_datetime": start_datetime.isoformat(),
-                "end_datetime": end_datetime.isoformat(),
-                "duration_hours": duration_hours,
-                "seat_count": seat_count,
-                "total_amount": total_amount
+                "id": reservation.id,
+                "cafe_id": reservation.cafe_id,
+                "status": reservation.status
             }
         }
     except Exception as e:
         db.session.rollback()
         return {
-            "error": f"예약 저장 중 오류가 발생했습니다: {str(e)}"
+            "error": f"예약 취소 중 오류가 발생했습니다: {str(e)}"
         }
@@ -1,9 +1,16 @@
 # 테스트용임 그냥 나중에 테스트 또 하지 않을까 싶어서 놔두고 삭제 예정
 from flask import Flask, jsonify, request  # <--- 1. request 임포트
+import threading
 import time
 
 app = Flask(__name__)
 
+# 승인된 결제 (orderId -> Toss Payment 객체), 결제 보정 작업의 조회/취소 테스트용
+payments = {}
+payments_lock = threading.Lock()
+payments_stats = {"lookups": 0, "cancels": 0, "inflight": 0, "max_inflight": 0, "fail_next_lookups": 0,
+                  "fail_next_confirms": 0, "reject_next_confirms": 0}
+
 
 @app.route('/v1/payments/confirm', methods=['POST'])
 def mock_confirm():
@@ -17,15 +24,121 @@ def mock_confirm():
     # 4. API가 1.5초간 느리게 응답한다고 가정
     time.sleep(1.5)
 
+    # 결제 보정 테스트용: 거절(4xx) 또는 승인은 됐는데 500 응답
+    with payments_lock:
+        reject = payments_stats["reject_next_confirms"] > 0
+        fail = not reject and payments_stats["fail_next_confirms"] > 0
+        if reject:
+            payments_stats["reject_next_confirms"] -= 1
+        if fail:
+            payments_stats["fail_next_confirms"] -= 1
+    if reject:
+        return jsonify({"code": "REJECT_CARD_PAYMENT", "message": "한도초과 혹은 잔액부족으로 결제에 실패했습니다."}), 403
+
     # 5. 고유한 paymentKey를 생성해서 반환합니다.
-    return jsonify({
+    payment = {
         # "paymentKey": "mock_pk_test", # <--- 기존 코드
         "paymentKey": f"mock_pk_for_{order_id_from_request}",  # <--- ★수정된 코드★
         "orderId": order_id_from_request,
         "method": "카드",
+        "totalAmount": data.get("amount"),
         "status": "DONE"
+    }
+    with payments_lock:
+        payments[order_id_from_request] = payment
+    if fail:
+        return jsonify({"code": "FAILED_INTERNAL_SYSTEM_PROCESSING", "message": "일시적인 오류"}), 500
+    return jsonify(payment)
+
+
+@app.route('/v1/payments/orders/<order_id>', methods=['GET'])
+def mock_get_payment_by_order(order_id):
+    """주문 ID로 결제 조회 (승인 요청이 없었던 주문이면 404)"""
+    with payments_lock:
+        payments_stats["lookups"] += 1
+        payments_stats["inflight"] += 1
+        payments_stats["max_inflight"] = max(payments_stats["max_inflight"], payments_stats["inflight"])
+        fail = payments_stats["fail_next_lookups"] > 0
+        if fail:
+            payments_stats["fail_next_lookups"] -= 1
+    try:
+        time.sleep(0.1)  # 외부 API 지연 흉내
+        if fail:
+            return jsonify({"code": "FAILED_INTERNAL_SYSTEM_PROCESSING", "message": "일시적인 오류"}), 500
+        payment = payments.get(order_id)
+        if payment is None:
+            return jsonify({"code": "NOT_FOUND_PAYMENT", "message": "존재하지 않는 결제 정보 입니다."}), 404
+        return jsonify(payment)
+    finally:
+        with payments_lock:
+            payments_stats["inflight"] -= 1
+
+
+@app.route('/v1/payments/<payment_key>/cancel', methods=['POST'])
+def mock_cancel_payment(payment_key):
+    with payments_lock:
+        payment = next((p for p in payments.values() if p["paymentKey"] == payment_key), None)
+        if payment is None:
+            return jsonify({"code": "NOT_FOUND_PAYMENT", "message": "존재하지 않는 결제 정보 입니다."}), 404
+        if payment["status"] == "CANCELED":
+            return jsonify({"code": "ALREADY_CANCELED_PAYMENT", "message": "이미 취소된 결제 입니다."}), 400
+        payment["status"] = "CANCELED"
+        payment["cancels"] = [{"cancelReason": request.get_json().get("cancelReason")}]
+        payments_stats["cancels"] += 1
+        return jsonify(payment)
+
+
+@app.route('/v1/payments:stats', methods=['GET', 'POST'])
+def mock_payments_stats():
+    """
+    결제 조회/취소 요청 수와 최대 동시 조회 수
+    POST {"fail_next_lookups": n}이면 다음 n번 조회를 500으로 응답,
+    {"fail_next_confirms": n}이면 다음 n번 승인을 처리한 뒤 500으로 응답, {"reject_next_confirms": n}이면 거절(403)
+    """
+    with payments_lock:
+        if request.method == 'POST':
+            for name in ("fail_next_lookups", "fail_next_confirms", "reject_next_confirms"):
+                if name in request.get_json():
+                    payments_stats[name] = int(request.get_json()[name])
+        return jsonify({k: v for k, v in payments_stats.items() if k != "inflight"})
+
+
+# Places Text Search 스텁 (GOOGLE_PLACES_URL=http://localhost:5001/v1/places:searchText)
+places_request_count = 0
+
+
+@app.route('/v1/places:searchText', methods=['POST'])
+def mock_places_search():
+    global places_request_count
+    places_request_count += 1
+
+    data = request.get_json()
+    query = data.get("textQuery", "")
+    center = data.get("locationBias", {}).get("circle", {}).get("center", {})
+    lat = center.get("latitude", 37.5665)
+    lng = center.get("longitude", 126.978)
+
+    # 느린 외부 API 흉내
+    time.sleep(float(request.args.get("delay", 0.3)))
+
+    return jsonify({
+        "places": [
+            {
+                "id": f"places/mock_{query}_{i}",
+                "displayName": {"text": f"{query} {i}호점"},
+                "formattedAddress": f"서울 어딘가 {i}",
+                "location": {"latitude": lat + i * 0.001, "longitude": lng + i * 0.001}
+            }
+            for i in range(3)
+        ]
     })
 
 
+@app.route('/v1/places:stats')
+def mock_places_stats():
+    """스텁이 받은 Places 요청 수 (캐시/요청 합치기 확인용)"""
+    return jsonify({"requests": places_request_count})
+
+
 if __name__ == '__main__':
     app.run(port=5001)
\ No newline at end of file